@@ -1,6 +1,7 @@
+import time
 import logging
 import asyncio
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
@@ -9,13 +10,16 @@ from app.api.v1.schemas import DocumentAnalysisResponse, DocumentUploadResponse,
 from app.infrastructure.db.session import get_session
 from app.infrastructure.auth.dependencies import get_current_user
 from app.application.use_case.upload_document import handle_upload
-from app.application.use_case.process_document import queue_processing
+from app.application.use_case.process_document import queue_processing, queue_summary
 from app.domain.services.storage_interface import StorageInterface
 from app.dependencies import get_storage_service, get_rag_service
 from app.core.security import validate_file_content
 from app.domain.exceptions import AuthenticationFailed
 from app.core.limiter import limiter
 from app.infrastructure.db.repository import DocumentRepository
+from app.infrastructure.config import settings
+from app.domain.services.rag_service import TABULAR_EXTENSIONS
+from app.infrastructure.processing.tabular_store import tabular_key
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -32,7 +36,12 @@ async def upload_document(
         file: UploadFile = File(...),
         session: AsyncSession = Depends(get_session),
         user = Depends(get_current_user),
-        storage: StorageInterface = Depends(get_storage_service)
+        storage: StorageInterface = Depends(get_storage_service),
+        summary: str | None = Query(
+            default=None,
+            pattern="^(eager|lazy|background)$",
+            description="When to generate the summary; defaults to SUMMARY_TIMING",
+        ),
 ) -> DocumentUploadResponse:
     """
     Main upload endpoint. 
@@ -46,7 +55,7 @@ async def upload_document(
         doc = await handle_upload(file, session, user, storage)
 
         # 3. Background Task: Dispatch to Celery/Gemini
-        task_info = queue_processing(str(doc.id))
+        task_info = queue_processing(str(doc.id), summary_timing=summary)
 
         logger.info(f"User {user.email} uploaded document {doc.id}. Task {task_info['task_id']} started.")
 
@@ -102,6 +111,17 @@ async def get_document(
             detail="You do not have permission to view this document"
         )
 
+    # 4. Lazy summaries: the first read queues the generation
+    analysis = doc.analysis or {}
+    if doc.status == "COMPLETED" and summary_needs_queueing(analysis):
+        await repo.update_analysis(doc, {**analysis, "summary_status": "queued", "summary_queued_at": time.time()})
+        try:
+            queue_summary(str(doc.id))
+        except Exception as e:
+            # Leave it pending so the next read tries again
+            logger.error(f"Could not queue summary for {doc.id}: {e}")
+            await repo.update_analysis(doc, {**analysis, "summary_status": "pending"})
+
     return DocumentAnalysisResponse(
         id=str(doc.id),
         file_name=doc.file_name,
@@ -112,6 +132,14 @@ async def get_document(
         created_at=doc.created_at
     ) 
 
+def summary_needs_queueing(analysis: dict) -> bool:
+    """Pending summaries, and queued ones whose task was evidently lost."""
+    summary_status = analysis.get("summary_status")
+    if summary_status == "pending":
+        return True
+    queued_for = time.time() - analysis.get("summary_queued_at", 0)
+    return summary_status == "queued" and queued_for > settings.summary_requeue_seconds
+
 @router.get("/")
 async def list_my_documents(
     session: AsyncSession = Depends(get_session),
@@ -282,6 +310,8 @@ async def delete_document(
     try:
         # 1. Delete from Physical Storage (R2/Local/MinIO)
         await storage.delete(str(doc.id))
+        if (doc.file_name or "").lower().endswith(TABULAR_EXTENSIONS):
+            await storage.delete(tabular_key(str(doc.id)))
 
         # 2. Delete from DB (Embeddings will cascade delete)
         await repo.delete(doc)
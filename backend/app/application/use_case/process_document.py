@@ -1,16 +1,20 @@
 import logging
 from app.infrastructure.logging import request_id_var
-from app.workers.document_worker import process_document_task
+from app.infrastructure.config import settings
+from app.workers.document_worker import generate_summary_task, process_document_task
+from app.workers.document_pipeline import build_pipeline
+from app.workers.async_worker import enqueue_document
 
 # Initialize logger for tracking task dispatch
 logger = logging.getLogger(__name__)
 
-def queue_processing(document_id: str):
+def queue_processing(document_id: str, summary_timing: str | None = None):
     """
     Dispatches the document analysis task to the Celery queue.
     
     This function acts as a 'Fire and Forget' trigger. It returns 
     immediately to the API user while the AI works in the background.
+    summary_timing overrides SUMMARY_TIMING for this upload.
     """
     
     # Retrieve the Unique Request ID
@@ -21,10 +25,26 @@ def queue_processing(document_id: str):
     
     # Trigger the Celery Task
     # Pass the request_id so the worker can set its own context for logging.
-    task = process_document_task.delay(document_id, request_id=current_rid)
+    if settings.pipeline_mode.lower() == "canvas":
+        # Stage tasks on per-stage queues; progress is published under the pipeline id
+        pipeline, task_id = build_pipeline(document_id, current_rid, summary_timing)
+        pipeline.apply_async()
+    elif settings.pipeline_mode.lower() == "asyncio":
+        # Picked up by the asyncio worker (app/workers/async_worker.py)
+        task_id = enqueue_document(document_id, current_rid, summary_timing)
+    else:
+        task_id = process_document_task.delay(document_id, request_id=current_rid, summary_timing=summary_timing).id
     
     return {
-        "task_id": task.id,
+        "task_id": task_id,
         "document_id": document_id,
         "trace_id": current_rid
-    }
\ No newline at end of file
+    }
+
+
+def queue_summary(document_id: str):
+    """Dispatches a deferred summary to the low-priority summaries queue."""
+    current_rid = request_id_var.get()
+    logger.info(f"Dispatching deferred summary for document {document_id}. TraceID: {current_rid}")
+    task = generate_summary_task.delay(document_id, request_id=current_rid)
+    return {"task_id": task.id, "document_id": document_id}
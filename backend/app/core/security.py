@@ -16,6 +16,9 @@ ALLOWED_MIME_TYPES = {
     "application/vnd.ms-excel": [".xls"],
     "text/csv": [".csv"],
     "application/zip": [".docx", ".xlsx", ".zip"],  # ZIP-based office files
+    "image/png": [".png"],
+    "image/jpeg": [".jpg", ".jpeg"],
+    "image/tiff": [".tif", ".tiff"],  # Multi-page TIFF is OCR'd page by page
 }
 
 # Max file size: 10MB
@@ -11,9 +11,20 @@ logger = logging.getLogger(__name__)
 _storage_instance = None
 _processor_instance = None
 _rag_instance = None
+_extraction_cache_instance = None
+_tabular_store_instance = None
+_extraction_pool_instance = None
+_summary_cache_instance = None
+_node_parser_instance = None
+_llamaindex_configured = False
 
 def setup_llamaindex():
-    """Initializes global LlamaIndex settings for LLM and Embeddings."""
+    """Initializes global LlamaIndex settings for LLM and Embeddings (once per process)."""
+    global _llamaindex_configured
+
+    if _llamaindex_configured:
+        return
+
     from llama_index.core import Settings
     from llama_index.llms.ollama import Ollama
     from llama_index.embeddings.ollama import OllamaEmbedding
@@ -45,8 +56,21 @@ def setup_llamaindex():
             base_url=settings.ollama_base_url
         )
     
+    _llamaindex_configured = True
     logger.info(f"DI: LlamaIndex configured with provider: {provider}")
 
+def get_node_parser():
+    """
+    Dependency Provider for the chunker used when indexing documents (Singleton).
+    """
+    global _node_parser_instance
+
+    if _node_parser_instance is None:
+        from llama_index.core.node_parser import SentenceSplitter
+        _node_parser_instance = SentenceSplitter(chunk_size=512, chunk_overlap=50)
+
+    return _node_parser_instance
+
 def get_storage_service() -> StorageInterface:
     """
     Dependency Provider for Storage with Lazy Loading (Singleton).
@@ -74,6 +98,109 @@ def get_storage_service() -> StorageInterface:
     
     return _storage_instance
 
+def get_extraction_cache():
+    """
+    Dependency Provider for the extracted-text artifact cache (Singleton).
+    Returns None when caching is disabled.
+    """
+    global _extraction_cache_instance
+
+    if _extraction_cache_instance is not None:
+        return _extraction_cache_instance
+
+    from app.infrastructure.config import settings
+
+    backend = settings.extraction_cache.lower()
+
+    if backend == "storage":
+        from app.infrastructure.processing.extraction_cache import StorageExtractionCache
+        logger.info("DI: Initializing StorageExtractionCache")
+        _extraction_cache_instance = StorageExtractionCache(get_storage_service())
+    elif backend == "local":
+        from app.infrastructure.processing.extraction_cache import LocalExtractionCache
+        logger.info("DI: Initializing LocalExtractionCache")
+        _extraction_cache_instance = LocalExtractionCache(
+            settings.extraction_cache_dir,
+            max_mb=settings.extraction_cache_max_mb,
+            max_age_days=settings.extraction_cache_max_age_days,
+        )
+    else:
+        logger.info("DI: Extraction cache disabled")
+
+    return _extraction_cache_instance
+
+def get_tabular_store():
+    """
+    Dependency Provider for the columnar (Parquet) store of tabular uploads (Singleton).
+    Returns None when the tabular query engine is disabled.
+    """
+    global _tabular_store_instance
+
+    if _tabular_store_instance is not None:
+        return _tabular_store_instance
+
+    from app.infrastructure.config import settings
+
+    if settings.tabular_query_engine:
+        from app.infrastructure.processing.tabular_store import TabularStore
+        logger.info("DI: Initializing TabularStore")
+        _tabular_store_instance = TabularStore(get_storage_service())
+
+    return _tabular_store_instance
+
+def get_extraction_pool():
+    """
+    Dependency Provider for the out-of-process extraction pool (Singleton).
+    Returns None when extraction should run in the calling process.
+    """
+    global _extraction_pool_instance
+
+    if _extraction_pool_instance is not None:
+        return _extraction_pool_instance
+
+    from app.infrastructure.config import settings
+
+    # The asyncio worker runs stages on threads of its event-loop process: parsing
+    # and OCR there would hold the GIL, so that mode always extracts in the pool
+    if settings.extraction_pool_enabled or settings.pipeline_mode.lower() == "asyncio":
+        from app.infrastructure.processing.extraction_pool import ExtractionPool
+        logger.info("DI: Initializing ExtractionPool")
+        _extraction_pool_instance = ExtractionPool(
+            max_workers=settings.extraction_pool_workers,
+            max_tasks_per_child=settings.extraction_pool_max_tasks_per_child,
+            max_rss_mb=settings.extraction_pool_max_rss_mb,
+            cpu_seconds=settings.extraction_task_cpu_seconds,
+            timeout_seconds=settings.extraction_task_timeout_seconds,
+        )
+
+    return _extraction_pool_instance
+
+def get_summary_cache():
+    """
+    Dependency Provider for the generated-summary cache (Singleton).
+    Returns None when summary caching is disabled.
+    """
+    global _summary_cache_instance
+
+    if _summary_cache_instance is not None:
+        return _summary_cache_instance
+
+    from app.infrastructure.config import settings
+
+    if settings.summary_cache.lower() == "redis" and settings.redis_url:
+        import redis
+        from app.infrastructure.processing.summary_cache import RedisSummaryCache
+        logger.info("DI: Initializing RedisSummaryCache")
+        _summary_cache_instance = RedisSummaryCache(
+            redis.from_url(settings.redis_url),
+            ttl_seconds=settings.summary_cache_ttl_seconds,
+            max_entries=settings.summary_cache_max_entries,
+        )
+    else:
+        logger.info("DI: Summary cache disabled")
+
+    return _summary_cache_instance
+
 def get_document_processor() -> DocumentProcessor:
     """
     Dependency Provider for DocumentProcessor (Singleton).
@@ -106,7 +233,10 @@ def get_document_processor() -> DocumentProcessor:
         _processor_instance = DocumentProcessor(
             provider=settings.ai_provider,
             ollama_client=ollama_client,
-            gemini_client=gemini_client
+            gemini_client=gemini_client,
+            extraction_cache=get_extraction_cache(),
+            extraction_pool=get_extraction_pool(),
+            summary_cache=get_summary_cache()
         )
         
     return _processor_instance
@@ -136,7 +266,8 @@ def get_rag_service() -> RAGService:
 
         _rag_instance = RAGService(
             ollama_client=ollama_client,
-            gemini_client=gemini_client
+            gemini_client=gemini_client,
+            tabular_store=get_tabular_store()
         )
         
     return _rag_instance
\ No newline at end of file
@@ -10,17 +10,25 @@ class DocumentProcessorInterface(Protocol):
     without breaking the domain logic.
     """
 
-    async def process(self, file_path: str, mime_type: Optional[str] = None) -> Dict[str, Any]:
+    async def process(self, file_path: str, mime_type: Optional[str] = None, content_hash: Optional[str] = None) -> Dict[str, Any]:
         """Async entry point for document analysis."""
         ...
 
-    def process_sync(self, file_path: str, mime_type: Optional[str] = None, on_chunk: Optional[Any] = None) -> Dict[str, Any]:
+    def process_sync(self, file_path: str, mime_type: Optional[str] = None, on_chunk: Optional[Any] = None, content_hash: Optional[str] = None, extraction: Optional[Any] = None, summarize: bool = True, raise_on_failure: bool = False) -> Dict[str, Any]:
         """
         Synchronous entry point for document analysis (optimized for Celery).
         Supports an optional on_chunk callback for streaming results.
+        When content_hash is known, extraction is served from the artifact cache.
+        A ready-made extraction (e.g. from stream_extraction) skips extraction entirely.
+        summarize=False skips the summary (lazy mode) and marks it pending.
+        raise_on_failure=True raises instead of returning a fallback summary.
         """
         ...
 
+    def stream_extraction(self, file_path: str, mime_type: Optional[str] = None, content_hash: Optional[str] = None) -> Any:
+        """Yields extracted pages as they are produced; the full result is available once consumed."""
+        ...
+
     def _get_gemini_summary(self, file_path: str, mime_type: str) -> str:
         """Requirement for cloud-based summarization."""
         pass
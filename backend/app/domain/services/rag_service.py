@@ -1,23 +1,30 @@
 import uuid
+import hashlib
 import logging
+from typing import Callable, Iterable
 from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.infrastructure.db.models import DocumentEmbedding
+from app.infrastructure.db.models import Document, DocumentEmbedding
 from app.infrastructure.config import settings
 from llama_index.core import Settings
+from app.domain.services.tabular_query_engine import TabularAnswer, TabularQueryEngine
 
 logger = logging.getLogger(__name__)
 
+TABULAR_EXTENSIONS = (".csv", ".xls", ".xlsx")
+
 class RAGService:
     """
     Service dedicated to Retrieval-Augmented Generation (RAG).
     Handles vector indexing and semantic querying.
     """
 
-    def __init__(self, ollama_client=None, gemini_client=None):
+    def __init__(self, ollama_client=None, gemini_client=None, tabular_store=None):
         self.provider = settings.ai_provider.lower()
         self.ollama_client = ollama_client
         self.gemini_client = gemini_client
+        self.tabular_store = tabular_store
+        self.tabular_engine = TabularQueryEngine()
         self.ollama_model = settings.ollama_model
         self.gemini_model = settings.gemini_model
 
@@ -28,39 +35,149 @@ class RAGService:
         """
         try:
             # 1. Clean existing embeddings for this document (safety first)
-            session.query(DocumentEmbedding).filter(
-                DocumentEmbedding.document_id == (uuid.UUID(document_id) if isinstance(document_id, str) else document_id)
-            ).delete()
-
-            # 2. Batch Embedding Generation
-            texts_to_embed = [node.get_content() for node in nodes]
-            logger.info(f"RAG: Generating embeddings for {len(texts_to_embed)} chunks in batch.")
-            
-            embeddings = Settings.embed_model.get_text_embedding_batch(texts_to_embed)
-
-            # 3. Save to DB
-            for node, embedding in zip(nodes, embeddings):
-                db_embedding = DocumentEmbedding(
-                    document_id=uuid.UUID(document_id) if isinstance(document_id, str) else document_id,
-                    text=node.get_content(),
-                    embedding=embedding,
-                    meta=node.metadata
+            self._delete_embeddings(session, document_id)
+
+            # 2. Collapse identical chunks (repeated clauses, tables, boilerplate)
+            unique_nodes = self._dedupe_nodes(nodes, set())
+            if len(unique_nodes) < len(nodes):
+                logger.info(f"RAG: Collapsed {len(nodes) - len(unique_nodes)} duplicate chunks")
+
+            # 3. Batch Embedding Generation + 4. Save to DB
+            logger.info(f"RAG: Generating embeddings for {len(unique_nodes)} chunks in batch.")
+            self._add_embeddings(session, document_id, unique_nodes)
+
+            session.commit()
+            logger.info(f"RAG: Successfully indexed {len(unique_nodes)} chunks for document {document_id}")
+            return len(unique_nodes)
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"RAG Indexing Error: {e}")
+            raise
+
+    def index_stream(
+        self,
+        session: Session,
+        document_id: str,
+        pages: Iterable,
+        parser,
+        batch_size: int = 64,
+        resume_from: int = 0,
+        on_batch: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Chunks and embeds pages as they arrive from the extractor and commits
+        every `batch_size` chunks, so neither the pending nodes and vectors
+        nor the session and transaction grow with the document. This saves
+        time (embedding overlaps extraction), not the memory of the text: the
+        extraction stream still keeps every page for the summary.
+
+        A failed run leaves the batches it committed. A fresh call deletes
+        them first; `on_batch(chunks indexed so far)` runs before each commit
+        (e.g. to checkpoint the count in the same transaction), and a later
+        call with `resume_from=<that count>` keeps the committed embeddings
+        and skips the first chunks instead of embedding them again; chunking
+        is deterministic, so they are the same. Returns the number of indexed
+        chunks.
+        """
+        from llama_index.core import Document as LlamaDocument
+
+        batch_size = max(1, batch_size)
+        indexed = resume_from
+        skip = resume_from
+        buffer = []
+        seen = set()
+        total_chunks = 0
+
+        def commit_batch(batch: list):
+            nonlocal indexed
+            indexed += self._add_embeddings(session, document_id, batch)
+            if on_batch is not None:
+                on_batch(indexed)
+            session.commit()
+
+        try:
+            if resume_from:
+                logger.info(f"RAG: Resuming indexing of document {document_id} after {resume_from} committed chunks")
+            else:
+                self._delete_embeddings(session, document_id)
+
+            for page in pages:
+                if not page.text:
+                    continue
+                nodes = parser.get_nodes_from_documents(
+                    [LlamaDocument(text=page.text, metadata={"page": page.number})]
                 )
-                session.add(db_embedding)
-            
+                total_chunks += len(nodes)
+                buffer.extend(self._dedupe_nodes(nodes, seen))
+                if skip:
+                    skipped = min(skip, len(buffer))
+                    buffer, skip = buffer[skipped:], skip - skipped
+                while len(buffer) >= batch_size:
+                    batch, buffer = buffer[:batch_size], buffer[batch_size:]
+                    commit_batch(batch)
+
+            if buffer:
+                commit_batch(buffer)
+
             session.commit()
-            logger.info(f"RAG: Successfully indexed {len(nodes)} chunks for document {document_id}")
-            return len(nodes)
+            if indexed < total_chunks:
+                logger.info(f"RAG: Collapsed {total_chunks - indexed} duplicate chunks")
+            logger.info(f"RAG: Successfully stream-indexed {indexed} chunks for document {document_id}")
+            return indexed
 
         except Exception as e:
             session.rollback()
             logger.error(f"RAG Indexing Error: {e}")
             raise
 
+    def _dedupe_nodes(self, nodes: list, seen: set) -> list:
+        """
+        Drops chunks whose whitespace-normalized text was already indexed for
+        this document; the first occurrence (and its page metadata) is kept.
+        """
+        if not settings.dedupe_chunks:
+            return nodes
+
+        unique = []
+        for node in nodes:
+            key = hashlib.sha1(" ".join(node.get_content().split()).encode("utf-8")).digest()
+            if key not in seen:
+                seen.add(key)
+                unique.append(node)
+        return unique
+
+    def _delete_embeddings(self, session: Session, document_id: str) -> None:
+        session.query(DocumentEmbedding).filter(
+            DocumentEmbedding.document_id == (uuid.UUID(document_id) if isinstance(document_id, str) else document_id)
+        ).delete()
+
+    def _add_embeddings(self, session: Session, document_id: str, nodes: list) -> int:
+        """Embeds one batch of nodes and adds the rows to the session."""
+        texts_to_embed = [node.get_content() for node in nodes]
+        embeddings = Settings.embed_model.get_text_embedding_batch(texts_to_embed)
+
+        for text, node, embedding in zip(texts_to_embed, nodes, embeddings):
+            session.add(DocumentEmbedding(
+                document_id=uuid.UUID(document_id) if isinstance(document_id, str) else document_id,
+                text=text,
+                embedding=embedding,
+                meta=node.metadata
+            ))
+        return len(nodes)
+
     def query(self, session: Session, document_id: str, query_text: str, chat_history: list = None, limit: int = 5) -> dict:
         """
         Performs semantic search and generates an answer using the LLM with context.
         """
+        tabular = self._answer_tabular(session, document_id, query_text)
+        if tabular:
+            prompt = self._build_tabular_prompt(query_text, tabular, chat_history)
+            return {
+                "answer": self._generate(prompt),
+                "sources": [self._tabular_source(tabular)]
+            }
+
         results, prompt = self._prepare_rag_context(session, document_id, query_text, chat_history, limit)
         
         if not results:
@@ -70,32 +187,88 @@ class RAGService:
             }
 
         # 5. LLM Interaction
+        answer = self._generate(prompt)
+
+        # 6. Format Sources
+        sources = [{"text": r.text, "metadata": r.meta} for r in results]
+
+        return {
+            "answer": answer,
+            "sources": sources
+        }
+
+    def _generate(self, prompt: str) -> str:
         if self.provider == "ollama":
             if not self.ollama_client:
                 raise ValueError("Ollama client not initialized in RAGService")
             response = self.ollama_client.chat(
                 model=self.ollama_model,
+                keep_alive=settings.ollama_keep_alive,
                 messages=[{"role": "user", "content": prompt}],
                 options={"temperature": 0.1}
             )
-            answer = response["message"]["content"]
-        else:
-            if not self.gemini_client:
-                raise ValueError("Gemini client not initialized in RAGService")
-            response = self.gemini_client.models.generate_content(
-                model=self.gemini_model,
-                contents=[prompt]
-            )
-            answer = response.text
+            return response["message"]["content"]
 
-        # 6. Format Sources
-        sources = [{"text": r.text, "metadata": r.meta} for r in results]
+        if not self.gemini_client:
+            raise ValueError("Gemini client not initialized in RAGService")
+        response = self.gemini_client.models.generate_content(
+            model=self.gemini_model,
+            contents=[prompt]
+        )
+        return response.text
+
+    # TABULAR ANSWERS (COLUMNAR QUERY OVER CSV/XLSX)
+
+    def _answer_tabular(self, session: Session, document_id: str, query_text: str) -> TabularAnswer | None:
+        """
+        Runs aggregate-style questions on tabular documents directly over the
+        stored Parquet table. Returns None (fall back to vector search) for
+        non-tabular documents, non-aggregate questions or any failure.
+        """
+        if self.tabular_store is None or not settings.tabular_query_engine:
+            return None
+
+        doc = session.get(Document, uuid.UUID(document_id) if isinstance(document_id, str) else document_id)
+        if doc is None or not (doc.file_name or "").lower().endswith(TABULAR_EXTENSIONS):
+            return None
+
+        try:
+            schema = self.tabular_store.schema(str(doc.id))
+            if not schema:
+                return None
+            return self.tabular_engine.answer(
+                query_text, schema, lambda columns: self.tabular_store.read(str(doc.id), columns)
+            )
+        except Exception as e:
+            logger.warning(f"Tabular query failed, falling back to vector search: {e}")
+            return None
 
+    def _tabular_source(self, tabular: TabularAnswer) -> dict:
         return {
-            "answer": answer,
-            "sources": sources
+            "text": tabular.result,
+            "score": 1.0,
+            "metadata": {"source": "tabular", "query": tabular.plan.describe(), "rows_scanned": tabular.rows_scanned}
         }
 
+    def _build_tabular_prompt(self, query_text: str, tabular: TabularAnswer, chat_history: list = None) -> str:
+        history_text = ""
+        if chat_history:
+            history_text = "RECENT CONVERSATION:\n" + "\n".join([f"{m['role'].upper()}: {m['content']}" for m in chat_history])
+
+        return f"""You are Aegis, a professional and intelligent document analyst.
+The result below was computed exactly over all {tabular.rows_scanned} rows of the user's spreadsheet ({tabular.plan.describe()}).
+Answer the user's message using only these numbers. Do not recalculate them. Keep it concise.
+
+{history_text}
+
+COMPUTED RESULT:
+{tabular.result}
+
+USER MESSAGE:
+{query_text}
+
+AEGIS RESPONSE:"""
+
     def _prepare_rag_context(self, session: Session, document_id: str, query_text: str, chat_history: list = None, limit: int = 5):
         """Shared logic for context retrieval and prompt building with History support."""
         # 1. Generate Query Embedding
@@ -146,15 +319,20 @@ AEGIS RESPONSE:"""
         """
         Streams the RAG response token by token with history.
         """
-        results, prompt = self._prepare_rag_context(session, document_id, query_text, chat_history, limit)
+        tabular = self._answer_tabular(session, document_id, query_text)
+        if tabular:
+            prompt = self._build_tabular_prompt(query_text, tabular, chat_history)
+        else:
+            results, prompt = self._prepare_rag_context(session, document_id, query_text, chat_history, limit)
 
-        if not results:
+        if not tabular and not results:
             yield "I couldn't find any relevant information in the document to answer your question."
             return
 
         if self.provider == "ollama":
             stream = self.ollama_client.chat(
                 model=self.ollama_model,
+                keep_alive=settings.ollama_keep_alive,
                 messages=[{"role": "user", "content": prompt}],
                 stream=True,
                 options={"temperature": 0.1}
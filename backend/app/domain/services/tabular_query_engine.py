@@ -0,0 +1,151 @@
+import re
+import logging
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Question phrasing -> pandas aggregation
+_AGGREGATES = [
+    ("mean", re.compile(r"\b(average|avg|mean)\b")),
+    ("count", re.compile(r"\b(how many|count|number of)\b")),
+    ("max", re.compile(r"\b(max|maximum|highest|largest|biggest)\b")),
+    ("min", re.compile(r"\b(min|minimum|lowest|smallest)\b")),
+    ("sum", re.compile(r"\b(total|sum|combined)\b")),
+]
+# Everyday words that only mean an aggregation when ranking groups
+# ("which region has the most revenue", not "what do most customers want")
+_RANKINGS = [
+    ("max", re.compile(r"\b(most|top)\b")),
+    ("min", re.compile(r"\b(least|bottom)\b")),
+]
+# A grouping marker counts only when a text column directly follows it
+_GROUP_MARKER = re.compile(r"\b(?:by|per|for each|each|across|which)\s+")
+# A plain row count needs the question to be about rows
+_ROWS = re.compile(r"\b(rows?|records?|entries|lines)\b")
+_WORD = re.compile(r"[a-z0-9]+")
+
+MAX_RESULT_ROWS = 20
+
+
+def _words(text: str) -> list[str]:
+    # Singularize naively so "regions" matches a "region" column
+    return [w[:-1] if len(w) > 3 and w.endswith("s") else w for w in _WORD.findall(text.lower())]
+
+
+def _mentions(text: str, column: str) -> bool:
+    """True when every word of the column name appears, in order, in the text."""
+    col_words = _words(column)
+    if not col_words:
+        return False
+    text_words = _words(text)
+    n = len(col_words)
+    return any(text_words[i:i + n] == col_words for i in range(len(text_words) - n + 1))
+
+
+def _starts_with(text: str, column: str) -> bool:
+    """True when the text begins with the column name's words."""
+    col_words = _words(column)
+    return bool(col_words) and _words(text)[:len(col_words)] == col_words
+
+
+@dataclass
+class TabularPlan:
+    """A single aggregation: agg(metric) [grouped by group_by]."""
+    aggregate: str
+    metric: str | None = None
+    group_by: str | None = None
+    columns: list[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        target = f"{self.aggregate} of {self.metric}" if self.metric else "row count"
+        return f"{target} by {self.group_by}" if self.group_by else target
+
+
+@dataclass
+class TabularAnswer:
+    plan: TabularPlan
+    result: str
+    rows_scanned: int
+
+
+class TabularQueryEngine:
+    """
+    Answers aggregate questions ("total revenue by region", "how many orders
+    per city") over a document's table with pandas, so the LLM only has to
+    phrase an already-computed result instead of doing arithmetic over
+    retrieved text chunks. Planning is rule-based over the column names;
+    anything it cannot map to a single aggregation returns None and the
+    caller falls back to vector search.
+    """
+
+    def plan(self, question: str, schema: dict[str, str]) -> TabularPlan | None:
+        q = question.lower()
+
+        # Longest names first so "unit price" wins over "price"
+        mentioned = sorted((c for c in schema if _mentions(q, c)), key=lambda c: -len(_words(c)))
+
+        group_by = next(
+            (
+                c for marker in _GROUP_MARKER.finditer(q) for c in mentioned
+                if schema[c] == "text" and _starts_with(q[marker.end():], c)
+            ),
+            None,
+        )
+
+        aggregate = next((name for name, pattern in _AGGREGATES if pattern.search(q)), None)
+        if aggregate is None and group_by is not None:
+            aggregate = next((name for name, pattern in _RANKINGS if pattern.search(q)), None)
+        if aggregate is None:
+            return None
+
+        metric = next((c for c in mentioned if schema[c] == "numeric" and c != group_by), None)
+
+        if aggregate == "count":
+            metric = None
+            if group_by is None and not _ROWS.search(q):
+                return None
+        elif metric is None:
+            return None
+
+        columns = [c for c in (group_by, metric) if c]
+        if not columns:
+            # Plain row count: read the narrowest possible column
+            columns = [next(iter(schema))]
+
+        return TabularPlan(aggregate=aggregate, metric=metric, group_by=group_by, columns=columns)
+
+    def execute(self, plan: TabularPlan, df: pd.DataFrame) -> str:
+        if plan.group_by is None:
+            if plan.metric is None:
+                return str(len(df))
+            value = getattr(df[plan.metric], plan.aggregate)()
+            return f"{value:,.2f}" if isinstance(value, float) else str(value)
+
+        grouped = df.groupby(plan.group_by, dropna=True)
+        if plan.metric is None:
+            series = grouped.size()
+        elif plan.aggregate in ("max", "min"):
+            # "Which region has the highest revenue": rank groups by their total
+            series = grouped[plan.metric].sum()
+        else:
+            series = grouped[plan.metric].agg(plan.aggregate)
+
+        series = series.sort_values(ascending=plan.aggregate == "min").head(MAX_RESULT_ROWS)
+        name = plan.metric or "count"
+        return series.rename(name).to_frame().to_csv(sep="|", float_format="%.2f").strip()
+
+    def answer(self, question: str, schema: dict[str, str], load_columns) -> TabularAnswer | None:
+        """
+        Plans the question against `schema` and, if it maps to an aggregation,
+        loads only the needed columns via `load_columns(columns)` and runs it.
+        """
+        plan = self.plan(question, schema)
+        if plan is None:
+            return None
+
+        df = load_columns(plan.columns)
+        result = self.execute(plan, df)
+        logger.info(f"Tabular: {plan.describe()} over {len(df)} rows")
+        return TabularAnswer(plan=plan, result=result, rows_scanned=len(df))
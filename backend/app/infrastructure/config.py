@@ -1,7 +1,7 @@
 import os
 import logging
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, model_validator
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +41,8 @@ class Settings(BaseSettings):
     ollama_model: str = Field(default="llama3")
     ollama_base_url: str = Field(default="http://localhost:11434")
     ollama_embedding_model: str = Field(default="nomic-embed-text")
+    # How long Ollama keeps the models loaded after each request (and after the worker warm-up)
+    ollama_keep_alive: str = Field(default="30m")
     gemini_model: str = Field(default="gemini-2.0-flash")
     gemini_embedding_model: str = Field(default="models/embedding-001")
     allowed_origins: str = Field(default="http://localhost:8000,http://localhost:3000")
@@ -48,7 +50,121 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int | None = None
     refresh_token_expire_days: int | None = None
     jwt_algorithm: str | None = None
-    
+
+    # --- 4. DOCUMENT EXTRACTION ---
+    # PDF text backend: pypdf | pdfminer | pdftotext (poppler CLI) | pymupdf (optional)
+    pdf_backend: str = Field(default="pypdf")
+    # Page-parallel PDF extraction (process pool). Small PDFs stay serial.
+    pdf_parallel_extraction: bool = Field(default=False)
+    pdf_extraction_workers: int = Field(default=4)
+    pdf_pages_per_task: int = Field(default=16)
+    pdf_parallel_min_pages: int = Field(default=32)
+
+    # OCR: pages are rasterized lazily in windows; the memory ceiling bounds
+    # how many windows are rendered at once, the budget bounds total time.
+    ocr_workers: int = Field(default=2)
+    ocr_pages_per_window: int = Field(default=4)
+    ocr_dpi: int = Field(default=200)
+    ocr_max_memory_mb: int = Field(default=512)
+    ocr_time_budget_seconds: float = Field(default=300)
+    # PDF pages with fewer alphanumeric characters than this are OCR'd
+    ocr_min_chars_per_page: int = Field(default=25)
+    # Adaptive DPI: OCR at low DPI, re-OCR at high DPI below the confidence threshold
+    ocr_adaptive_dpi: bool = Field(default=False)
+    ocr_low_dpi: int = Field(default=150)
+    ocr_high_dpi: int = Field(default=300)
+    ocr_min_confidence: float = Field(default=70)
+    # Image uploads: grayscale, downscale to this DPI and binarize before Tesseract
+    ocr_image_dpi: int = Field(default=300)
+    ocr_preprocess_images: bool = Field(default=True)
+    ocr_binarize: bool = Field(default=True)
+
+    # Flat text formats (DOCX, TXT) are streamed as sections of ~N characters
+    text_section_chars: int = Field(default=20000)
+
+    # Spreadsheets are read in full and emitted as row groups of ~N characters
+    spreadsheet_group_chars: int = Field(default=1500)
+    spreadsheet_read_rows: int = Field(default=5000)
+
+    # Aggregate questions on CSV/XLSX are computed over a Parquet copy (needs pyarrow)
+    tabular_query_engine: bool = Field(default=True)
+
+    # Extracted-text artifact cache keyed by content hash: off | local | storage
+    extraction_cache: str = Field(default="local")
+    extraction_cache_dir: str | None = None
+    # Limits of the local cache; the least recently used artifacts go first
+    extraction_cache_max_mb: int = Field(default=1024)
+    extraction_cache_max_age_days: float = Field(default=30)
+
+    # Run extraction in a warm, recyclable child process pool with per-document limits.
+    # Off by default: the child returns whole documents, so pages no longer stream
+    # into chunking/embedding (STREAMING_INDEXING) while the file is being parsed.
+    # Always on for PIPELINE_MODE=asyncio
+    extraction_pool_enabled: bool = Field(default=False)
+    extraction_pool_workers: int = Field(default=1)
+    extraction_pool_max_tasks_per_child: int = Field(default=20)
+    extraction_pool_max_rss_mb: int = Field(default=700)
+    extraction_task_cpu_seconds: int = Field(default=300)
+    # Wall-clock cap per document, including the OCR processes RLIMIT_CPU does not see
+    extraction_task_timeout_seconds: int = Field(default=600)
+
+    # Index pages as they are extracted, embedding in fixed-size batches
+    streaming_indexing: bool = Field(default=True)
+    embedding_batch_size: int = Field(default=64)
+    # Strip lines repeated across PDF pages (headers, footers, disclaimers) before chunking
+    strip_boilerplate: bool = Field(default=True)
+    boilerplate_lookahead_pages: int = Field(default=8)
+    # Embed identical chunks of a document only once
+    dedupe_chunks: bool = Field(default=True)
+
+    # Long-document summaries: truncate (one call on the leading text) | map_reduce
+    # (section summaries merged in a tree: more LLM calls, the whole document covered)
+    summary_mode: str = Field(default="truncate")
+    summary_workers: int = Field(default=4)
+    summary_chunk_tokens: int = Field(default=2000)
+    summary_level_token_budget: int = Field(default=2000)
+    summary_cache_entries: int = Field(default=2048)
+    # Extractive pre-compression: send only the most central sentences (TF-IDF) to the LLM
+    summary_precompression: bool = Field(default=False)
+    summary_precompression_chars: int = Field(default=4000)
+
+    # When the summary is generated: eager (before COMPLETED) | lazy (on first
+    # GET /documents/{id}) | background (low-priority queue after COMPLETED)
+    summary_timing: str = Field(default="eager")
+    summary_queue: str = Field(default="summaries")
+    # A summary still "queued" after this long (lost task, broker outage) is queued again on the next GET
+    summary_requeue_seconds: int = Field(default=900)
+    # Eager summaries run alongside chunking/embedding instead of before or after it
+    concurrent_summary: bool = Field(default=True)
+    # monolithic: one task per document | canvas: fetch -> extract -> (summary | embed)
+    # -> finalize stage tasks on per-stage queues (see celery_app.py) | asyncio: the same
+    # stages, driven concurrently by app/workers/async_worker.py from a Redis list
+    pipeline_mode: str = Field(default="monolithic")
+    async_queue: str = Field(default="documents:async")
+    # Names this worker's processing list and heartbeat; empty means <hostname>-<pid>
+    async_worker_id: str = Field(default="")
+    # Documents in flight in one asyncio worker, and the retries of a transient failure
+    async_worker_concurrency: int = Field(default=16)
+    async_worker_max_retries: int = Field(default=3)
+    # Summary/embedding stages running against each provider at once (per worker)
+    ollama_max_concurrency: int = Field(default=4)
+    gemini_max_concurrency: int = Field(default=16)
+    # Workers pre-import parsers/LLM libraries, build their clients and load the
+    # Ollama models at startup, then create WORKER_READY_FILE (container healthcheck)
+    worker_warm_start: bool = Field(default=True)
+    worker_ready_file: str = Field(default="/tmp/worker.ready")
+    worker_ready_ttl_seconds: int = Field(default=60)
+    # Persist per-stage progress (extraction, summary, committed chunks) so a retried
+    # or redelivered task resumes from its last completed stage
+    # (required by the canvas and asyncio modes: their stages hand the extraction over
+    # through its checkpoint)
+    pipeline_checkpoints: bool = Field(default=True)
+
+    # Generated summaries keyed by content hash, provider, model and prompt version: off | redis
+    summary_cache: str = Field(default="redis")
+    summary_cache_ttl_seconds: int = Field(default=7 * 24 * 3600)
+    summary_cache_max_entries: int = Field(default=10000)
+
     def __init__(self, **values):
         super().__init__(**values)
         
@@ -73,6 +189,13 @@ class Settings(BaseSettings):
             return ""
         return v.strip().strip('"').strip("'")
 
+    @model_validator(mode="after")
+    def staged_pipeline_needs_checkpoints(self) -> "Settings":
+        # Without the checkpoint every stage would parse/OCR the file again
+        if self.pipeline_mode.lower() in ("canvas", "asyncio") and not self.pipeline_checkpoints:
+            raise ValueError(f"PIPELINE_MODE={self.pipeline_mode} requires PIPELINE_CHECKPOINTS=true")
+        return self
+
     model_config = SettingsConfigDict(
         # System Environment Variables (Railway) always 
         # override the .env file (Local).
@@ -0,0 +1,89 @@
+import uuid
+import logging
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.infrastructure.db.models import DocumentCheckpoint
+from app.infrastructure.processing.extraction import ExtractedPage, ExtractionResult
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION = "extraction"
+SUMMARY = "summary"
+EMBEDDING = "embedding"
+
+
+class PipelineCheckpoints:
+    """
+    Per-stage checkpoints of one document, persisted in `document_checkpoints`
+    so a retried or redelivered task resumes after the last completed stage:
+
+    - extraction: the sanitized pages, so the file is not parsed/OCR'd again
+    - summary: the finished analysis, so the LLM is not called again
+    - embedding: how many (deduplicated) chunks are committed, so indexing
+      continues after the last committed batch
+
+    `save` only adds the row to the given session; the caller's commit makes
+    it durable, together with the work it records. With `enabled=False`
+    nothing is read or written and every stage starts from scratch.
+    """
+
+    def __init__(self, document_id, enabled: bool = True):
+        self.document_id = uuid.UUID(document_id) if isinstance(document_id, str) else document_id
+        self.enabled = enabled
+        self.stages: dict[str, dict] = {}
+
+    def load(self, session: Session) -> "PipelineCheckpoints":
+        if self.enabled:
+            rows = session.query(DocumentCheckpoint).filter(
+                DocumentCheckpoint.document_id == self.document_id
+            ).all()
+            self.stages = {row.stage: row.data for row in rows}
+            if self.stages:
+                logger.info(f"Checkpoints: Resuming {self.document_id} after {sorted(self.stages)}")
+        return self
+
+    def save(self, session: Session, stage: str, data: dict) -> None:
+        if not self.enabled:
+            return
+        self.stages[stage] = data
+        session.merge(DocumentCheckpoint(
+            document_id=self.document_id,
+            stage=stage,
+            data=data,
+            updated_at=datetime.utcnow(),
+        ))
+
+    def clear(self, session: Session) -> None:
+        self.stages = {}
+        session.query(DocumentCheckpoint).filter(
+            DocumentCheckpoint.document_id == self.document_id
+        ).delete()
+
+    # --- Typed accessors ---
+
+    def extraction(self) -> ExtractionResult | None:
+        data = self.stages.get(EXTRACTION)
+        if data is None:
+            return None
+        pages = [ExtractedPage(number, text) for number, text in data["pages"]]
+        return ExtractionResult(pages, data["source_type"], data.get("ocr_pages", []))
+
+    def save_extraction(self, session: Session, extraction: ExtractionResult) -> None:
+        self.save(session, EXTRACTION, {
+            "source_type": extraction.source_type,
+            "pages": [[page.number, page.text] for page in extraction.pages],
+            "ocr_pages": extraction.ocr_pages,
+        })
+
+    def analysis(self) -> dict | None:
+        data = self.stages.get(SUMMARY)
+        return data["analysis"] if data is not None else None
+
+    def save_analysis(self, session: Session, analysis: dict) -> None:
+        self.save(session, SUMMARY, {"analysis": analysis})
+
+    def chunks_committed(self) -> int:
+        return self.stages.get(EMBEDDING, {}).get("chunks_committed", 0)
+
+    def save_chunks_committed(self, session: Session, count: int) -> None:
+        self.save(session, EMBEDDING, {"chunks_committed": count})
@@ -158,3 +158,20 @@ class DocumentEmbedding(Base):
         ),
         {"info": {"vector_index": True}},
     )
+
+
+class DocumentCheckpoint(Base):
+    """
+    Progress of one pipeline stage for a document (extraction, summary,
+    embedding), so a retried or redelivered task resumes after the last
+    completed stage. Rows are removed once the document is COMPLETED.
+    """
+    __tablename__ = "document_checkpoints"
+
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    stage: Mapped[str] = mapped_column(String(40), primary_key=True)
+    data: Mapped[dict] = mapped_column(JSON, nullable=False, default={})
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
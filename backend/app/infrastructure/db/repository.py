@@ -19,6 +19,11 @@ class DocumentRepository:
         )
         return result.scalars().all()
 
+    async def update_analysis(self, doc: Document, analysis: dict) -> None:
+        # Reassign (not mutate) so the JSON column is flagged as changed
+        doc.analysis = analysis
+        await self.session.commit()
+
     async def delete(self, doc: Document) -> None:
         await self.session.delete(doc)
         await self.session.commit()
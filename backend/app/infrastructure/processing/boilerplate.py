@@ -0,0 +1,132 @@
+import re
+import logging
+from collections import Counter, deque
+from typing import Iterable, Iterator
+
+from app.infrastructure.processing.extraction import ExtractedPage
+
+logger = logging.getLogger(__name__)
+
+_DIGITS = re.compile(r"\d+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_line(line: str) -> str:
+    """Case/whitespace-insensitive form of a line."""
+    return _SPACES.sub(" ", line.strip().lower())
+
+
+def page_number_keys(line: str, page_number: int) -> set[tuple[str, int]]:
+    """
+    (numbers-masked line, page_number - n) for every number n in the line.
+    A page counter ("Page 3 of 10", "- 3 -") keeps one of these keys constant
+    from page to page, while numbered body text ("Section 3") does not.
+    """
+    numbers = _DIGITS.findall(line)
+    if not numbers:
+        return set()
+    masked = _DIGITS.sub("#", normalize_line(line))
+    return {(masked, page_number - int(n)) for n in numbers if len(n) <= 6}
+
+
+class BoilerplateFilter:
+    """
+    Learns which lines repeat across pages and strips them.
+
+    A line is boilerplate when, across the pages seen so far, it either
+    - sits among the first/last `edge_lines` lines of at least `edge_ratio`
+      of pages (running headers, footers), or is a page counter there, or
+    - appears anywhere on at least `body_ratio` of pages and is long enough
+      to be a disclaimer rather than a common short phrase.
+    Nothing is stripped before `min_pages` pages have been seen.
+    """
+
+    def __init__(
+        self,
+        edge_lines: int = 3,
+        edge_ratio: float = 0.5,
+        body_ratio: float = 0.8,
+        min_pages: int = 3,
+        min_body_chars: int = 40,
+    ):
+        self.edge_lines = edge_lines
+        self.edge_ratio = edge_ratio
+        self.body_ratio = body_ratio
+        self.min_pages = min_pages
+        self.min_body_chars = min_body_chars
+        self.pages_seen = 0
+        self.lines_removed = 0
+        self._edge_counts: Counter = Counter()
+        self._body_counts: Counter = Counter()
+        self._page_number_counts: Counter = Counter()
+
+    def _edge_indexes(self, lines: list[str]) -> set[int]:
+        non_empty = [i for i, line in enumerate(lines) if line.strip()]
+        return set(non_empty[:self.edge_lines] + non_empty[-self.edge_lines:])
+
+    def observe(self, text: str, page_number: int) -> None:
+        lines = text.split("\n")
+        edges = self._edge_indexes(lines)
+        self.pages_seen += 1
+        self._edge_counts.update({normalize_line(lines[i]) for i in edges})
+        self._body_counts.update({normalize_line(line) for line in lines if line.strip()})
+        self._page_number_counts.update(
+            {key for i in edges for key in page_number_keys(lines[i], page_number)}
+        )
+
+    def _is_page_counter(self, line: str, page_number: int, edge_min: float) -> bool:
+        return any(
+            self._page_number_counts[key] >= edge_min for key in page_number_keys(line, page_number)
+        )
+
+    def strip(self, text: str, page_number: int) -> str:
+        if self.pages_seen < self.min_pages:
+            return text
+
+        edge_min = max(self.min_pages, self.edge_ratio * self.pages_seen)
+        body_min = max(self.min_pages, self.body_ratio * self.pages_seen)
+
+        lines = text.split("\n")
+        edges = self._edge_indexes(lines)
+        kept = []
+        for i, line in enumerate(lines):
+            if line.strip():
+                key = normalize_line(line)
+                at_edge = i in edges and (
+                    self._edge_counts[key] >= edge_min or self._is_page_counter(line, page_number, edge_min)
+                )
+                if at_edge or (len(key) >= self.min_body_chars and self._body_counts[key] >= body_min):
+                    self.lines_removed += 1
+                    continue
+            kept.append(line)
+        return "\n".join(kept)
+
+
+def strip_boilerplate(
+    pages: Iterable[ExtractedPage],
+    lookahead: int = 8,
+    boilerplate_filter: BoilerplateFilter | None = None,
+) -> Iterator[ExtractedPage]:
+    """
+    Streams pages with repeated headers/footers/disclaimers removed.
+
+    The first `lookahead` pages are buffered to learn what repeats; after
+    that each page is learned from and stripped as it arrives, so memory
+    stays bounded by the lookahead window.
+    """
+    bp_filter = boilerplate_filter or BoilerplateFilter()
+    window: deque[ExtractedPage] = deque()
+
+    for page in pages:
+        bp_filter.observe(page.text, page.number)
+        window.append(page)
+        if len(window) > lookahead:
+            head = window.popleft()
+            yield ExtractedPage(head.number, bp_filter.strip(head.text, head.number))
+
+    while window:
+        head = window.popleft()
+        yield ExtractedPage(head.number, bp_filter.strip(head.text, head.number))
+
+    if bp_filter.lines_removed:
+        logger.info(f"Boilerplate: Removed {bp_filter.lines_removed} repeated lines across {bp_filter.pages_seen} pages")
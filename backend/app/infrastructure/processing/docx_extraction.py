@@ -0,0 +1,112 @@
+import re
+import zipfile
+from typing import IO, Iterator
+from xml.etree.ElementTree import iterparse
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+P, T, TAB, BR, CR = f"{_W}p", f"{_W}t", f"{_W}tab", f"{_W}br", f"{_W}cr"
+TBL, TR, TC = f"{_W}tbl", f"{_W}tr", f"{_W}tc"
+
+CELL_SEPARATOR = " | "
+
+_HEADER_PART = re.compile(r"word/header\d*\.xml")
+_FOOTER_PART = re.compile(r"word/footer\d*\.xml")
+
+
+def _iter_part_blocks(stream: IO[bytes], block_depth: int) -> Iterator[str]:
+    """
+    Streams the text of one WordprocessingML part (document, header, footer).
+
+    Yields one string per paragraph and one " | "-joined line per table row.
+    Nested tables and text boxes are flattened into their enclosing cell or
+    paragraph. Each top-level block (at `block_depth`) is cleared once read,
+    so memory stays bounded by the largest single paragraph or table row.
+    """
+    paragraphs: list[list[str]] = []  # Open paragraphs (text boxes nest them)
+    tables: list[dict] = []           # Open tables: current row cells + cell paragraphs
+    depth = 0
+    container = None
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == block_depth - 1:
+                container = elem
+            if elem.tag == P:
+                paragraphs.append([])
+            elif elem.tag == TBL:
+                tables.append({"cells": [], "paras": [], "rows": []})
+            continue
+
+        depth -= 1
+        tag = elem.tag
+
+        if tag == T and paragraphs:
+            paragraphs[-1].append(elem.text or "")
+        elif tag == TAB and paragraphs:
+            paragraphs[-1].append("\t")
+        elif (tag == BR or tag == CR) and paragraphs:
+            paragraphs[-1].append("\n")
+        elif tag == P and paragraphs:
+            text = "".join(paragraphs.pop())
+            if paragraphs:
+                # Text box inside a paragraph: keep it inline
+                paragraphs[-1].append(" " + text)
+            elif tables:
+                tables[-1]["paras"].append(text)
+            elif text.strip():
+                yield text
+        elif tag == TC and tables:
+            table = tables[-1]
+            table["cells"].append(" ".join(p for p in table["paras"] if p.strip()).strip())
+            table["paras"] = []
+        elif tag == TR and tables:
+            table = tables[-1]
+            row = CELL_SEPARATOR.join(table["cells"])
+            table["cells"] = []
+            if row.replace(CELL_SEPARATOR, "").strip():
+                if len(tables) == 1:
+                    yield row
+                else:
+                    table["rows"].append(row)
+        elif tag == TBL and tables:
+            nested = tables.pop()
+            if tables:
+                tables[-1]["paras"].append("; ".join(nested["rows"]))
+
+        if depth == block_depth - 1 and container is not None:
+            # Top-level block fully consumed: drop it from the tree
+            container.clear()
+
+
+def _part_names(names: list[str], pattern: re.Pattern) -> list[str]:
+    return sorted(n for n in names if pattern.fullmatch(n))
+
+
+def iter_docx_blocks(file_path: str) -> Iterator[str]:
+    """
+    Streams a .docx as text blocks: headers, then body paragraphs and table
+    rows in document order, then footers. Headers/footers that repeat across
+    sections are emitted once.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        names = zf.namelist()
+
+        seen: set[str] = set()
+
+        def page_furniture(pattern: re.Pattern) -> Iterator[str]:
+            for name in _part_names(names, pattern):
+                with zf.open(name) as part:
+                    for block in _iter_part_blocks(part, block_depth=2):
+                        if block not in seen:
+                            seen.add(block)
+                            yield block
+
+        yield from page_furniture(_HEADER_PART)
+
+        with zf.open("word/document.xml") as part:
+            # w:document > w:body > blocks
+            yield from _iter_part_blocks(part, block_depth=3)
+
+        yield from page_furniture(_FOOTER_PART)
@@ -0,0 +1,182 @@
+import queue
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Callable, Iterable, Iterator
+
+MONEY_MARKERS = ["$", "USD", "NGN", "€"]
+
+
+def pack_blocks(blocks: Iterable[str], max_chars: int) -> Iterator[str]:
+    """
+    Joins consecutive text blocks (paragraphs, lines) with newlines into
+    sections of roughly `max_chars`, so flat formats can be streamed as
+    several pages instead of one giant string. A single oversized block is
+    passed through whole.
+    """
+    section: list[str] = []
+    size = 0
+    for block in blocks:
+        if section and size + len(block) > max_chars:
+            yield "\n".join(section)
+            section, size = [], 0
+        section.append(block)
+        size += len(block) + 1
+    if section:
+        yield "\n".join(section)
+
+
+@dataclass
+class ExtractedPage:
+    """One sanitized unit of a document (a PDF page, a spreadsheet row group, or the whole file for flat formats)."""
+    number: int
+    text: str
+
+
+@dataclass
+class ExtractionResult:
+    """
+    The single, already-sanitized extraction of a document.
+
+    Built once per pipeline run and shared by the summarizer, the analysis
+    stats and the RAG chunker, so nothing downstream re-parses the file or
+    re-sanitizes the text.
+    """
+    pages: list[ExtractedPage]
+    source_type: str
+    ocr_pages: list[dict] = field(default_factory=list)
+    # False when OCR left pages out (time budget) or failed outright:
+    # a retry may do better, so such results are never cached
+    complete: bool = True
+
+    @classmethod
+    def from_text(cls, text: str, source_type: str, complete: bool = True) -> "ExtractionResult":
+        return cls(pages=[ExtractedPage(number=1, text=text)], source_type=source_type, complete=complete)
+
+    @cached_property
+    def text(self) -> str:
+        return "".join(page.text for page in self.pages)
+
+    @cached_property
+    def stats(self) -> dict:
+        text = self.text
+        return {
+            "word_count": len(text.split()),
+            # Basic token estimation: ~4 chars per token for English text
+            "estimated_tokens": len(text) // 4,
+            "contains_email": "@" in text,
+            "contains_money": any(s in text for s in MONEY_MARKERS),
+        }
+
+    def to_llama_documents(self) -> list:
+        """One LlamaIndex document per page, so chunks keep their page number."""
+        return pages_to_llama_documents(self.pages)
+
+
+def pages_to_llama_documents(pages: Iterable[ExtractedPage]) -> list:
+    from llama_index.core import Document as LlamaDocument
+
+    return [
+        LlamaDocument(text=page.text, metadata={"page": page.number})
+        for page in pages
+        if page.text
+    ]
+
+
+class ExtractionStream:
+    """
+    Yields a document's pages as they are extracted. Once exhausted, the
+    assembled ExtractionResult is available as `result`, so a streaming
+    consumer (e.g. the RAG indexer) and the summary still share a single
+    extraction pass.
+
+    With `keep_pages=False` pages are not retained: memory stays flat for
+    consumers that only iterate, and `result` stays None.
+    """
+
+    def __init__(
+        self,
+        pages: Iterable[ExtractedPage],
+        source_type: str,
+        ocr_pages: list[dict] | None = None,
+        finalize: Callable[[ExtractionResult], ExtractionResult] | None = None,
+        keep_pages: bool = True,
+    ):
+        if finalize is not None and not keep_pages:
+            raise ValueError("finalize needs the pages: use keep_pages=True")
+        self._pages = pages
+        self.source_type = source_type
+        self.ocr_pages = ocr_pages if ocr_pages is not None else []
+        self._finalize = finalize
+        self.keep_pages = keep_pages
+        self.result: ExtractionResult | None = None
+        self._consumed = False
+
+    def __iter__(self) -> Iterator[ExtractedPage]:
+        if self._consumed:
+            raise RuntimeError("ExtractionStream can only be consumed once")
+        self._consumed = True
+
+        collected = []
+        for page in self._pages:
+            if self.keep_pages:
+                collected.append(page)
+            yield page
+
+        if self.keep_pages:
+            result = ExtractionResult(collected, self.source_type, self.ocr_pages)
+            self.result = self._finalize(result) if self._finalize else result
+
+    def collect(self) -> ExtractionResult:
+        """Drains the stream and returns the full result."""
+        for _ in self:
+            pass
+        return self.result
+
+    def run_ahead(
+        self,
+        on_complete: Callable[[ExtractionResult], None] | None = None,
+        buffer_pages: int = 32,
+    ) -> Iterator[ExtractedPage]:
+        """
+        Drains the stream on a background thread and yields its pages as they
+        arrive, so extraction runs ahead of a slower consumer by up to
+        `buffer_pages` pages, then waits for it. `on_complete(result)` runs
+        on that thread as soon as the last page is extracted, e.g. to start
+        the summary while the consumer is still embedding.
+        """
+        pages: queue.Queue = queue.Queue(maxsize=max(1, buffer_pages))
+        done = object()
+        # Set when the consumer stops early, so a producer waiting on a full queue gives up
+        abandoned = threading.Event()
+
+        def put(item) -> bool:
+            while not abandoned.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for page in self:
+                    if not put(page):
+                        return
+                if on_complete is not None:
+                    on_complete(self.result)
+            except BaseException as e:
+                put(e)
+            finally:
+                put(done)
+
+        threading.Thread(target=produce, name="extraction-run-ahead", daemon=True).start()
+
+        try:
+            while (item := pages.get()) is not done:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            abandoned.set()
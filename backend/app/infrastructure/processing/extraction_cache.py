@@ -0,0 +1,153 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+
+from app.domain.services.storage_interface import StorageInterface
+from app.infrastructure.processing.extraction import ExtractedPage, ExtractionResult
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction output changes (parsers, OCR, sanitizer) so stale
+# artifacts are never served.
+EXTRACTOR_VERSION = "3"
+
+
+def file_content_hash(file_path: str) -> str:
+    """SHA-256 of the file bytes, matching Document.content_hash set on upload."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(content_hash: str) -> str:
+    # Flat name: storage backends map file ids straight to paths/object keys
+    return f"extraction-cache-{content_hash}-v{EXTRACTOR_VERSION}.json.gz"
+
+
+def serialize_extraction(result: ExtractionResult) -> bytes:
+    """Compressed artifact: the full text once, plus per-page offsets into it."""
+    offsets, position = [], 0
+    for page in result.pages:
+        offsets.append([page.number, position, position + len(page.text)])
+        position += len(page.text)
+
+    payload = {
+        "version": EXTRACTOR_VERSION,
+        "source_type": result.source_type,
+        "text": result.text,
+        "pages": offsets,
+        "ocr_pages": result.ocr_pages,
+    }
+    return gzip.compress(json.dumps(payload).encode("utf-8"), compresslevel=6)
+
+
+def deserialize_extraction(data: bytes) -> ExtractionResult:
+    payload = json.loads(gzip.decompress(data).decode("utf-8"))
+    text = payload["text"]
+    return ExtractionResult(
+        pages=[ExtractedPage(number=n, text=text[start:end]) for n, start, end in payload["pages"]],
+        source_type=payload["source_type"],
+        ocr_pages=payload.get("ocr_pages", []),
+    )
+
+
+class LocalExtractionCache:
+    """
+    Extraction artifacts on local disk (shared by workers on the same host/volume).
+
+    Bounded: after each write, artifacts older than `max_age_days` are removed,
+    then the least recently used ones until the directory is under `max_mb`.
+    Hits refresh an artifact's mtime, so it doubles as the last-use time.
+    """
+
+    def __init__(self, directory: str | None = None, max_mb: int = 1024, max_age_days: float = 30):
+        self.directory = Path(directory or os.path.join(tempfile.gettempdir(), "extraction-cache"))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_mb * 1024 * 1024
+        self.max_age_seconds = max_age_days * 24 * 3600
+
+    def get(self, content_hash: str) -> ExtractionResult | None:
+        path = self.directory / cache_key(content_hash)
+        try:
+            result = deserialize_extraction(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Extraction cache: Ignoring unreadable artifact {path}: {e}")
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # Evicted meanwhile: the result is still good
+        return result
+
+    def put(self, content_hash: str, result: ExtractionResult) -> None:
+        path = self.directory / cache_key(content_hash)
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(serialize_extraction(result))
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> int:
+        """Applies the age and size limits. Returns the number of artifacts removed."""
+        artifacts = []
+        for path in self.directory.glob("extraction-cache-*.json.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Removed by another worker
+            artifacts.append((stat.st_mtime, stat.st_size, path))
+
+        # Least recently used first
+        artifacts.sort(key=lambda artifact: artifact[0])
+        expired_before = time.time() - self.max_age_seconds
+        total = sum(size for _, size, _ in artifacts)
+        removed = 0
+        for mtime, size, path in artifacts:
+            if mtime >= expired_before and total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Extraction cache: Evicted {removed} artifacts, {total // (1024 * 1024)} MB left")
+        return removed
+
+
+class StorageExtractionCache:
+    """Extraction artifacts stored next to the originals in the configured storage backend."""
+
+    def __init__(self, storage: StorageInterface):
+        self.storage = storage
+
+    def get(self, content_hash: str) -> ExtractionResult | None:
+        key = cache_key(content_hash)
+        try:
+            path = async_to_sync(self.storage.get_file_path)(key)
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as f:
+                return deserialize_extraction(f.read())
+        except Exception:
+            # Object-store backends raise on a missing key; that is a plain miss
+            return None
+
+    def put(self, content_hash: str, result: ExtractionResult) -> None:
+        key = cache_key(content_hash)
+        async_to_sync(self.storage.upload)(
+            file_id=key,
+            file_name=key,
+            file_bytes=serialize_extraction(result),
+            content_type="application/gzip",
+        )
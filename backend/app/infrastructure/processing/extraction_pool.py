@@ -0,0 +1,215 @@
+import sys
+import logging
+import resource
+import weakref
+import threading
+import multiprocessing
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from app.domain.exceptions import ProcessingError
+from app.infrastructure.processing.process_tree import PoolChildren, report_pid
+
+logger = logging.getLogger(__name__)
+
+# Parser stacks imported once per child, before its first document
+WARM_IMPORTS = (
+    "pypdf",
+    "pandas",
+    "openpyxl",
+    "pdf2image",
+    "pytesseract",
+    "PIL.Image",
+    "app.infrastructure.processing.processor_service",
+)
+
+_child_processor = None
+
+
+def _warm_child(pids=None) -> None:
+    """Pool initializer: reports its pid, then pays the parser import cost before any document arrives."""
+    import importlib
+
+    if pids is not None:
+        report_pid(pids)
+
+    for module in WARM_IMPORTS:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"Extraction pool: Could not pre-import {module}: {e}")
+
+
+def _get_child_processor():
+    global _child_processor
+    if _child_processor is None:
+        from app.infrastructure.config import settings
+        from app.infrastructure.processing.processor_service import DocumentProcessor
+
+        # Extraction only: no AI clients, no cache (the parent owns the cache)
+        _child_processor = DocumentProcessor(settings.ai_provider, extraction_cache=None)
+    return _child_processor
+
+
+def _cpu_seconds_used() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_extraction(file_path: str, mime_type: str | None, cpu_seconds: int):
+    """
+    Runs one document's extraction inside a pool child under a CPU-time limit.
+    The soft RLIMIT_CPU is set relative to what this child has already used,
+    so the kernel SIGXCPU-kills a runaway parse; it is lifted again afterwards.
+    Returns (ExtractionResult, peak RSS in MB).
+    """
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if cpu_seconds > 0:
+        soft = int(_cpu_seconds_used()) + cpu_seconds
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        result = _get_child_processor()._extract_text_metadata(file_path, mime_type)
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+    return result, _peak_rss_mb()
+
+
+class ExtractionPool:
+    """
+    Dedicated process pool for text extraction, so parser memory lives and
+    dies outside the long-lived Celery worker.
+
+    Children are spawned (not forked from the worker), warmed with the parser
+    imports, replaced after `max_tasks_per_child` documents and whenever one
+    reports a peak RSS above `max_rss_mb`. Each document runs under a
+    `cpu_seconds` CPU-time limit; a child killed by it (or by the OOM killer)
+    surfaces as a ProcessingError and the pool is rebuilt.
+
+    RLIMIT_CPU only counts the child's own CPU time: the Tesseract/pdftoppm
+    processes OCR spawns each get a fresh allowance. `timeout_seconds` caps
+    the wall-clock time of a document, OCR included; when it fires, the
+    pool's children (and their OCR processes with them) are terminated.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_tasks_per_child: int = 20,
+        max_rss_mb: int = 700,
+        cpu_seconds: int = 300,
+        timeout_seconds: int = 600,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_tasks_per_child = max(1, max_tasks_per_child)
+        self.max_rss_mb = max_rss_mb
+        self.cpu_seconds = cpu_seconds
+        self.timeout_seconds = timeout_seconds
+        # Pools killed for a runaway document: their other documents are resubmitted
+        self._terminated = weakref.WeakSet()
+        self._children: weakref.WeakKeyDictionary[ProcessPoolExecutor, PoolChildren] = weakref.WeakKeyDictionary()
+        self._pool: ProcessPoolExecutor | None = None
+        self._tasks_since_start = 0
+        self._lock = threading.Lock()
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                kwargs = {}
+                if sys.version_info >= (3, 11):
+                    kwargs["max_tasks_per_child"] = self.max_tasks_per_child
+                context = multiprocessing.get_context("spawn")
+                children = PoolChildren(context)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_warm_child,
+                    initargs=(children.queue,),
+                    **kwargs,
+                )
+                self._children[self._pool] = children
+                self._tasks_since_start = 0
+                logger.info(f"Extraction pool: Started {self.max_workers} warm process(es)")
+            return self._pool
+
+    def recycle(self, reason: str) -> None:
+        with self._lock:
+            pool = self._pool
+        if pool is not None:
+            self._retire(pool, reason)
+
+    def _retire(self, pool: ProcessPoolExecutor, reason: str, terminate: bool = False) -> None:
+        """
+        Stops handing new documents to `pool`; the next caller starts a fresh
+        one. Other threads may still be waiting on documents `pool` already
+        accepted, so its children finish those and then exit, unless
+        `terminate` kills them right away (a runaway document).
+        """
+        with self._lock:
+            if terminate:
+                self._terminated.add(pool)
+            if self._pool is pool:
+                self._pool = None
+                logger.info(f"Extraction pool: Recycling ({reason})")
+        if terminate:
+            children = self._children.get(pool)
+            if children is not None:
+                children.terminate()
+        # Documents queued behind a runaway one are cancelled and resubmitted by their callers
+        pool.shutdown(wait=False, cancel_futures=terminate)
+
+    def warm_up(self) -> None:
+        """Starts the children now instead of on the first document."""
+        pool = self._ensure_pool()
+        for future in [pool.submit(_cpu_seconds_used) for _ in range(self.max_workers)]:
+            future.result()
+
+    def extract(self, file_path: str, mime_type: str | None = None):
+        resubmitted = False
+        while True:
+            pool = self._ensure_pool()
+            try:
+                future = pool.submit(run_extraction, file_path, mime_type, self.cpu_seconds)
+            except RuntimeError:
+                # Retired by another thread between _ensure_pool and submit
+                continue
+
+            try:
+                result, peak_rss_mb = future.result(timeout=self.timeout_seconds or None)
+            except FutureTimeoutError:
+                self._retire(pool, f"{file_path} ran over {self.timeout_seconds}s", terminate=True)
+                raise ProcessingError(
+                    f"Text extraction error: Extraction did not finish within {self.timeout_seconds}s"
+                )
+            except (BrokenProcessPool, CancelledError):
+                if pool in self._terminated and not resubmitted:
+                    # Killed for another document's runaway extraction, not this one's
+                    resubmitted = True
+                    continue
+                self._retire(pool, "child died")
+                raise ProcessingError(
+                    f"Text extraction error: Extraction process was killed "
+                    f"(CPU limit of {self.cpu_seconds}s or memory exhausted)"
+                )
+            break
+
+        with self._lock:
+            if self._pool is pool:
+                self._tasks_since_start += 1
+            tasks_since_start = self._tasks_since_start
+        if peak_rss_mb > self.max_rss_mb:
+            self._retire(pool, f"peak RSS {peak_rss_mb:.0f}MB > {self.max_rss_mb}MB")
+        elif sys.version_info < (3, 11) and tasks_since_start >= self.max_tasks_per_child * self.max_workers:
+            self._retire(pool, f"{tasks_since_start} documents processed")
+
+        return result
+
+    def shutdown(self) -> None:
+        self.recycle("shutdown")
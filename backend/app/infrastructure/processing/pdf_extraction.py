@@ -0,0 +1,206 @@
+import io
+import shutil
+import logging
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import Callable, Iterator
+
+from pypdf import PdfReader
+
+from app.infrastructure.processing.text_sanitizer import sanitize_text
+
+logger = logging.getLogger(__name__)
+
+
+def count_pdf_pages(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+
+def split_page_range(page_count: int, pages_per_task: int) -> list[tuple[int, int]]:
+    """Splits [0, page_count) into contiguous (start, stop) windows."""
+    pages_per_task = max(1, pages_per_task)
+    return [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+
+def find_sparse_pages(page_texts: list[str], min_chars: int) -> list[int]:
+    """
+    Returns the 1-based numbers of pages whose text layer is below the
+    density threshold. Only alphanumerics count, so stray glyphs or
+    punctuation from a scanned page do not pass as a text layer.
+    """
+    return [
+        i + 1
+        for i, text in enumerate(page_texts)
+        if sum(c.isalnum() for c in text) < min_chars
+    ]
+
+
+# PDF TEXT BACKENDS
+# Each takes (file_path, start, stop) and returns the raw text of the
+# 0-based pages [start, stop). Imports are local so optional backends cost
+# nothing unless selected.
+
+def _pypdf_pages(file_path: str, start: int, stop: int) -> list[str]:
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _pdfminer_pages(file_path: str, start: int, stop: int) -> list[str]:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    texts = []
+    out = io.StringIO()
+    rsrcmgr = PDFResourceManager(caching=True)
+    with open(file_path, "rb") as fp, TextConverter(rsrcmgr, out, laparams=LAParams()) as device:
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for page in PDFPage.get_pages(fp, pagenos=set(range(start, stop))):
+            interpreter.process_page(page)
+            # TextConverter ends every page with a form feed
+            texts.append(out.getvalue().rstrip("\f"))
+            out.seek(0)
+            out.truncate(0)
+    return texts
+
+
+def _pdftotext_pages(file_path: str, start: int, stop: int) -> list[str]:
+    """poppler's pdftotext CLI (C++), one call per page range."""
+    completed = subprocess.run(
+        ["pdftotext", "-f", str(start + 1), "-l", str(stop), "-enc", "UTF-8", file_path, "-"],
+        capture_output=True,
+        check=True,
+    )
+    pages = completed.stdout.decode("utf-8", errors="ignore").split("\f")
+    # Output ends with a trailing form feed; pad in case pages came back short
+    pages = pages[: stop - start]
+    return pages + [""] * (stop - start - len(pages))
+
+
+def _pymupdf_pages(file_path: str, start: int, stop: int) -> list[str]:
+    import fitz
+
+    with fitz.open(file_path) as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
+
+PDF_BACKENDS: dict[str, Callable[[str, int, int], list[str]]] = {
+    "pypdf": _pypdf_pages,
+    "pdfminer": _pdfminer_pages,
+    "pdftotext": _pdftotext_pages,
+    "pymupdf": _pymupdf_pages,
+}
+
+DEFAULT_PDF_BACKEND = "pypdf"
+
+
+def _backend_installed(name: str) -> bool:
+    if name == "pdftotext":
+        return shutil.which("pdftotext") is not None
+    module = {"pypdf": "pypdf", "pdfminer": "pdfminer", "pymupdf": "fitz"}[name]
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def available_pdf_backends() -> list[str]:
+    return [name for name in PDF_BACKENDS if _backend_installed(name)]
+
+
+@lru_cache(maxsize=None)
+def resolve_pdf_backend(name: str | None) -> str:
+    """Validates the configured backend, falling back to pypdf when it is unknown or missing."""
+    name = (name or DEFAULT_PDF_BACKEND).lower()
+    if name not in PDF_BACKENDS:
+        logger.warning(f"PDF: Unknown backend '{name}', using {DEFAULT_PDF_BACKEND}")
+        return DEFAULT_PDF_BACKEND
+    if not _backend_installed(name):
+        logger.warning(f"PDF: Backend '{name}' is not installed, using {DEFAULT_PDF_BACKEND}")
+        return DEFAULT_PDF_BACKEND
+    return name
+
+
+def extract_page_range(file_path: str, start: int, stop: int, backend: str = DEFAULT_PDF_BACKEND) -> list[str]:
+    """
+    Extracts and sanitizes pages [start, stop) of a PDF with the given backend.
+    Module-level so it can be shipped to a process pool worker.
+    """
+    return [sanitize_text(text) for text in PDF_BACKENDS[backend](file_path, start, stop)]
+
+
+def iter_pdf_page_blocks(
+    file_path: str,
+    pages_per_block: int,
+    parallel: bool = False,
+    max_workers: int = 1,
+    min_pages: int = 0,
+    backend: str = DEFAULT_PDF_BACKEND,
+) -> Iterator[list[str]]:
+    """
+    Yields sanitized page texts in document order, one block of up to
+    `pages_per_block` pages at a time, so consumers can start on the first
+    pages while later ones are still being parsed.
+
+    In parallel mode the blocks are extracted on a bounded process pool.
+    Small documents, and daemonic processes (e.g. a Celery prefork child)
+    that cannot spawn children, use the serial path.
+    """
+    backend = resolve_pdf_backend(backend)
+    page_count = count_pdf_pages(file_path)
+    ranges = split_page_range(page_count, pages_per_block)
+
+    use_pool = parallel and len(ranges) > 1 and max_workers > 1 and page_count >= min_pages
+    if use_pool and multiprocessing.current_process().daemon:
+        logger.warning("PDF: Daemonic worker process, parallel extraction disabled for this run.")
+        use_pool = False
+
+    if not use_pool:
+        if backend == DEFAULT_PDF_BACKEND:
+            # One reader for the whole document
+            reader = PdfReader(file_path)
+            for start, stop in ranges:
+                yield [sanitize_text(reader.pages[i].extract_text() or "") for i in range(start, stop)]
+            return
+        for start, stop in ranges:
+            yield extract_page_range(file_path, start, stop, backend)
+        return
+
+    workers = min(max_workers, len(ranges))
+    logger.info(f"PDF: Extracting {page_count} pages in {len(ranges)} ranges on {workers} processes ({backend})")
+
+    starts, stops = zip(*ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, so the page order is kept
+        yield from pool.map(extract_page_range, repeat(file_path), starts, stops, repeat(backend))
+
+
+def extract_pdf_pages_serial(file_path: str, backend: str = DEFAULT_PDF_BACKEND) -> list[str]:
+    """Single-core extraction, one sanitized string per page."""
+    blocks = iter_pdf_page_blocks(file_path, pages_per_block=16, backend=backend)
+    return [page for block in blocks for page in block]
+
+
+def extract_pdf_pages_parallel(
+    file_path: str,
+    max_workers: int,
+    pages_per_task: int,
+    min_pages: int = 0,
+    backend: str = DEFAULT_PDF_BACKEND,
+) -> list[str]:
+    """
+    Splits the page range across a bounded process pool and returns the
+    sanitized page texts in document order.
+    """
+    blocks = iter_pdf_page_blocks(
+        file_path, pages_per_task, parallel=True, max_workers=max_workers, min_pages=min_pages, backend=backend
+    )
+    return [page for block in blocks for page in block]
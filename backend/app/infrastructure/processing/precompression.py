@@ -0,0 +1,109 @@
+import re
+import time
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])")
+_WORD = re.compile(r"[a-z0-9]{2,}")
+
+# Fragments shorter than this (page numbers, stray labels) are never selected
+MIN_SENTENCE_CHARS = 20
+
+
+@dataclass
+class Compression:
+    text: str
+    original_chars: int
+    sentences_total: int
+    sentences_kept: int
+    seconds: float
+
+    @property
+    def compressed_chars(self) -> int:
+        return len(self.text)
+
+    @property
+    def ratio(self) -> float:
+        return self.compressed_chars / self.original_chars if self.original_chars else 1.0
+
+
+def split_sentences(text: str) -> list[str]:
+    """
+    Paragraphs are separated by blank lines; line breaks inside a paragraph
+    (PDF layout) are joined before splitting on sentence punctuation.
+    """
+    sentences = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        if paragraph:
+            sentences.extend(s.strip() for s in _SENTENCE_END.split(paragraph) if s.strip())
+    return sentences
+
+
+def centrality_scores(sentences: list[str]) -> np.ndarray:
+    """
+    Degree centrality of each sentence in the TF-IDF cosine-similarity graph:
+    the sum of its similarities to every other sentence. With unit vectors
+    that is the dot product with the sum of all vectors, so it is computed
+    from the sparse (sentence, term) entries in O(terms) with no n x n matrix.
+    """
+    n = len(sentences)
+    vocab: dict[str, int] = {}
+    rows, cols = [], []
+    for i, sentence in enumerate(sentences):
+        for word in _WORD.findall(sentence.lower()):
+            rows.append(i)
+            cols.append(vocab.setdefault(word, len(vocab)))
+    if not cols:
+        return np.zeros(n)
+
+    v = len(vocab)
+    pairs, tf = np.unique(np.asarray(rows, dtype=np.int64) * v + np.asarray(cols, dtype=np.int64), return_counts=True)
+    r, c = np.divmod(pairs, v)
+
+    df = np.bincount(c, minlength=v)
+    idf = np.log((1 + n) / (1 + df)) + 1.0
+    weights = (1.0 + np.log(tf)) * idf[c]
+    norms = np.sqrt(np.bincount(r, weights=weights * weights, minlength=n))
+    weights /= norms[r]
+
+    centroid = np.bincount(c, weights=weights, minlength=v)
+    scores = np.bincount(r, weights=weights * centroid[c], minlength=n)
+    # Drop each sentence's similarity to itself (1 for any sentence with terms)
+    return scores - (norms > 0)
+
+
+def compress(text: str, budget_chars: int) -> Compression:
+    """
+    Keeps the most central sentences, in document order, within `budget_chars`.
+    Text that already fits is returned unchanged.
+    """
+    started = time.perf_counter()
+    sentences = split_sentences(text)
+
+    if len(text) <= budget_chars or len(sentences) < 2:
+        return Compression(text, len(text), len(sentences), len(sentences), time.perf_counter() - started)
+
+    scores = centrality_scores(sentences)
+    lengths = np.fromiter((len(s) for s in sentences), dtype=np.int64, count=len(sentences))
+    scores[lengths < MIN_SENTENCE_CHARS] = -np.inf
+
+    kept, used = [], 0
+    for i in np.argsort(-scores, kind="stable"):
+        if scores[i] == -np.inf:
+            break
+        if used + lengths[i] + 1 <= budget_chars:
+            kept.append(i)
+            used += lengths[i] + 1
+
+    compressed = " ".join(sentences[i] for i in sorted(kept))
+    result = Compression(compressed, len(text), len(sentences), len(kept), time.perf_counter() - started)
+    logger.info(
+        f"Pre-compression: {result.sentences_kept}/{result.sentences_total} sentences, "
+        f"{result.original_chars} -> {result.compressed_chars} chars in {result.seconds * 1000:.0f}ms"
+    )
+    return result
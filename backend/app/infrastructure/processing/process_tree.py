@@ -0,0 +1,57 @@
+import os
+import signal
+
+
+def child_pids(pid: int) -> list[int]:
+    """Direct children of `pid`, from /proc (Linux; elsewhere none are found)."""
+    children = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # "pid (comm) state ppid ...": comm may contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+
+def terminate_tree(pid: int) -> None:
+    """SIGKILLs a pool worker and the processes it started (Tesseract, pdftoppm, OCR workers)."""
+    for child in child_pids(pid):
+        terminate_tree(child)
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def report_pid(queue) -> None:
+    """Pool initializer (or its first step): tells the parent which pid this child has."""
+    queue.put(os.getpid())
+
+
+class PoolChildren:
+    """
+    PIDs of one process pool's children, reported by `report_pid` from the
+    pool initializer, so a runaway pool can be killed without reaching into
+    the executor's private process table.
+    """
+
+    def __init__(self, context):
+        self.queue = context.SimpleQueue()
+        self._pids: set[int] = set()
+
+    def pids(self) -> list[int]:
+        while not self.queue.empty():
+            self._pids.add(self.queue.get())
+        # Children replaced after max_tasks_per_child have exited; their pids may be reused
+        self._pids &= set(child_pids(os.getpid()))
+        return sorted(self._pids)
+
+    def terminate(self) -> None:
+        for pid in self.pids():
+            terminate_tree(pid)
@@ -1,26 +1,54 @@
 import os
 import logging
+import zipfile
 import asyncio
-import pandas as pd
-import pytesseract
 from ollama import Client
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_message
-from pypdf import PdfReader
 from google import genai
-from docx import Document as DocxReader
-from pdf2image import convert_from_path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 
 from app.infrastructure.config import settings
 from app.domain.exceptions import ProcessingError
 from app.domain.services.document_processor import DocumentProcessorInterface
+from app.infrastructure.processing.text_sanitizer import sanitize_text
+from app.infrastructure.processing.pdf_extraction import (
+    DEFAULT_PDF_BACKEND,
+    find_sparse_pages,
+    iter_pdf_page_blocks,
+    resolve_pdf_backend,
+)
+from app.infrastructure.processing.text_extraction import iter_text_blocks
+from app.infrastructure.processing.spreadsheet_extraction import iter_csv_row_groups, iter_excel_row_groups
+from app.infrastructure.processing.ocr_engine import OCREngine, image_frame_count
+from app.infrastructure.processing.docx_extraction import iter_docx_blocks
+from app.infrastructure.processing.extraction import ExtractedPage, ExtractionResult, ExtractionStream, pack_blocks
+from app.infrastructure.processing.extraction_cache import file_content_hash
+from app.infrastructure.processing.summarization import (
+    CHARS_PER_TOKEN,
+    SUMMARY_PROMPT_VERSION,
+    ChunkSummaryCache,
+    MapReduceSummarizer,
+)
+from app.infrastructure.processing.summary_cache import summary_cache_key
+from app.infrastructure.processing.precompression import Compression, compress
 
 logger = logging.getLogger(__name__)
 
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff")
+
 
 class DocumentProcessor(DocumentProcessorInterface):
-    def __init__(self, provider: str, ollama_client: Client = None, gemini_client: genai.Client = None):
+    def __init__(
+        self,
+        provider: str,
+        ollama_client: Client = None,
+        gemini_client: genai.Client = None,
+        ocr_engine: OCREngine = None,
+        extraction_cache: Any = None,
+        extraction_pool: Any = None,
+        summary_cache: Any = None,
+    ):
         """
         Dependency Injected Constructor.
         Clients are passed in rather than created internally for better coupling.
@@ -28,124 +56,406 @@ class DocumentProcessor(DocumentProcessorInterface):
         self.provider = provider.lower()
         self.ollama_client = ollama_client
         self.gemini_client = gemini_client
+        self.ocr_engine = ocr_engine or OCREngine(
+            max_workers=settings.ocr_workers,
+            pages_per_window=settings.ocr_pages_per_window,
+            dpi=settings.ocr_dpi,
+            max_memory_mb=settings.ocr_max_memory_mb,
+            time_budget_seconds=settings.ocr_time_budget_seconds,
+            adaptive=settings.ocr_adaptive_dpi,
+            low_dpi=settings.ocr_low_dpi,
+            high_dpi=settings.ocr_high_dpi,
+            min_confidence=settings.ocr_min_confidence,
+            image_dpi=settings.ocr_image_dpi,
+            preprocess_images=settings.ocr_preprocess_images,
+            binarize=settings.ocr_binarize,
+        )
+        # Optional content-hash keyed artifact cache (see extraction_cache.py)
+        self.extraction_cache = extraction_cache
+        # Optional out-of-process extraction (see extraction_pool.py)
+        self.extraction_pool = extraction_pool
+        # Optional summary cache keyed by content hash + model + prompt (see summary_cache.py)
+        self.summary_cache = summary_cache
         
         self.ollama_model = settings.ollama_model
         self.gemini_model = settings.gemini_model
         self.api_key = settings.gemini_api.strip('"') if settings.gemini_api else ""
 
+        # Long documents are summarized section by section, then merged (see summarization.py)
+        self.summarizer = MapReduceSummarizer(
+            generate=self._complete,
+            model=self.ollama_model if self.provider == "ollama" else self.gemini_model,
+            max_workers=settings.summary_workers,
+            chunk_tokens=settings.summary_chunk_tokens,
+            level_token_budget=settings.summary_level_token_budget,
+            cache=ChunkSummaryCache(settings.summary_cache_entries),
+        )
+
+    # SUMMARY INPUT
+
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        """One non-streaming completion, capped at `max_tokens` output tokens."""
+        if self.provider == "ollama":
+            response = self.ollama_client.chat(
+                model=self.ollama_model,
+                keep_alive=settings.ollama_keep_alive,
+                options={"temperature": 0.2, "num_predict": max_tokens},
+                messages=[{"role": "user", "content": prompt}],
+            )
+            return self._sanitize_text(response["message"]["content"])
+
+        response = self.gemini_client.models.generate_content(
+            model=self.gemini_model,
+            contents=[prompt],
+            config={"max_output_tokens": max_tokens},
+        )
+        return self._sanitize_text(response.text or "")
+
+    def _summary_input(self, text: str, limit: int) -> str:
+        """
+        Fits the document into one summary prompt of `limit` characters:
+        map-reduced section summaries in map_reduce mode, otherwise the
+        leading `limit` characters.
+        """
+        if len(text) <= limit:
+            return text
+        if settings.summary_mode.lower() == "map_reduce":
+            return self.summarizer.condense(text, limit)
+        return text[:limit] + "...(truncated)"
+
+    # SUMMARY CACHE
+
+    def _summary_cache_key(self, file_path: str, content_hash: str | None, prompt: str) -> str | None:
+        """
+        Cache key for one summary prompt over this file, or None when caching is
+        off. Everything that changes the summary input (map-reduce vs truncation,
+        pre-compression budget) is part of the prompt version.
+        """
+        if self.summary_cache is None:
+            return None
+        if not content_hash:
+            try:
+                content_hash = file_content_hash(file_path)
+            except OSError:
+                return None
+
+        version = f"{prompt}.{SUMMARY_PROMPT_VERSION}.{settings.summary_mode.lower()}"
+        if settings.summary_precompression:
+            version += f".pc{settings.summary_precompression_chars}"
+        model = self.ollama_model if self.provider == "ollama" else self.gemini_model
+        return summary_cache_key(content_hash, self.provider, model, version)
+
+    def _cached_summary(self, key: str | None) -> str | None:
+        if key is None:
+            return None
+        try:
+            summary = self.summary_cache.get(key)
+        except Exception as e:
+            logger.warning(f"Summary cache lookup failed: {e}")
+            return None
+        if summary is not None:
+            logger.info("Summary cache hit: skipping generation")
+        return summary
+
+    def _store_summary(self, key: str | None, summary: str) -> None:
+        if key is None or not summary.strip():
+            return
+        try:
+            self.summary_cache.put(key, summary)
+        except Exception as e:
+            # A cache write failure must never fail the document
+            logger.warning(f"Summary cache write failed: {e}")
+
     # TEXT SANITIZATION (GLOBAL – CRITICAL)
     
-    def _sanitize_text(self, text: str) -> str:
-        if not text:
-            return ""
+    def _sanitize_text(self, text: str, strip: bool = True) -> str:
+        return sanitize_text(text, strip)
 
-        # Remove NULL bytes (DB / JSON killers)
-        text = text.replace("\x00", "")
+    # TEXT EXTRACTION (CACHED BY CONTENT HASH)
 
-        # Remove other control characters except whitespace
-        text = "".join(
-            c for c in text
-            if c.isprintable() or c in "\n\r\t"
+    def stream_extraction(
+        self,
+        file_path: str,
+        mime_type: str | None = None,
+        content_hash: str | None = None,
+    ) -> ExtractionStream:
+        """
+        Streams the document's pages as they are extracted. Served from the
+        artifact cache when this content hash was extracted before; otherwise
+        the finished extraction is stored for retries and re-processing.
+        """
+        source_type = self._detect_source_type(file_path, mime_type)
+
+        if self.extraction_cache is not None:
+            content_hash = content_hash or file_content_hash(file_path)
+            backend = resolve_pdf_backend(settings.pdf_backend)
+            if source_type == "pdf" and backend != DEFAULT_PDF_BACKEND:
+                # Backends produce different text: keep their artifacts apart
+                content_hash = f"{content_hash}-{backend}"
+            try:
+                cached = self.extraction_cache.get(content_hash)
+            except Exception as e:
+                logger.warning(f"Extraction cache lookup failed: {e}")
+                cached = None
+
+            if cached is not None:
+                logger.info(f"Extraction cache hit for {content_hash[:12]}: skipping extraction")
+                return ExtractionStream(cached.pages, cached.source_type, cached.ocr_pages)
+
+        if self.extraction_pool is not None:
+            # Isolated run: the document arrives whole, not page by page
+            result = self.extraction_pool.extract(file_path, mime_type)
+            if self.extraction_cache is not None and result.complete:
+                try:
+                    self.extraction_cache.put(content_hash, result)
+                except Exception as e:
+                    logger.warning(f"Extraction cache write failed: {e}")
+            return ExtractionStream(result.pages, result.source_type, result.ocr_pages)
+
+        ocr_report = []
+
+        def finalize(result: ExtractionResult) -> ExtractionResult:
+            result = self._finalize_extraction(result)
+            if self.extraction_cache is not None and result.complete:
+                try:
+                    self.extraction_cache.put(content_hash, result)
+                except Exception as e:
+                    # A cache write failure must never fail the document
+                    logger.warning(f"Extraction cache write failed: {e}")
+            return result
+
+        return ExtractionStream(
+            self._iter_extracted_pages(file_path, mime_type, source_type, ocr_report),
+            source_type,
+            ocr_report,
+            finalize,
         )
 
-        return text.strip()
+    def _get_extraction(
+        self,
+        file_path: str,
+        mime_type: str | None = None,
+        content_hash: str | None = None,
+    ) -> ExtractionResult:
+        """Returns the full (possibly cached) extraction in one go."""
+        return self.stream_extraction(file_path, mime_type, content_hash).collect()
 
     # TEXT EXTRACTION (EXTENSION + MIME SAFE)
-    
-    def _extract_text_metadata(self, file_path: str, mime_type: str | None = None) -> str:
-        text = ""
 
-        try:
-            ext = os.path.splitext(file_path)[1].lower()
-
-            is_pdf = ext == ".pdf" or mime_type == "application/pdf"
-            is_docx = (
-                ext in [".docx", ".doc"]
-                or mime_type in [
-                    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    "application/msword",
-                ]
-            )
-            is_excel = (
-                ext in [".xls", ".xlsx"]
-                or mime_type in [
-                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    "application/vnd.ms-excel",
-                ]
+    def _detect_source_type(self, file_path: str, mime_type: str | None = None) -> str:
+        ext = os.path.splitext(file_path)[1].lower()
+
+        if ext == ".pdf" or mime_type == "application/pdf":
+            return "pdf"
+        if ext in [".docx", ".doc"] or mime_type in [
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            "application/msword",
+        ]:
+            return "docx"
+        if ext in [".xls", ".xlsx"] or mime_type in [
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            "application/vnd.ms-excel",
+        ]:
+            return "excel"
+        if ext == ".csv" or mime_type == "text/csv":
+            return "csv"
+        if ext == ".txt" or mime_type == "text/plain":
+            return "txt"
+        if ext in IMAGE_EXTENSIONS or (mime_type or "").startswith("image/"):
+            return "image"
+        return "unknown"
+
+    def _extract_text_metadata(self, file_path: str, mime_type: str | None = None) -> ExtractionResult:
+        """
+        Parses and sanitizes the file exactly once (uncached). Every consumer
+        (summary, analysis stats, RAG chunking) works off the returned result.
+        """
+        source_type = self._detect_source_type(file_path, mime_type)
+        ocr_report = []
+        pages = list(self._iter_extracted_pages(file_path, mime_type, source_type, ocr_report))
+        return self._finalize_extraction(ExtractionResult(pages, source_type, ocr_report))
+
+    def _finalize_extraction(self, result: ExtractionResult) -> ExtractionResult:
+        if result.source_type == "pdf" and not result.text:
+            logger.error("OCR failed to extract any text.")
+            return ExtractionResult.from_text(
+                "[This appears to be a scanned PDF with no extractable text. OCR failed.]", "pdf", complete=False
             )
-            is_csv = ext == ".csv" or mime_type == "text/csv"
-            is_txt = ext == ".txt" or mime_type == "text/plain"
-
+        # Pages the OCR time budget never reached (see _skipped_ocr_pages)
+        result.complete = not any(entry.get("skipped") for entry in result.ocr_pages)
+        return result
+
+    @staticmethod
+    def _skipped_ocr_pages(requested: list[int], ocr_report: list) -> None:
+        """Records the requested pages OCR never returned, so the result is known to be partial."""
+        done = {entry["page"] for entry in ocr_report}
+        ocr_report.extend({"page": page, "skipped": True} for page in requested if page not in done)
+
+    def _iter_extracted_pages(
+        self,
+        file_path: str,
+        mime_type: str | None,
+        source_type: str,
+        ocr_report: list,
+    ) -> Iterator[ExtractedPage]:
+        """Yields sanitized pages (sections or row groups for flat formats) in document order."""
+        try:
             # ---------------- PDF ----------------
-            if is_pdf:
-                reader = PdfReader(file_path)
-
-                for i, page in enumerate(reader.pages):
-                    page_text = page.extract_text() or ""
-                    page_text = self._sanitize_text(page_text)
-                    text += page_text
-                    logger.debug(f"PDF page {i + 1}: {len(page_text)} chars")
-
-                logger.info(f"PDF extraction complete: {len(text)} characters")
-
-                # OCR fallback
-                if not text.strip():
-                    logger.warning("PDF appears to be scanned. Using OCR...")
-                    try:
-                        pages = convert_from_path(file_path)
-                        ocr_text = ""
-
-                        for i, page_image in enumerate(pages[:20]):
-                            ocr_page_text = pytesseract.image_to_string(page_image)
-                            ocr_page_text = self._sanitize_text(ocr_page_text)
-                            ocr_text += ocr_page_text
-                            logger.debug(f"OCR page {i + 1}: {len(ocr_page_text)} chars")
-
-                        if not ocr_text.strip():
-                            logger.error("OCR failed to extract any text.")
-                            text = "[This appears to be a scanned PDF with no extractable text. OCR failed.]"
-                        else:
-                            text = ocr_text
-                            logger.info(f"OCR extraction complete: {len(text)} characters")
-
-                    except Exception as e:
-                        logger.error("OCR processing failed", exc_info=True)
-                        raise ProcessingError(f"Text extraction error: {e}")
-
-                return self._sanitize_text(text)
+            if source_type == "pdf":
+                yield from self._iter_pdf_pages(file_path, ocr_report)
+                return
 
             # ---------------- DOCX ----------------
-            elif is_docx:
-                doc = DocxReader(file_path)
-                text = "\n".join(p.text for p in doc.paragraphs)
-                logger.info(f"DOCX extraction: {len(text)} characters")
-
-            # ---------------- EXCEL ----------------
-            elif is_excel:
-                df = pd.read_excel(file_path, nrows=500)
-                text = df.to_string(index=False)
-                logger.info(f"Excel extraction: {len(text)} characters")
-
-            # ---------------- CSV ----------------
-            elif is_csv:
-                df = pd.read_csv(file_path, nrows=500)
-                text = df.to_string(index=False)
-                logger.info(f"CSV extraction: {len(text)} characters")
+            elif source_type == "docx":
+                yield from self._iter_docx_pages(file_path)
+                return
+
+            # ---------------- EXCEL / CSV ----------------
+            elif source_type in ("excel", "csv"):
+                yield from self._iter_spreadsheet_pages(file_path, source_type)
+                return
+
+            # ---------------- IMAGE (PNG / JPEG / TIFF) ----------------
+            elif source_type == "image":
+                yield from self._iter_image_pages(file_path, ocr_report)
+                return
 
             # ---------------- TXT ----------------
-            elif is_txt:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    text = f.read()
-                logger.info(f"TXT extraction: {len(text)} characters")
+            elif source_type == "txt":
+                yield from self._iter_txt_pages(file_path)
+                return
 
             else:
-                logger.warning(f"Unsupported file type: {mime_type or ext}")
+                logger.warning(f"Unsupported file type: {mime_type or os.path.splitext(file_path)[1]}")
 
+        except ProcessingError:
+            raise
         except Exception as e:
             logger.error("Text extraction failed", exc_info=True)
             raise ProcessingError(f"Text extraction error: {e}")
 
-        return self._sanitize_text(text)
+    def _iter_docx_pages(self, file_path: str) -> Iterator[ExtractedPage]:
+        """
+        Streams paragraphs, table rows, headers and footers straight from the
+        package XML, packed into sections of ~text_section_chars characters.
+        """
+        if not zipfile.is_zipfile(file_path):
+            # Legacy binary .doc: python-docx cannot read it either
+            raise ProcessingError("Text extraction error: Legacy .doc files are not supported")
+
+        sections = pack_blocks(iter_docx_blocks(file_path), settings.text_section_chars)
+        section_count = total_chars = 0
+        for section_count, section in enumerate(sections, start=1):
+            text = self._sanitize_text(section) + "\n"
+            total_chars += len(text)
+            yield ExtractedPage(number=section_count, text=text)
+
+        logger.info(f"DOCX extraction: {section_count} sections, {total_chars} characters")
+
+    def _iter_image_pages(self, file_path: str, ocr_report: list) -> Iterator[ExtractedPage]:
+        """OCRs each image frame (TIFF pages included), recording a per-stage timing breakdown."""
+        for ocr_page in self.ocr_engine.ocr_image(file_path):
+            logger.debug(f"OCR image frame {ocr_page.page_number}: {len(ocr_page.text)} chars, {ocr_page.timings}")
+            ocr_report.append({
+                "page": ocr_page.page_number,
+                "dpi": ocr_page.dpi,
+                "confidence": ocr_page.confidence,
+                "timings_ms": ocr_page.timings,
+            })
+            yield ExtractedPage(number=ocr_page.page_number, text=ocr_page.text + "\n")
+
+        logger.info(f"Image extraction: {len(ocr_report)} frames OCR'd")
+        self._skipped_ocr_pages(list(range(1, image_frame_count(file_path) + 1)), ocr_report)
+
+    def _iter_txt_pages(self, file_path: str) -> Iterator[ExtractedPage]:
+        """Memory-mapped, incrementally decoded sections of ~text_section_chars characters."""
+        section_count = total_chars = 0
+        for section_count, block in enumerate(iter_text_blocks(file_path, settings.text_section_chars), start=1):
+            # Blocks end on line boundaries: keep their edges (indentation, blank lines)
+            text = self._sanitize_text(block, strip=False)
+            total_chars += len(text)
+            yield ExtractedPage(number=section_count, text=text)
+
+        logger.info(f"TXT extraction: {section_count} sections, {total_chars} characters")
+
+    def _iter_spreadsheet_pages(self, file_path: str, source_type: str) -> Iterator[ExtractedPage]:
+        """
+        Streams the whole sheet(s) as compact row groups, each repeating the
+        header, one ExtractedPage per group.
+        """
+        if source_type == "csv":
+            groups = iter_csv_row_groups(
+                file_path, settings.spreadsheet_group_chars, read_rows=settings.spreadsheet_read_rows
+            )
+        else:
+            groups = iter_excel_row_groups(file_path, settings.spreadsheet_group_chars)
+
+        group_count = total_chars = 0
+        for group_count, group in enumerate(groups, start=1):
+            text = self._sanitize_text(group) + "\n\n"
+            total_chars += len(text)
+            yield ExtractedPage(number=group_count, text=text)
+
+        logger.info(f"{source_type.upper()} extraction: {group_count} row groups, {total_chars} characters")
+
+    def _iter_pdf_pages(self, file_path: str, ocr_report: list) -> Iterator[ExtractedPage]:
+        """
+        Streams PDF pages block by block. Within each block, pages without a
+        usable text layer are OCR'd (hybrid OCR) before the block is yielded;
+        all blocks share one OCR time budget.
+        """
+        blocks = iter_pdf_page_blocks(
+            file_path,
+            pages_per_block=settings.pdf_pages_per_task,
+            parallel=settings.pdf_parallel_extraction,
+            max_workers=settings.pdf_extraction_workers,
+            min_pages=settings.pdf_parallel_min_pages,
+            backend=settings.pdf_backend,
+        )
+
+        ocr_deadline = None
+        first_page = 1
+        total_chars = 0
+
+        for page_texts in blocks:
+            # Hybrid OCR: only pages without a usable text layer are OCR'd
+            sparse_pages = [
+                first_page + n - 1
+                for n in find_sparse_pages(page_texts, settings.ocr_min_chars_per_page)
+            ]
+            if sparse_pages:
+                logger.warning(f"{len(sparse_pages)} PDF pages have no usable text layer. Using OCR...")
+                ocr_deadline = ocr_deadline or self.ocr_engine.start_budget()
+                try:
+                    ocr_pages = self.ocr_engine.ocr_pdf(
+                        file_path, page_numbers=sparse_pages, deadline=ocr_deadline
+                    )
+                except Exception as e:
+                    logger.error("OCR processing failed", exc_info=True)
+                    raise ProcessingError(f"Text extraction error: {e}")
+
+                for ocr_page in ocr_pages:
+                    logger.debug(f"OCR page {ocr_page.page_number}: {len(ocr_page.text)} chars")
+                    ocr_report.append({
+                        "page": ocr_page.page_number,
+                        "dpi": ocr_page.dpi,
+                        "confidence": ocr_page.confidence,
+                    })
+                    # Keep whichever of the two is richer (OCR can come back empty)
+                    index = ocr_page.page_number - first_page
+                    if len(ocr_page.text) > len(page_texts[index]):
+                        page_texts[index] = ocr_page.text
+                self._skipped_ocr_pages(sparse_pages, ocr_report)
+
+            for offset, page_text in enumerate(page_texts):
+                logger.debug(f"PDF page {first_page + offset}: {len(page_text)} chars")
+                total_chars += len(page_text)
+                # Pages are already sanitized (and stripped) individually
+                yield ExtractedPage(number=first_page + offset, text=page_text)
+
+            first_page += len(page_texts)
+
+        logger.info(f"PDF extraction complete: {first_page - 1} pages, {total_chars} characters")
 
     # GEMINI (ASYNC)
 
@@ -187,24 +497,22 @@ class DocumentProcessor(DocumentProcessorInterface):
     
     # OLLAMA (SYNC – CELERY SAFE)
     
-    def _get_ollama_summary_sync(self, file_path: str, mime_type: str | None = None) -> str:
+    def _get_ollama_summary_sync(self, extraction: ExtractionResult) -> str:
         try:
-            extracted_text = self._sanitize_text(
-                self._extract_text_metadata(file_path, mime_type)
-            )
+            extracted_text = extraction.text
 
             if not extracted_text or len(extracted_text) < 50:
                 raise ProcessingError(
                     f"NON_RETRYABLE: document too short ({len(extracted_text)} chars)"
                 )
 
-            if len(extracted_text) > 8000:
-                extracted_text = extracted_text[:8000] + "...(truncated)"
+            extracted_text = self._summary_input(extracted_text, 8000)
 
             logger.info(f"Sending {len(extracted_text)} chars to Ollama")
 
             response = self.ollama_client.chat(
                 model=self.ollama_model,
+                keep_alive=settings.ollama_keep_alive,
                 options={"temperature": 0.2},
                 messages=[{
                     "role": "user",
@@ -234,54 +542,111 @@ DOCUMENT:
             raise ProcessingError(f"AI Engine failed: {e}")
 
     
-    def _format_results(self, raw_text: str, summary: str) -> dict:
+    def _format_results(
+        self,
+        extraction: ExtractionResult,
+        summary: str | None,
+        compression: dict | None = None,
+    ) -> dict:
         """Shared logic for formatting analysis output."""
-        return {
-            "raw_text": raw_text,
+        results = {
+            "raw_text": extraction.text,
             "analysis": {
                 "summary": summary,
-                "word_count": len(raw_text.split()),
-                # Basic token estimation: ~4 chars per token for English text
-                "estimated_tokens": len(raw_text) // 4,
-                "contains_email": "@" in raw_text,
-                "contains_money": any(s in raw_text for s in ["$", "USD", "NGN", "€"]),
+                **extraction.stats,
                 "ai_provider": self.provider,
             },
         }
+        if extraction.ocr_pages:
+            # Per-page OCR DPI/confidence, used to tune the adaptive thresholds
+            results["analysis"]["ocr_pages"] = extraction.ocr_pages
+        if compression:
+            results["analysis"]["summary_compression"] = compression
+        return results
 
     # FASTAPI (ASYNC)
     
-    async def process(self, file_path: str, mime_type: str | None = None) -> dict:
+    async def process(
+        self,
+        file_path: str,
+        mime_type: str | None = None,
+        content_hash: str | None = None,
+    ) -> dict:
         logger.info(f"Processing document with {self.provider}: {file_path}")
 
-        if self.provider == "ollama":
-            loop = asyncio.get_running_loop()
-            summary = await loop.run_in_executor(
-                None, self._get_ollama_summary_sync, file_path, mime_type
-            )
-        else:
-            summary = await self._get_gemini_summary(file_path, mime_type)
+        loop = asyncio.get_running_loop()
+        extraction = await loop.run_in_executor(
+            None, self._get_extraction, file_path, mime_type, content_hash
+        )
 
-        raw_text = self._extract_text_metadata(file_path, mime_type)
+        cache_key = await loop.run_in_executor(
+            None, self._summary_cache_key, file_path, content_hash, "insights"
+        )
+        # The summary cache is a blocking Redis client: keep it off the event loop
+        summary = await loop.run_in_executor(None, self._cached_summary, cache_key)
+        if summary is None:
+            if self.provider == "ollama":
+                summary = await loop.run_in_executor(
+                    None, self._get_ollama_summary_sync, extraction
+                )
+            else:
+                summary = await self._get_gemini_summary(file_path, mime_type)
+            await loop.run_in_executor(None, self._store_summary, cache_key, summary)
 
-        return self._format_results(raw_text, summary)
+        return self._format_results(extraction, summary)
 
     
     # CELERY (SYNC)
     
-    def process_sync(self, file_path: str, mime_type: str | None = None, on_chunk: Optional[Any] = None) -> dict:
+    def process_sync(
+        self,
+        file_path: str,
+        mime_type: str | None = None,
+        on_chunk: Optional[Any] = None,
+        content_hash: str | None = None,
+        extraction: ExtractionResult | None = None,
+        summarize: bool = True,
+        raise_on_failure: bool = False,
+    ) -> dict:
         """
         Extracts text and generates a summary with streaming support.
+        Pass `extraction` when the document was already extracted (e.g. by a
+        streaming indexer) to skip straight to the summary. With
+        `summarize=False` only the extraction stats are returned and the
+        summary is marked pending, to be generated later.
+        A failed generation falls back to "Summary unavailable." (or the
+        partial text), unless `raise_on_failure` asks for a ProcessingError.
         """
         logger.info(f"Processing document for extraction: {file_path}")
 
-        raw_text = self._extract_text_metadata(file_path, mime_type)
+        if extraction is None:
+            extraction = self._get_extraction(file_path, mime_type, content_hash)
+        raw_text = extraction.text
         
         if not raw_text.strip():
             raise ProcessingError("No text could be extracted from the document.")
 
+        if not summarize:
+            results = self._format_results(extraction, None)
+            results["analysis"]["summary_status"] = "pending"
+            return results
+
+        cache_key = self._summary_cache_key(file_path, content_hash, "summary")
+        cached = self._cached_summary(cache_key)
+        if cached is not None:
+            if on_chunk:
+                on_chunk(cached)
+            return self._format_results(extraction, cached)
+
         # Generate a high-fidelity summary
         summary_limit = 10000 
+        compression = None
+        summary_source = raw_text
+        if settings.summary_precompression:
+            # Keep only the most central sentences so the prompt is shorter
+            compression = compress(raw_text, settings.summary_precompression_chars)
+            summary_source = compression.text
+
         summary_prompt = (
             "Summarize the document content below.\n"
             "STRICT RULES:\n"
@@ -289,15 +654,17 @@ DOCUMENT:
             "- Do NOT say 'Here is a summary', 'This document is about', or any other introduction.\n"
             "- Provide 3-5 concise, professional sentences.\n"
             "- If you fail to follow these rules, the output will be rejected.\n\n"
-            f"Document Content:\n{raw_text[:summary_limit]}"
+            f"Document Content:\n{self._summary_input(summary_source, summary_limit)}"
         )
         
         full_summary = []
+        prompt_eval = (None, None)
         try:
             if self.provider == "ollama":
                 # Ollama Streaming
                 response = self.ollama_client.chat(
                     model=self.ollama_model,
+                    keep_alive=settings.ollama_keep_alive,
                     messages=[{"role": "user", "content": summary_prompt}],
                     stream=True
                 )
@@ -307,6 +674,8 @@ DOCUMENT:
                         full_summary.append(content)
                         if on_chunk:
                             on_chunk(content)
+                    if chunk.get("done"):
+                        prompt_eval = (chunk.get("prompt_eval_count"), chunk.get("prompt_eval_duration"))
                 summary = "".join(full_summary)
             else:
                 # Gemini Streaming (Cloud)
@@ -323,8 +692,49 @@ DOCUMENT:
                 summary = "".join(full_summary)
         except Exception as e:
             logger.warning(f"Failed to generate summary: {e}")
+            if raise_on_failure:
+                raise ProcessingError(f"AI Engine failed to generate the summary: {e}") from e
             summary = "".join(full_summary) if full_summary else "Summary unavailable."
+        else:
+            self._store_summary(cache_key, summary)
+
+        report = self._compression_report(compression, summary_limit, *prompt_eval)
+        return self._format_results(extraction, summary, report)
+
+    def _compression_report(
+        self,
+        compression: Compression | None,
+        summary_limit: int,
+        prompt_tokens: int | None,
+        prompt_eval_ns: int | None,
+    ) -> dict | None:
+        """
+        Compression ratio of the summary input, plus the prompt-processing time
+        it saved: removed tokens at the provider's measured prompt-eval rate
+        (Ollama reports it; otherwise the saving is not estimated).
 
-        return self._format_results(raw_text, summary)
+        Both prompts are capped at `summary_limit` characters (see
+        _summary_input), so only what compression removed below that cap
+        counts as saved.
+        """
+        if compression is None:
+            return None
+        report = {
+            "original_chars": compression.original_chars,
+            "compressed_chars": compression.compressed_chars,
+            "ratio": round(compression.ratio, 3),
+            "sentences_kept": compression.sentences_kept,
+            "sentences_total": compression.sentences_total,
+            "extract_ms": round(compression.seconds * 1000, 1),
+            "prompt_chars_removed": max(
+                0, min(compression.original_chars, summary_limit) - min(compression.compressed_chars, summary_limit)
+            ),
+            "estimated_seconds_saved": None,
+        }
+        if prompt_tokens and prompt_eval_ns:
+            removed_tokens = report["prompt_chars_removed"] / CHARS_PER_TOKEN
+            seconds_per_token = prompt_eval_ns / 1e9 / prompt_tokens
+            report["estimated_seconds_saved"] = round(removed_tokens * seconds_per_token - compression.seconds, 2)
+        return report
 
 
@@ -0,0 +1,129 @@
+import os
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+CELL_SEPARATOR = " | "
+
+
+def format_cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    # One spreadsheet row per line, whatever the cell contains
+    return str(value).replace("\r", " ").replace("\n", " ").strip()
+
+
+def format_row(values: Iterable) -> str:
+    return CELL_SEPARATOR.join(format_cell(v) for v in values)
+
+
+def iter_row_groups(
+    header: list[str],
+    rows: Iterable[Iterable],
+    max_chars: int,
+    label: str = "",
+) -> Iterator[str]:
+    """
+    Packs delimited rows into groups of at most ~`max_chars` characters, each
+    starting with the column header, so every group is readable (and
+    retrievable) on its own. Unlike DataFrame.to_string, no column padding.
+    """
+    header_line = format_row(header)
+    group: list[str] = []
+    group_chars = 0
+    first_row = last_row = 0
+
+    for row_number, row in enumerate(rows, start=1):
+        line = format_row(row)
+        if not line.replace(CELL_SEPARATOR, "").strip():
+            continue  # Blank row
+
+        if group and group_chars + len(line) > max_chars:
+            yield _render_group(label, first_row, last_row, header_line, group)
+            group, group_chars = [], 0
+
+        if not group:
+            first_row = row_number
+        group.append(line)
+        group_chars += len(line) + 1
+        last_row = row_number
+
+    if group:
+        yield _render_group(label, first_row, last_row, header_line, group)
+
+
+def _render_group(label: str, first_row: int, last_row: int, header_line: str, lines: list[str]) -> str:
+    title = f"{label} rows {first_row}-{last_row}".strip()
+    return "\n".join([f"[{title}]", header_line, *lines])
+
+
+def iter_csv_row_groups(file_path: str, max_chars: int, read_rows: int = 5000) -> Iterator[str]:
+    """Streams a CSV of any size in `read_rows` chunks; only one chunk is in memory."""
+    try:
+        reader = pd.read_csv(
+            file_path,
+            chunksize=read_rows,
+            dtype=str,
+            keep_default_na=False,
+            encoding_errors="ignore",
+        )
+    except pd.errors.EmptyDataError:
+        return
+
+    with reader:
+        chunks = iter(reader)
+        first = next(chunks, None)
+        if first is None:
+            return
+
+        def rows():
+            yield from first.itertuples(index=False, name=None)
+            for chunk in chunks:
+                yield from chunk.itertuples(index=False, name=None)
+
+        yield from iter_row_groups([str(c) for c in first.columns], rows(), max_chars)
+
+
+def iter_excel_row_groups(file_path: str, max_chars: int) -> Iterator[str]:
+    """
+    Streams every sheet of a workbook. .xlsx/.xlsm are read in openpyxl's
+    read-only mode (rows are parsed lazily from the XML); legacy formats fall
+    back to pandas, one sheet at a time.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        yield from _iter_openpyxl_row_groups(file_path, max_chars)
+        return
+
+    sheets = pd.ExcelFile(file_path)
+    for sheet_name in sheets.sheet_names:
+        df = sheets.parse(sheet_name, dtype=str, keep_default_na=False)
+        yield from iter_row_groups(
+            [str(c) for c in df.columns],
+            df.itertuples(index=False, name=None),
+            max_chars,
+            label=f"Sheet {sheet_name}",
+        )
+
+
+def _iter_openpyxl_row_groups(file_path: str, max_chars: int) -> Iterator[str]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            # The first non-empty row is the header
+            header = next((row for row in rows if any(v not in (None, "") for v in row)), None)
+            if header is None:
+                continue
+            yield from iter_row_groups(
+                [format_cell(v) for v in header],
+                rows,
+                max_chars,
+                label=f"Sheet {sheet.title}",
+            )
+    finally:
+        workbook.close()
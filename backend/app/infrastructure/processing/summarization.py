@@ -0,0 +1,204 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Bump when the map/reduce prompts change so cached chunk summaries are not reused
+SUMMARY_PROMPT_VERSION = "1"
+
+CHARS_PER_TOKEN = 4
+
+MAP_PROMPT = (
+    "Summarize this section of a longer document.\n"
+    "RULES:\n"
+    "- Keep every figure, name, date and conclusion that matters.\n"
+    "- No intro, no commentary, plain sentences only.\n"
+    "- At most {max_words} words.\n\n"
+    "SECTION {index} OF {total}:\n{text}"
+)
+
+REDUCE_PROMPT = (
+    "Merge these partial summaries of consecutive parts of one document into a single summary.\n"
+    "RULES:\n"
+    "- Keep the most important facts and figures; drop repetition.\n"
+    "- No intro, no commentary, plain sentences only.\n"
+    "- At most {max_words} words.\n\n"
+    "PARTIAL SUMMARIES:\n{text}"
+)
+
+
+def split_for_summary(text: str, chunk_chars: int) -> Iterator[str]:
+    """Cuts text into pieces of at most `chunk_chars`, preferring paragraph, then line, then word breaks."""
+    start, size = 0, len(text)
+    while start < size:
+        end = min(start + chunk_chars, size)
+        if end < size:
+            window = text[start:end]
+            for sep in ("\n\n", "\n", " "):
+                cut = window.rfind(sep)
+                if cut > chunk_chars // 2:
+                    end = start + cut + len(sep)
+                    break
+        piece = text[start:end].strip()
+        if piece:
+            yield piece
+        start = end
+
+
+class ChunkSummaryCache:
+    """
+    Bounded, thread-safe LRU of chunk summaries keyed by the chunk's content,
+    the model and the prompt version. Retries and re-processing of a document
+    (or documents sharing sections) skip the map calls they already paid for.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        return hashlib.sha1(f"{SUMMARY_PROMPT_VERSION}\0{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class MapReduceSummarizer:
+    """
+    Condenses an arbitrarily long text into partial summaries that fit one
+    final summary prompt.
+
+    Map: the text is cut into ~`chunk_tokens` pieces, summarized concurrently
+    by at most `max_workers` calls. Reduce: partial summaries are grouped
+    (at most `fan_in` per group, within `chunk_tokens`) and merged, level
+    after level, until the result fits in `target_chars`. Every level shares
+    `level_token_budget` output tokens between its calls, so each level is
+    shorter than the last and the depth grows only logarithmically with the
+    document length.
+
+    `generate(prompt, max_tokens)` performs one non-streaming LLM call.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[str, int], str],
+        model: str,
+        max_workers: int = 4,
+        chunk_tokens: int = 2000,
+        level_token_budget: int = 2000,
+        min_call_tokens: int = 64,
+        fan_in: int = 8,
+        max_levels: int = 4,
+        cache: ChunkSummaryCache | None = None,
+    ):
+        self.generate = generate
+        self.model = model
+        self.max_workers = max(1, max_workers)
+        self.chunk_chars = chunk_tokens * CHARS_PER_TOKEN
+        self.level_token_budget = level_token_budget
+        self.min_call_tokens = min_call_tokens
+        self.fan_in = max(2, fan_in)
+        self.max_levels = max_levels
+        self.cache = cache
+
+    def _call(self, prompt: str, max_tokens: int) -> str:
+        key = ChunkSummaryCache.key(self.model, prompt) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        summary = self.generate(prompt, max_tokens).strip()
+        if key is not None and summary:
+            self.cache.put(key, summary)
+        return summary
+
+    def _run_level(self, prompts: list[str], pool: ThreadPoolExecutor) -> list[str]:
+        max_tokens = max(self.min_call_tokens, self.level_token_budget // len(prompts))
+
+        def call(prompt: str) -> str:
+            try:
+                return self._call(prompt, max_tokens)
+            except Exception as e:
+                # A failed call drops only its own part, not the document
+                logger.warning(f"Summary: Partial summary failed: {e}")
+                return ""
+
+        return [summary for summary in pool.map(call, prompts) if summary]
+
+    def _words_for(self, calls: int) -> int:
+        tokens = max(self.min_call_tokens, self.level_token_budget // calls)
+        return max(20, int(tokens * 0.75))
+
+    def _group(self, partials: list[str]) -> list[list[str]]:
+        groups, current, size = [], [], 0
+        for partial in partials:
+            if current and (len(current) >= self.fan_in or size + len(partial) > self.chunk_chars):
+                groups.append(current)
+                current, size = [], 0
+            current.append(partial)
+            size += len(partial) + 2
+        if current:
+            groups.append(current)
+        return groups
+
+    def condense(self, text: str, target_chars: int) -> str:
+        """Returns `text` itself if it already fits, else its map-reduced partial summaries."""
+        if len(text) <= target_chars:
+            return text
+
+        started = time.monotonic()
+        chunks = list(split_for_summary(text, self.chunk_chars))
+        words = self._words_for(len(chunks))
+        prompts = [
+            MAP_PROMPT.format(max_words=words, index=i, total=len(chunks), text=chunk)
+            for i, chunk in enumerate(chunks, start=1)
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            partials = self._run_level(prompts, pool)
+            level = 1
+            logger.info(f"Summary map: {len(chunks)} chunks -> {sum(map(len, partials))} chars")
+
+            while (
+                len(partials) > 1
+                and len("\n\n".join(partials)) > target_chars
+                and level < self.max_levels
+            ):
+                groups = self._group(partials)
+                if len(groups) == len(partials):
+                    break  # Each partial alone fills a group: merging cannot shrink further
+                words = self._words_for(len(groups))
+                prompts = [REDUCE_PROMPT.format(max_words=words, text="\n\n".join(g)) for g in groups]
+                partials = self._run_level(prompts, pool)
+                level += 1
+                logger.info(f"Summary reduce level {level}: {len(groups)} groups -> {sum(map(len, partials))} chars")
+
+        if not partials:
+            logger.warning("Summary map-reduce produced nothing; falling back to the leading text")
+            return text[:target_chars]
+
+        condensed = "\n\n".join(partials)
+        logger.info(
+            f"Summary map-reduce: {len(text)} -> {len(condensed)} chars in {level} level(s), "
+            f"{time.monotonic() - started:.1f}s"
+        )
+        # Whatever is left over the target after max_levels is cut, as before
+        return condensed[:target_chars]
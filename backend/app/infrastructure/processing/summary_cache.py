@@ -0,0 +1,48 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "summary-cache"
+INDEX_KEY = f"{KEY_PREFIX}:index"
+
+
+def summary_cache_key(content_hash: str, provider: str, model: str, prompt_version: str) -> str:
+    return f"{KEY_PREFIX}:{provider}:{model}:{prompt_version}:{content_hash}"
+
+
+class RedisSummaryCache:
+    """
+    Generated summaries in Redis, keyed by (content hash, provider, model,
+    prompt version), so retries, re-processing and the API's `process()`
+    reuse an earlier generation of the same file.
+
+    Entries expire after `ttl_seconds`. A sorted set of keys scored by last
+    access keeps the cache at `max_entries`: every write evicts the least
+    recently used overflow (and forgets index entries that already expired).
+    """
+
+    def __init__(self, client, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 10000):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> str | None:
+        value = self.client.get(key)
+        if value is None:
+            return None
+        # Touch: recently read summaries are evicted last
+        self.client.zadd(INDEX_KEY, {key: time.time()}, xx=True)
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def put(self, key: str, summary: str) -> None:
+        now = time.time()
+        self.client.setex(key, self.ttl_seconds, summary.encode("utf-8"))
+        self.client.zadd(INDEX_KEY, {key: now})
+        self.client.zremrangebyscore(INDEX_KEY, "-inf", now - self.ttl_seconds)
+
+        overflow = self.client.zcard(INDEX_KEY) - self.max_entries
+        if overflow > 0:
+            evicted = [k for k, _ in self.client.zpopmin(INDEX_KEY, overflow)]
+            self.client.delete(*evicted)
+            logger.info(f"Summary cache: Evicted {len(evicted)} least recently used summaries")
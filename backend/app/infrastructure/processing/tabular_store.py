@@ -0,0 +1,250 @@
+import io
+import os
+import re
+import logging
+from typing import Iterator
+
+import pandas as pd
+from asgiref.sync import async_to_sync
+
+from app.domain.services.storage_interface import StorageInterface
+from app.infrastructure.processing.spreadsheet_extraction import format_cell
+
+logger = logging.getLogger(__name__)
+
+# Column added when a workbook with several sheets is stored as one table
+SHEET_COLUMN = "sheet"
+
+_NUMBER_NOISE = re.compile(r"[,\s$€£₦%]")
+
+_INTEGER = re.compile(r"[+-]?\d+")
+
+# Rows converted at a time; the Parquet copy gets one row group per chunk
+CHUNK_ROWS = 50_000
+
+
+def tabular_key(document_id: str) -> str:
+    return f"{document_id}.parquet"
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _clean_numbers(series: pd.Series) -> pd.Series:
+    """Strips separators and currency/percent signs; blanks become NaN."""
+    cleaned = series.astype(str).str.replace(_NUMBER_NOISE, "", regex=True)
+    return cleaned.where(series.notna() & (cleaned != ""))
+
+
+def _header(values) -> list[str]:
+    return [format_cell(v) or f"Unnamed: {i}" for i, v in enumerate(values)]
+
+
+def _csv_frames(file_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    try:
+        reader = pd.read_csv(file_path, chunksize=chunk_rows, dtype=str, encoding_errors="ignore")
+    except pd.errors.EmptyDataError:
+        return
+    with reader:
+        yield from reader
+
+
+def _excel_frames(file_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Every sheet as text frames of at most `chunk_rows` rows, tagged with the
+    sheet name when there are several. .xlsx/.xlsm are streamed in openpyxl's
+    read-only mode; legacy formats are parsed one sheet at a time.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in (".xlsx", ".xlsm"):
+        sheets = pd.ExcelFile(file_path)
+        for sheet_name in sheets.sheet_names:
+            df = sheets.parse(sheet_name, dtype=str).dropna(how="all")
+            if len(sheets.sheet_names) > 1:
+                df[SHEET_COLUMN] = sheet_name
+            for start in range(0, len(df), chunk_rows):
+                yield df.iloc[start:start + chunk_rows]
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        several = len(workbook.worksheets) > 1
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            # The first non-empty row is the header
+            header = next((row for row in rows if any(v not in (None, "") for v in row)), None)
+            if header is None:
+                continue
+            columns = _header(header)
+
+            def frame(batch):
+                df = pd.DataFrame(batch, columns=columns, dtype=object)
+                return df.assign(**{SHEET_COLUMN: sheet.title}) if several else df
+
+            batch = []
+            for row in rows:
+                values = [format_cell(v) or None for v in row[:len(columns)]]
+                if not any(values):
+                    continue  # Blank row
+                batch.append(values)
+                if len(batch) == chunk_rows:
+                    yield frame(batch)
+                    batch = []
+            if batch:
+                yield frame(batch)
+    finally:
+        workbook.close()
+
+
+def _frames(file_path: str, source_type: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    frames = _csv_frames if source_type == "csv" else _excel_frames
+    for df in frames(file_path, chunk_rows):
+        df.columns = [str(c).strip() for c in df.columns]
+        df = df.dropna(how="all")
+        if len(df):
+            yield df
+
+
+def table_columns(file_path: str, source_type: str, chunk_rows: int = CHUNK_ROWS) -> dict[str, str]:
+    """
+    First pass over the file, one chunk at a time: column -> "int" | "float"
+    | "text". Text columns such as "1,200" or "$35.50" count as numbers when
+    every value in the whole file parses.
+    """
+    numeric: dict[str, bool] = {}
+    integral: dict[str, bool] = {}
+    has_values: dict[str, bool] = {}
+    for df in _frames(file_path, source_type, chunk_rows):
+        for column in df.columns:
+            cleaned = _clean_numbers(df[column]).dropna()
+            values = pd.to_numeric(cleaned, errors="coerce")
+            numeric[column] = numeric.get(column, True) and bool(values.notna().all())
+            # "100.0" stays a float column, as pandas would infer it
+            integral[column] = integral.get(column, True) and bool(cleaned.str.fullmatch(_INTEGER).all())
+            has_values[column] = has_values.get(column, False) or len(values) > 0
+
+    return {
+        column: ("int" if integral[column] else "float") if numeric[column] and has_values[column] else "text"
+        for column in numeric
+    }
+
+
+def iter_table(
+    file_path: str,
+    source_type: str,
+    columns: dict[str, str],
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """Second pass: typed chunks with every column of `columns` (see table_columns)."""
+    for df in _frames(file_path, source_type, chunk_rows):
+        df = df.reindex(columns=list(columns))
+        for column, kind in columns.items():
+            if kind != "text":
+                df[column] = pd.to_numeric(_clean_numbers(df[column]), errors="coerce")
+        yield df
+
+
+class TabularStore:
+    """
+    Columnar (Parquet) copies of tabular uploads, stored next to the original
+    in the configured storage backend. Queries read only the columns they
+    touch. Parquet needs the optional `pyarrow` package; without it the store
+    is disabled and questions go through vector search as before.
+    """
+
+    def __init__(self, storage: StorageInterface):
+        self.storage = storage
+        self.enabled = parquet_available()
+        if not self.enabled:
+            logger.warning("TabularStore: pyarrow not installed, tabular queries disabled")
+
+    def save(self, document_id: str, file_path: str, source_type: str) -> bool:
+        """
+        Converts the upload chunk by chunk: one pass settles the column types,
+        a second writes row groups, so only one chunk (plus the compressed
+        Parquet output) is ever in memory.
+        """
+        if not self.enabled:
+            return False
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = table_columns(file_path, source_type)
+        if not columns:
+            logger.info(f"TabularStore: No rows to store for {document_id}")
+            return False
+
+        arrow_types = {"int": pa.int64(), "float": pa.float64(), "text": pa.string()}
+        schema = pa.schema([(name, arrow_types[kind]) for name, kind in columns.items()])
+        buffer = io.BytesIO()
+        rows = 0
+        with pq.ParquetWriter(buffer, schema) as writer:
+            for df in iter_table(file_path, source_type, columns):
+                writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+                rows += len(df)
+
+        key = tabular_key(document_id)
+        async_to_sync(self.storage.upload)(
+            file_id=key,
+            file_name=key,
+            file_bytes=buffer.getvalue(),
+            content_type="application/vnd.apache.parquet",
+        )
+        logger.info(f"TabularStore: Saved {rows} rows x {len(columns)} columns for {document_id}")
+        return True
+
+    def copy(self, source_id: str, document_id: str) -> bool:
+        """Gives a cloned duplicate the Parquet copy of its source, if it has one."""
+        path = self._local_path(source_id)
+        if path is None:
+            return False
+
+        with open(path, "rb") as f:
+            file_bytes = f.read()
+        key = tabular_key(document_id)
+        async_to_sync(self.storage.upload)(
+            file_id=key,
+            file_name=key,
+            file_bytes=file_bytes,
+            content_type="application/vnd.apache.parquet",
+        )
+        logger.info(f"TabularStore: Copied the table of {source_id} to {document_id}")
+        return True
+
+    def _local_path(self, document_id: str) -> str | None:
+        if not self.enabled:
+            return None
+        try:
+            path = async_to_sync(self.storage.get_file_path)(tabular_key(document_id))
+        except Exception:
+            # Object-store backends raise on a missing key: not a tabular document
+            return None
+        return path if os.path.exists(path) else None
+
+    def schema(self, document_id: str) -> dict[str, str] | None:
+        """Column name -> "numeric" | "text", or None when no table is stored."""
+        path = self._local_path(document_id)
+        if path is None:
+            return None
+
+        import pyarrow.parquet as pq
+        import pyarrow.types as pa_types
+
+        return {
+            field.name: "numeric" if pa_types.is_integer(field.type) or pa_types.is_floating(field.type) else "text"
+            for field in pq.read_schema(path)
+        }
+
+    def read(self, document_id: str, columns: list[str]) -> pd.DataFrame:
+        path = self._local_path(document_id)
+        if path is None:
+            raise FileNotFoundError(tabular_key(document_id))
+        return pd.read_parquet(path, columns=columns)
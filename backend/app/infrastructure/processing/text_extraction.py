@@ -0,0 +1,85 @@
+import mmap
+import codecs
+import logging
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Bytes inspected for encoding detection
+DETECTION_PREFIX_BYTES = 64 * 1024
+
+_BOMS = [
+    # Longest first: the UTF-32 LE BOM starts with the UTF-16 LE one
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def detect_encoding(prefix: bytes) -> str:
+    """
+    Picks a codec from the first bytes of a file: BOM first, then strict
+    UTF-8 (tolerating a character cut at the end of the prefix), then
+    charset-normalizer's best guess, then latin-1 (which never fails).
+    """
+    for bom, encoding in _BOMS:
+        if prefix.startswith(bom):
+            return encoding
+
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    try:
+        from charset_normalizer import from_bytes
+
+        best = from_bytes(prefix).best()
+        if best is not None:
+            return best.encoding
+    except ImportError:
+        pass
+
+    return "latin-1"
+
+
+def iter_text_blocks(file_path: str, block_chars: int) -> Iterator[str]:
+    """
+    Memory-maps a text file and yields decoded blocks of about `block_chars`
+    characters, each ending on a line boundary when the block has one. Only
+    the current block is ever decoded, so peak memory stays flat no matter
+    how large the file is.
+    """
+    with open(file_path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Empty file: nothing to map
+
+    with mapped:
+        encoding = detect_encoding(mapped[:DETECTION_PREFIX_BYTES])
+        logger.debug(f"TXT: Detected encoding {encoding}")
+
+        decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+        size = len(mapped)
+        # Bytes per block: decoded text is never longer than the bytes it came from
+        step = max(1, block_chars)
+        carry = ""
+
+        for offset in range(0, size, step):
+            chunk = mapped[offset:offset + step]
+            text = carry + decoder.decode(chunk, final=offset + step >= size)
+
+            cut = text.rfind("\n") + 1
+            if cut and offset + step < size:
+                # Hold back the partial last line for the next block (a block
+                # without any newline is emitted as is, so carry stays small)
+                text, carry = text[:cut], text[cut:]
+            else:
+                carry = ""
+
+            if text:
+                yield text
@@ -0,0 +1,90 @@
+import re
+from functools import lru_cache
+
+# Whitespace controls that survive sanitization
+_KEEP = "\n\r\t"
+
+# ASCII fast path: delete C0 controls (except \t \n \r) and DEL
+_ASCII_DELETE_TABLE = str.maketrans(
+    "", "", "".join(chr(c) for c in [*range(0x20), 0x7F] if chr(c) not in _KEEP)
+)
+
+# Supplementary-plane runs are rare (emoji, historic scripts, private use) and
+# checked with str.isprintable() instead of a huge astral character class.
+_ASTRAL_RUN = re.compile("[\U00010000-\U0010ffff]+")
+
+
+def _is_kept(c: str) -> bool:
+    return c.isprintable() or c in _KEEP
+
+
+@lru_cache(maxsize=1)
+def _bmp_non_printable_pattern() -> re.Pattern:
+    """
+    Precompiled class of every BMP code point the per-character filter drops.
+    Derived from the running interpreter's Unicode tables so output stays
+    identical to `c.isprintable() or c in "\\n\\r\\t"`. A BMP-only class
+    compiles to a constant-time bitmap lookup. Built lazily once per process.
+    """
+    ranges = []
+    start = None
+    for cp in range(0x10000 + 1):
+        drop = cp <= 0xFFFF and not _is_kept(chr(cp))
+        if drop and start is None:
+            start = cp
+        elif not drop and start is not None:
+            ranges.append((start, cp - 1))
+            start = None
+
+    char_class = "".join(
+        f"\\u{lo:04x}" if lo == hi else f"\\u{lo:04x}-\\u{hi:04x}"
+        for lo, hi in ranges
+    )
+    return re.compile(f"[{char_class}]+")
+
+
+def _filter_astral_run(match: re.Match) -> str:
+    run = match.group()
+    return run if run.isprintable() else "".join(c for c in run if c.isprintable())
+
+
+def _sanitize_fragment(text: str) -> str:
+    text = _bmp_non_printable_pattern().sub("", text)
+    if text and max(text) > "\uffff":
+        text = _ASTRAL_RUN.sub(_filter_astral_run, text)
+    return text
+
+
+def sanitize_text(text: str, strip: bool = True) -> str:
+    """
+    Strips NULL bytes and non-printable control characters (keeping whitespace).
+    With `strip=False` the edges are kept too, so consecutive blocks of one
+    text can be sanitized separately and still join up exactly.
+
+    Lives at module level so extraction pool workers can call it without
+    pickling a DocumentProcessor (and the AI clients it holds).
+
+    Output is identical to the original per-character filter, but:
+    - pure-ASCII input goes through a C-level translate table;
+    - otherwise the text is split on newlines and only lines that fail the
+      C-level str.isprintable() check (CRLF aside) go through the precompiled regex,
+      so clean lines are never inspected character by character in Python.
+    """
+    if not text:
+        return ""
+
+    if text.isascii():
+        text = text.translate(_ASCII_DELETE_TABLE)
+        return text.strip() if strip else text
+
+    if text.isprintable():
+        return text.strip() if strip else text
+
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        if line.isprintable() or (line[-1:] == "\r" and line[:-1].isprintable()):
+            continue
+        lines[i] = _sanitize_fragment(line)
+
+    text = "\n".join(lines)
+    return text.strip() if strip else text
@@ -2,6 +2,7 @@ import logging
 import os
 import warnings
 from celery import Celery
+from kombu import Queue
 from app.infrastructure.config import settings
 
 # --- WARNING SUPPRESSION ---
@@ -12,12 +13,28 @@ os.environ["C_FORCE_ROOT"] = "true"
 # Initialize logger for Celery startup events
 logger = logging.getLogger(__name__)
 
+# --- PIPELINE QUEUES ---
+# Stage -> queue for the canvas pipeline (PIPELINE_MODE=canvas). Each queue can
+# be served by a worker pool suited to its work: extraction/OCR is CPU-bound
+# (a solo worker whose document fans out over the cores: page-parallel PDF
+# blocks and OCR windows need a non-daemonic process, which prefork children
+# are not); summaries and embeddings wait on model
+# servers (thread pools with high concurrency). A worker started without -Q
+# consumes every queue below, so a single worker still runs everything.
+PIPELINE_ROUTES = {
+    "pipeline_fetch_task": {"queue": "documents"},
+    "pipeline_extract_task": {"queue": "extraction"},
+    "pipeline_summarize_task": {"queue": "llm"},
+    "pipeline_index_task": {"queue": "embedding"},
+    "pipeline_finalize_task": {"queue": "documents"},
+}
+
 # --- CELERY INSTANCE ---
 celery_app = Celery(
     "document_tasks",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
-    include=["app.workers.document_worker"]
+    include=["app.workers.document_worker", "app.workers.document_pipeline", "app.workers.warmup"]
 )
 
 # --- ADVANCED CONFIGURATION ---
@@ -29,9 +46,27 @@ celery_app.conf.update(
     enable_utc=True,
     # Prevents tasks from being lost if the worker crashes mid-process
     task_acks_late=True, 
+    # ...and redelivered if the worker process dies; document tasks resume from
+    # their checkpoints (PIPELINE_CHECKPOINTS) instead of starting over
+    task_reject_on_worker_lost=True,
     worker_prefetch_multiplier=1,
+    # Pool children preload libraries and clients before reporting in (app/workers/warmup.py)
+    worker_proc_alive_timeout=60,
+    # Documents first (the deferred-summaries queue is last): deferred summaries
+    # only run when no document work is waiting.
+    # The "priority" strategy makes the Redis transport poll queues in this order.
+    task_default_queue="celery",
+    task_queues=(
+        Queue("celery"),
+        Queue("documents"),
+        Queue("extraction"),
+        Queue("embedding"),
+        Queue("llm"),
+        Queue(settings.summary_queue),
+    ),
+    task_routes={**PIPELINE_ROUTES, "generate_summary_task": {"queue": settings.summary_queue}},
     # Increased visibility timeout (2 hours) to handle very large documents without re-queuing
-    broker_transport_options={'visibility_timeout': 7200},
+    broker_transport_options={'visibility_timeout': 7200, 'queue_order_strategy': 'priority'},
     result_expires=3600, # Clean up results after 1 hour
     # Fix for Celery 6.0 deprecation warning
     broker_connection_retry_on_startup=True,
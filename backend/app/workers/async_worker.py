@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import socket
+import signal
+import asyncio
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+import redis.asyncio as aioredis
+from app.infrastructure.config import settings
+from app.infrastructure.logging import request_id_var, setup_logging
+from app.workers import document_pipeline
+from app.workers.document_worker import is_retryable, redis_client
+from app.workers.warmup import clear_ready, mark_ready, warm_start
+
+logger = logging.getLogger(__name__)
+
+
+def provider_limit(provider: str) -> int:
+    """Summary/embedding stages allowed against `provider` at once."""
+    limits = {"ollama": settings.ollama_max_concurrency, "gemini": settings.gemini_max_concurrency}
+    return max(1, limits.get(provider.lower(), settings.async_worker_concurrency))
+
+
+def enqueue_document(document_id: str, request_id: str, summary_timing: str | None = None) -> str:
+    """Pushes a document onto the asyncio worker's queue. Returns the notification task id."""
+    ctx = document_pipeline.pipeline_context(document_id, request_id, summary_timing)
+    redis_client.lpush(settings.async_queue, json.dumps(ctx))
+    return ctx["task_id"]
+
+
+class AsyncDocumentWorker:
+    """
+    Drives many documents through the pipeline stages (the same functions the
+    canvas tasks run) in one process (PIPELINE_MODE=asyncio).
+
+    Stages still call the synchronous processor, RAG service and DB session,
+    so each runs on a worker thread while the event loop only schedules and
+    waits. What keeps the model server saturated without overloading it is
+    the per-provider semaphore around the summary and indexing stages.
+    Extraction always runs in the extraction process pool in this mode (see
+    get_extraction_pool), bounded by the pool's size, so parsing and OCR stay
+    in its child processes instead of holding the event loop's GIL.
+
+    Jobs move atomically from the queue to this worker's processing list and
+    are only removed once handled. Every worker refreshes a heartbeat key and
+    regularly re-queues the processing lists of workers whose heartbeat
+    expired (crashed, killed, container recreated), so their jobs resume from
+    their checkpoints on a live worker.
+    """
+
+    retry_backoff_seconds = 60
+    shutdown_grace_seconds = 30
+    heartbeat_seconds = 10
+    heartbeat_ttl_seconds = 60
+
+    def __init__(
+        self,
+        client,
+        queue: str | None = None,
+        concurrency: int | None = None,
+        stages=document_pipeline,
+        worker_id: str | None = None,
+    ):
+        self.client = client
+        self.queue = queue or settings.async_queue
+        self.worker_id = worker_id or settings.async_worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.processing = self._processing_key(self.worker_id)
+        self.concurrency = max(1, concurrency or settings.async_worker_concurrency)
+        self.max_retries = settings.async_worker_max_retries
+        self.stages = stages
+        self.provider_slots = asyncio.Semaphore(provider_limit(settings.ai_provider))
+        self.extraction_slots = asyncio.Semaphore(max(1, settings.extraction_pool_workers))
+        # Every document runs at most two stages at once (summary and indexing)
+        self.executor = ThreadPoolExecutor(max_workers=2 * self.concurrency, thread_name_prefix="async-stage")
+        self.tasks: set[asyncio.Task] = set()
+        self.stopping = asyncio.Event()
+
+    async def _run(self, fn, *args, slots: asyncio.Semaphore | None = None):
+        """Runs a blocking stage on the thread pool (with this task's request id), within `slots`."""
+        loop = asyncio.get_running_loop()
+        call = contextvars.copy_context().run
+        if slots is None:
+            return await loop.run_in_executor(self.executor, call, fn, *args)
+        async with slots:
+            return await loop.run_in_executor(self.executor, call, fn, *args)
+
+    async def process(self, ctx: dict) -> dict:
+        """One document: fetch, extract, summary and indexing side by side, finalize."""
+        ctx = await self._run(self.stages.fetch_stage, ctx)
+        ctx = await self._run(self.stages.extract_stage, ctx, slots=self.extraction_slots)
+        # Both branches finish before anything is raised: no stage outlives its attempt
+        results = await asyncio.gather(
+            self._run(self.stages.summarize_stage, ctx, slots=self.provider_slots),
+            self._run(self.stages.index_stage, ctx, slots=self.provider_slots),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return await self._run(self.stages.finalize_stage, list(results))
+
+    async def handle(self, raw: bytes):
+        """Processes one queued job with retries, then removes it from the processing list."""
+        ctx = json.loads(raw)
+        request_id_var.set(ctx.get("request_id", "worker-gen"))
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = await self.process(ctx)
+                logger.info(f"Async worker: Document {ctx['document_id']} {result['status']}")
+                break
+            except Exception as e:
+                error_msg = str(e)
+                if is_retryable(error_msg) and attempt < self.max_retries:
+                    countdown = min(self.retry_backoff_seconds * (2 ** attempt), 3600)
+                    logger.warning(f"Async worker: Document {ctx['document_id']} retrying in {countdown}s: {error_msg}")
+                    document_pipeline.publish(ctx, {"status": "RETRYING", "message": "Transient error, retrying..."})
+                    await asyncio.sleep(countdown)
+                    continue
+                logger.critical(f"Async worker: Document {ctx['document_id']} permanently failed: {error_msg}")
+                await self._run(self.stages.fail_document, ctx, error_msg)
+                break
+
+        await self.client.lrem(self.processing, 1, raw)
+
+    def _processing_key(self, worker_id: str) -> str:
+        return f"{self.queue}:processing:{worker_id}"
+
+    def _heartbeat_key(self, worker_id: str) -> str:
+        return f"{self.queue}:heartbeat:{worker_id}"
+
+    async def _requeue(self, processing_key: str) -> int:
+        """Moves a processing list's jobs back to the front of the queue."""
+        requeued = 0
+        while await self.client.lmove(processing_key, self.queue, "RIGHT", "RIGHT"):
+            requeued += 1
+        return requeued
+
+    async def reap_orphans(self) -> int:
+        """Re-queues the jobs of other workers whose heartbeat expired."""
+        prefix = self._processing_key("")
+        requeued = 0
+        async for key in self.client.scan_iter(match=f"{prefix}*"):
+            key = key.decode() if isinstance(key, bytes) else key
+            owner = key[len(prefix):]
+            if owner != self.worker_id and not await self.client.exists(self._heartbeat_key(owner)):
+                requeued += await self._requeue(key)
+        if requeued:
+            logger.warning(f"Async worker: Re-queued {requeued} unfinished documents of stopped workers")
+        return requeued
+
+    async def beat(self):
+        try:
+            await self.client.set(
+                self._heartbeat_key(self.worker_id), int(time.time()), ex=self.heartbeat_ttl_seconds
+            )
+            await self.reap_orphans()
+        except Exception as e:
+            logger.warning(f"Async worker: Heartbeat failed: {e}")
+
+    async def heartbeat(self):
+        """Keeps this worker's heartbeat alive and reaps the jobs of dead workers."""
+        while not self.stopping.is_set():
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=self.heartbeat_seconds)
+            except asyncio.TimeoutError:
+                await self.beat()
+
+    async def run(self):
+        # With a stable ASYNC_WORKER_ID, our own list holds what a previous run left
+        requeued = await self._requeue(self.processing)
+        if requeued:
+            logger.warning(f"Async worker: Re-queued {requeued} unfinished documents from the last run")
+        await self.beat()
+        heartbeat = asyncio.create_task(self.heartbeat())
+        slots = asyncio.Semaphore(self.concurrency)
+        logger.info(f"Async worker: Consuming {self.queue} with {self.concurrency} documents in flight")
+
+        while not self.stopping.is_set():
+            await slots.acquire()
+            raw = await self.client.blmove(self.queue, self.processing, 1, "RIGHT", "LEFT")
+            if raw is None:
+                slots.release()
+                continue
+            task = asyncio.create_task(self.handle(raw))
+            self.tasks.add(task)
+            task.add_done_callback(lambda t: (self.tasks.discard(t), slots.release()))
+
+        await self.drain()
+        await heartbeat
+        # Whatever is still in our processing list is picked up by a live worker
+        await self.client.delete(self._heartbeat_key(self.worker_id))
+
+    async def drain(self):
+        """Gives in-flight documents a grace period; unfinished ones are re-queued by a live worker."""
+        pending = set()
+        if self.tasks:
+            logger.info(f"Async worker: Waiting for {len(self.tasks)} documents in flight")
+            _, pending = await asyncio.wait(self.tasks, timeout=self.shutdown_grace_seconds)
+            for task in pending:
+                task.cancel()
+        # Stages still running on threads past the grace period are abandoned, not awaited
+        self.executor.shutdown(wait=not pending, cancel_futures=True)
+
+    def stop(self):
+        self.stopping.set()
+
+
+async def main():
+    setup_logging()
+    client = aioredis.from_url(settings.redis_url)
+    worker = AsyncDocumentWorker(client)
+    clear_ready()
+    if settings.worker_warm_start:
+        await asyncio.to_thread(warm_start, redis_client)
+    else:
+        mark_ready(redis_client)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        clear_ready(redis_client)
+        await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,285 @@
+import os
+import json
+import uuid
+import logging
+from celery import Task, chain, group
+from app.infrastructure.queue.celery_app import celery_app
+from app.infrastructure.db.session_sync import db_session_scope
+from app.infrastructure.db.models import Document
+from app.infrastructure.db.checkpoints import PipelineCheckpoints
+from app.infrastructure.config import settings
+from app.infrastructure.logging import request_id_var
+from app.domain.exceptions import ProcessingError
+from app.dependencies import get_node_parser, get_rag_service
+from app.workers.document_worker import (
+    clone_from_duplicate,
+    complete_document,
+    get_services,
+    is_retryable,
+    load_checkpoints,
+    pages_for_indexing,
+    redis_client,
+    resolve_summary_timing,
+    resumable_extraction,
+    resumable_summary,
+    resume_indexing,
+    save_tabular_copy,
+)
+from asgiref.sync import async_to_sync
+
+logger = logging.getLogger(__name__)
+
+
+def build_pipeline(document_id: str, request_id: str, summary_timing: str | None = None):
+    """
+    fetch -> extract -> (summarize | chunk+embed) -> finalize.
+    Every stage receives and returns a small JSON context; the extraction
+    itself travels through the document's extraction checkpoint, which is why
+    these modes require PIPELINE_CHECKPOINTS (see config.py).
+    The group followed by finalize makes a chord, so finalize runs once both
+    branches are done. Returns (signature, pipeline id used for notifications).
+    """
+    ctx = pipeline_context(document_id, request_id, summary_timing)
+    signature = chain(
+        pipeline_fetch_task.s(ctx),
+        pipeline_extract_task.s(),
+        group(pipeline_summarize_task.s(), pipeline_index_task.s()),
+        pipeline_finalize_task.s(),
+    )
+    return signature, ctx["task_id"]
+
+
+def pipeline_context(document_id: str, request_id: str, summary_timing: str | None = None) -> dict:
+    """The JSON context every stage receives; `task_id` names the notification channel."""
+    return {
+        "document_id": document_id,
+        "request_id": request_id,
+        "summary_timing": resolve_summary_timing(summary_timing),
+        "task_id": str(uuid.uuid4()),
+    }
+
+
+def publish(ctx: dict, payload: dict):
+    redis_client.publish(f"notifications_{ctx['task_id']}", json.dumps({"task_id": ctx["task_id"], **payload}))
+
+
+def load_extraction(processor, doc: Document, file_path: str, checkpoints: PipelineCheckpoints):
+    """The document's extraction, from the checkpoint the extract stage filled."""
+    return resumable_extraction(processor, doc, file_path, checkpoints).collect()
+
+
+def local_file_path(storage_service, document_id: str) -> str:
+    """The file on this host (stages may run on different hosts); missing files fail for good."""
+    file_path = async_to_sync(storage_service.get_file_path)(document_id)
+    if not os.path.exists(file_path):
+        logger.error(f"FILE MISSING: {file_path}")
+        raise ProcessingError(f"NON_RETRYABLE: File not found at {file_path}")
+    return file_path
+
+
+def _context_of(args) -> dict | None:
+    for arg in args:
+        if isinstance(arg, dict) and "document_id" in arg:
+            return arg
+        if isinstance(arg, list):
+            found = _context_of(arg)
+            if found:
+                return found
+    return None
+
+
+def fail_document(ctx: dict, error_msg: str):
+    """Marks the document FAILED (once), drops its checkpoints and notifies the client."""
+    with db_session_scope() as db:
+        doc = db.query(Document).filter(Document.id == ctx["document_id"]).first()
+        if doc and doc.status != "FAILED":
+            doc.status = "FAILED"
+            doc.error_message = error_msg
+            PipelineCheckpoints(doc.id).clear(db)
+    publish(ctx, {"status": "FAILED", "error": error_msg})
+
+
+class PipelineStage(Task):
+    """
+    Base for pipeline stages: transient errors are retried with backoff,
+    anything else marks the document FAILED and notifies the client once.
+    """
+
+    max_retries = 3
+
+    def run_stage(self, ctx: dict, body):
+        token = request_id_var.set(ctx.get("request_id", "worker-gen"))
+        try:
+            return body()
+        except Exception as e:
+            if is_retryable(str(e)) and self.request.retries < self.max_retries:
+                logger.warning(f"Pipeline stage {self.name} for {ctx['document_id']} retrying: {e}")
+                raise self.retry(exc=e, countdown=min(60 * (2 ** self.request.retries), 3600))
+            raise
+        finally:
+            request_id_var.reset(token)
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        ctx = _context_of(args)
+        if ctx is None:
+            return
+        logger.critical(f"Pipeline stage {self.name} permanently failed for {ctx['document_id']}: {exc}")
+        fail_document(ctx, str(exc))
+
+
+def _set_status(db, doc: Document, ctx: dict, status: str):
+    doc.status = status
+    db.commit()
+    publish(ctx, {"status": status})
+
+
+# --- STAGES ---
+# Plain functions, so the Celery tasks below and the asyncio worker
+# (app/workers/async_worker.py) run exactly the same steps.
+
+def fetch_stage(ctx: dict) -> dict:
+    """Load the document, short-circuit duplicates, check the file is reachable."""
+    _, storage_service = get_services()
+    with db_session_scope() as db:
+        doc = db.query(Document).filter(Document.id == ctx["document_id"]).first()
+        if not doc:
+            raise ProcessingError(f"NON_RETRYABLE: Document {ctx['document_id']} not found")
+
+        doc.status = "PROCESSING"
+        db.commit()
+
+        source_id = clone_from_duplicate(db, doc)
+        if source_id:
+            publish(ctx, {"status": "COMPLETED", "analysis": doc.analysis})
+            return {**ctx, "skip": True, "cloned_from": source_id}
+
+        file_path = local_file_path(storage_service, str(doc.id))
+        _set_status(db, doc, ctx, "EXTRACTING_TEXT")
+        return {**ctx, "file_path": file_path}
+
+
+def extract_stage(ctx: dict) -> dict:
+    """CPU: parse/OCR once and checkpoint (or cache) the result for the next stages."""
+    if ctx.get("skip"):
+        return ctx
+
+    processor, storage_service = get_services()
+    # The fetch stage may have run on another host: resolve the path locally
+    file_path = local_file_path(storage_service, ctx["document_id"])
+    with db_session_scope() as db:
+        doc = db.query(Document).filter(Document.id == ctx["document_id"]).first()
+        extraction = load_extraction(processor, doc, file_path, load_checkpoints(db, doc.id))
+        if not extraction.text.strip():
+            raise ProcessingError("NON_RETRYABLE: No text could be extracted from the document.")
+
+        doc.raw_text = extraction.text
+        _set_status(db, doc, ctx, "INDEXING")
+        return {**ctx, "file_path": file_path, "source_type": extraction.source_type}
+
+
+def summarize_stage(ctx: dict) -> dict:
+    """LLM: summary, or just the analysis stats when the summary is deferred."""
+    if ctx.get("skip"):
+        return ctx
+
+    processor, storage_service = get_services()
+    file_path = async_to_sync(storage_service.get_file_path)(ctx["document_id"])
+    with db_session_scope() as db:
+        doc = db.query(Document).filter(Document.id == ctx["document_id"]).first()
+        mime_type, content_hash = doc.content, doc.content_hash
+        checkpoints = load_checkpoints(db, doc.id)
+        extraction = load_extraction(processor, doc, file_path, checkpoints)
+
+    # No DB session is held while the LLM generates
+    publish(ctx, {"status": "STAGE_UPDATE", "stage": "summary", "state": "started"})
+    result = resumable_summary(checkpoints, extraction, lambda: processor.process_sync(
+        file_path,
+        mime_type=mime_type,
+        on_chunk=lambda chunk: publish(ctx, {"status": "SUMMARY_CHUNK", "chunk": chunk}),
+        content_hash=content_hash,
+        extraction=extraction,
+        summarize=ctx["summary_timing"] == "eager",
+    ))
+    publish(ctx, {"status": "STAGE_UPDATE", "stage": "summary", "state": "completed"})
+    return {**ctx, "analysis": result["analysis"]}
+
+
+def index_stage(ctx: dict) -> dict:
+    """Embedding: chunk, embed and index the extraction."""
+    if ctx.get("skip"):
+        return ctx
+
+    processor, storage_service = get_services()
+    rag_service = get_rag_service()
+    parser = get_node_parser()
+    file_path = async_to_sync(storage_service.get_file_path)(ctx["document_id"])
+
+    publish(ctx, {"status": "STAGE_UPDATE", "stage": "indexing", "state": "started"})
+    with db_session_scope() as db:
+        doc = db.query(Document).filter(Document.id == ctx["document_id"]).first()
+        checkpoints = load_checkpoints(db, doc.id)
+        extraction = load_extraction(processor, doc, file_path, checkpoints)
+        chunk_count = rag_service.index_stream(
+            db,
+            ctx["document_id"],
+            pages_for_indexing(extraction.pages, extraction.source_type),
+            parser,
+            batch_size=settings.embedding_batch_size,
+            **resume_indexing(db, checkpoints),
+        )
+    publish(ctx, {"status": "STAGE_UPDATE", "stage": "indexing", "state": "completed", "chunks": chunk_count})
+    return {**ctx, "chunks": chunk_count}
+
+
+def finalize_stage(results: list) -> dict:
+    """Merge the branch results and complete the document."""
+    ctx = {k: v for r in results for k, v in r.items()}
+    if ctx.get("skip"):
+        return {"document_id": ctx["document_id"], "status": "CLONED", "source": ctx.get("cloned_from")}
+
+    _, storage_service = get_services()
+    with db_session_scope() as db:
+        doc = db.query(Document).filter(Document.id == ctx["document_id"]).first()
+        doc.analysis = ctx["analysis"]
+
+        if ctx["source_type"] in ("csv", "excel"):
+            file_path = async_to_sync(storage_service.get_file_path)(ctx["document_id"])
+            save_tabular_copy(ctx["document_id"], file_path, ctx["source_type"])
+
+        complete_document(db, doc, ctx["summary_timing"], ctx["request_id"])
+        db.commit()
+        publish(ctx, {"status": "COMPLETED", "analysis": doc.analysis})
+    return {"document_id": ctx["document_id"], "status": "COMPLETED", "chunks": ctx.get("chunks", 0)}
+
+
+# --- CELERY TASKS ---
+
+@celery_app.task(bind=True, base=PipelineStage, name="pipeline_fetch_task")
+def pipeline_fetch_task(self, ctx: dict) -> dict:
+    """Stage 1: see fetch_stage."""
+    return self.run_stage(ctx, lambda: fetch_stage(ctx))
+
+
+@celery_app.task(bind=True, base=PipelineStage, name="pipeline_extract_task")
+def pipeline_extract_task(self, ctx: dict) -> dict:
+    """Stage 2 (extraction queue): see extract_stage."""
+    return self.run_stage(ctx, lambda: extract_stage(ctx))
+
+
+@celery_app.task(bind=True, base=PipelineStage, name="pipeline_summarize_task")
+def pipeline_summarize_task(self, ctx: dict) -> dict:
+    """Stage 3a (llm queue): see summarize_stage."""
+    return self.run_stage(ctx, lambda: summarize_stage(ctx))
+
+
+@celery_app.task(bind=True, base=PipelineStage, name="pipeline_index_task")
+def pipeline_index_task(self, ctx: dict) -> dict:
+    """Stage 3b (embedding queue): see index_stage."""
+    return self.run_stage(ctx, lambda: index_stage(ctx))
+
+
+@celery_app.task(bind=True, base=PipelineStage, name="pipeline_finalize_task")
+def pipeline_finalize_task(self, results: list) -> dict:
+    """Stage 4: see finalize_stage."""
+    ctx = {k: v for r in results for k, v in r.items()}
+    return self.run_stage(ctx, lambda: finalize_stage(results))
@@ -1,13 +1,25 @@
 import json
 import redis
 import os
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 from app.infrastructure.queue.celery_app import celery_app
-from app.dependencies import get_document_processor, get_storage_service
+from app.dependencies import (
+    get_document_processor,
+    get_node_parser,
+    get_rag_service,
+    get_storage_service,
+    get_tabular_store,
+)
 from app.infrastructure.db.session_sync import db_session_scope
 from app.infrastructure.db.models import Document
+from app.infrastructure.db.checkpoints import PipelineCheckpoints
 from app.infrastructure.config import settings
 from app.infrastructure.logging import request_id_var
+from app.infrastructure.processing.boilerplate import strip_boilerplate
+from app.infrastructure.processing.extraction import ExtractionResult, ExtractionStream, pages_to_llama_documents
 from asgiref.sync import async_to_sync
 
 logger = logging.getLogger(__name__)
@@ -18,10 +30,246 @@ redis_client = redis.from_url(settings.redis_url)
 def get_services():
     return get_document_processor(), get_storage_service()
 
+def pages_for_indexing(pages, source_type: str):
+    """PDF pages lose their repeated headers/footers/disclaimers before chunking."""
+    if settings.strip_boilerplate and source_type == "pdf":
+        return strip_boilerplate(pages, lookahead=settings.boilerplate_lookahead_pages)
+    return pages
+
+SUMMARY_TIMINGS = ("eager", "lazy", "background")
+
+def resolve_summary_timing(requested: str | None) -> str:
+    """Per-upload choice first, then SUMMARY_TIMING; anything unknown means eager."""
+    timing = (requested or settings.summary_timing).lower()
+    return timing if timing in SUMMARY_TIMINGS else "eager"
+
+TRANSIENT_ERRORS = ["Rate Limit", "429", "timeout", "connection", "AI Engine failed"]
+PERMANENT_ERRORS = ["NON_RETRYABLE", "too short", "not found"]
+
+def is_retryable(error_msg: str) -> bool:
+    """Transient provider/network failures are retried; everything else fails the document."""
+    is_transient = any(msg in error_msg for msg in TRANSIENT_ERRORS)
+    is_permanent = any(msg in error_msg for msg in PERMANENT_ERRORS)
+    return is_transient and not is_permanent
+
+def save_tabular_copy(document_id: str, file_path: str, source_type: str):
+    """Best effort: without the Parquet copy, questions still go through vector search."""
+    tabular_store = get_tabular_store()
+    if tabular_store is None:
+        return
+    try:
+        tabular_store.save(document_id, file_path, source_type)
+    except Exception as e:
+        logger.warning(f"Could not store tabular copy of {document_id}: {e}")
+
+def copy_tabular_copy(source_id: str, document_id: str):
+    """Best effort, like save_tabular_copy: a clone without it uses vector search."""
+    tabular_store = get_tabular_store()
+    if tabular_store is None:
+        return
+    try:
+        tabular_store.copy(source_id, document_id)
+    except Exception as e:
+        logger.warning(f"Could not copy tabular copy of {source_id} to {document_id}: {e}")
+
+def clone_from_duplicate(db, doc) -> str | None:
+    """
+    Completes `doc` from an already COMPLETED document with the same content
+    hash (text, analysis and embeddings). Returns the source id, or None.
+    """
+    if not doc.content_hash:
+        return None
+
+    existing_doc = db.query(Document).filter(
+        Document.content_hash == doc.content_hash,
+        Document.status == "COMPLETED",
+        Document.id != doc.id
+    ).first()
+    if not existing_doc:
+        return None
+
+    logger.info(f"RAG: Duplicate found (Hash: {doc.content_hash}). Cloning results from {existing_doc.id}")
+    doc.raw_text = existing_doc.raw_text
+    doc.analysis = existing_doc.analysis
+    doc.status = "COMPLETED"
+
+    # Clone embeddings using raw SQL for maximum performance
+    from sqlalchemy import text as sa_text
+    db.execute(sa_text("""
+        INSERT INTO data_document_embeddings (id, document_id, text, embedding, meta)
+        SELECT gen_random_uuid(), :new_id, text, embedding, meta 
+        FROM data_document_embeddings 
+        WHERE document_id = :old_id
+    """), {"new_id": doc.id, "old_id": existing_doc.id})
+
+    db.commit()
+    copy_tabular_copy(str(existing_doc.id), str(doc.id))
+    return str(existing_doc.id)
+
+def load_checkpoints(db, document_id) -> PipelineCheckpoints:
+    return PipelineCheckpoints(document_id, enabled=settings.pipeline_checkpoints).load(db)
+
+def commit_checkpoint(checkpoints: PipelineCheckpoints, save: Callable):
+    """
+    Writes a checkpoint in a short transaction of its own (stages finishing on
+    side threads, or long before the task's session commits). Best effort: a
+    lost checkpoint only means that stage runs again on a retry.
+    """
+    if not checkpoints.enabled:
+        return
+    try:
+        with db_session_scope() as session:
+            save(session)
+    except Exception as e:
+        logger.warning(f"Could not write pipeline checkpoint for {checkpoints.document_id}: {e}")
+
+def resumable_extraction(processor, doc, file_path: str, checkpoints: PipelineCheckpoints) -> ExtractionStream:
+    """
+    The document's pages: replayed from the extraction checkpoint on a retry,
+    otherwise extracted now and checkpointed as soon as the last page is out.
+    """
+    extraction = checkpoints.extraction()
+    if extraction is not None:
+        logger.info(f"Extraction of {doc.id} restored from checkpoint")
+        return ExtractionStream(extraction.pages, extraction.source_type, extraction.ocr_pages)
+
+    stream = processor.stream_extraction(file_path, doc.content, doc.content_hash)
+    if not checkpoints.enabled:
+        return stream
+
+    def checkpoint(_: ExtractionResult) -> ExtractionResult:
+        commit_checkpoint(checkpoints, lambda session: checkpoints.save_extraction(session, stream.result))
+        return stream.result
+
+    return ExtractionStream(stream, stream.source_type, stream.ocr_pages, finalize=checkpoint)
+
+def resumable_summary(checkpoints: PipelineCheckpoints, extraction: ExtractionResult, summarize: Callable[[], dict]) -> dict:
+    """`summarize()`, unless an earlier attempt already checkpointed the analysis."""
+    analysis = checkpoints.analysis()
+    if analysis is not None:
+        logger.info(f"Analysis of {checkpoints.document_id} restored from checkpoint")
+        return {"raw_text": extraction.text, "analysis": analysis}
+
+    result = summarize()
+    commit_checkpoint(checkpoints, lambda session: checkpoints.save_analysis(session, result["analysis"]))
+    return result
+
+def resume_indexing(db, checkpoints: PipelineCheckpoints) -> dict:
+    """
+    index_stream arguments: commit every batch with its checkpoint, and skip
+    what is already committed. Committed chunks are only kept when the
+    extraction is replayed from its checkpoint: a fresh extraction (OCR under
+    a time budget) may produce different chunks, so indexing starts over.
+    """
+    if not checkpoints.enabled:
+        return {}
+    resume_from = checkpoints.chunks_committed() if checkpoints.extraction() is not None else 0
+    return {
+        "resume_from": resume_from,
+        "on_batch": lambda count: checkpoints.save_chunks_committed(db, count),
+    }
+
+def complete_document(db, doc, summary_timing: str, request_id: str) -> int:
+    """Marks `doc` COMPLETED, bills its tokens and queues a background summary if requested."""
+    doc.status = "COMPLETED"
+    PipelineCheckpoints(doc.id).clear(db)
+
+    # Cost Optimization: Update User Token Count
+    tokens_used = doc.analysis.get("estimated_tokens", 0)
+    from app.infrastructure.db.models import User
+    db.query(User).filter(User.id == doc.owner_id).update({
+        User.total_tokens: User.total_tokens + tokens_used
+    })
+
+    logger.info(f"Successfully processed and indexed document {doc.id}. Tokens: {tokens_used}")
+
+    if summary_timing == "background":
+        # Commit first so the summary task sees a COMPLETED document
+        doc.analysis = {**doc.analysis, "summary_status": "queued", "summary_queued_at": time.time()}
+        db.commit()
+        generate_summary_task.delay(str(doc.id), request_id=request_id)
+
+    return tokens_used
+
+def summarize_while_indexing(
+    db, doc, processor, rag_service, parser, file_path: str, publish, on_chunk, checkpoints: PipelineCheckpoints
+) -> tuple[dict, ExtractionResult]:
+    """
+    Runs the summary (LLM-bound) on a side thread while this thread chunks,
+    embeds and indexes the same extraction (embedding-bound), so the document
+    completes in about max(summary, indexing) instead of their sum. Each stage
+    reports started/completed/failed through `publish`, and resumes from
+    `checkpoints` when an earlier attempt got that far.
+    Returns the summary result and the extraction both were built from.
+    """
+    document_id = str(doc.id)
+    started = time.monotonic()
+    summary_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary")
+    summary_futures = []
+
+    def stage(name: str, state: str, **extra):
+        elapsed_ms = round((time.monotonic() - started) * 1000)
+        publish({"status": "STAGE_UPDATE", "stage": name, "state": state, "elapsed_ms": elapsed_ms, **extra})
+
+    def summarize(extraction):
+        stage("summary", "started")
+        try:
+            result = resumable_summary(checkpoints, extraction, lambda: processor.process_sync(
+                file_path,
+                mime_type=doc.content,
+                on_chunk=on_chunk,
+                content_hash=doc.content_hash,
+                extraction=extraction,
+            ))
+        except Exception:
+            stage("summary", "failed")
+            raise
+        stage("summary", "completed")
+        return result
+
+    def start_summary(extraction):
+        summary_futures.append(summary_pool.submit(summarize, extraction))
+
+    try:
+        stage("indexing", "started")
+        try:
+            if settings.streaming_indexing:
+                stream = resumable_extraction(processor, doc, file_path, checkpoints)
+                # Extraction runs ahead of embedding; the summary starts as soon as it is done
+                pages = stream.run_ahead(on_complete=start_summary)
+                chunk_count = rag_service.index_stream(
+                    db,
+                    document_id,
+                    pages_for_indexing(pages, stream.source_type),
+                    parser,
+                    batch_size=settings.embedding_batch_size,
+                    **resume_indexing(db, checkpoints),
+                )
+                extraction = stream.result
+            else:
+                extraction = resumable_extraction(processor, doc, file_path, checkpoints).collect()
+                start_summary(extraction)
+                nodes = parser.get_nodes_from_documents(
+                    pages_to_llama_documents(pages_for_indexing(extraction.pages, extraction.source_type))
+                )
+                rag_service.index_nodes(db, document_id, nodes)
+                chunk_count = len(nodes)
+        except Exception:
+            stage("indexing", "failed")
+            raise
+        stage("indexing", "completed", chunks=chunk_count)
+        logger.info(f"Indexed {chunk_count} chunks for {doc.file_name}; waiting for the summary")
+
+        return summary_futures[0].result(), extraction
+    finally:
+        # Never leave a summary running into a retry of this task
+        summary_pool.shutdown(wait=True)
+
 @celery_app.task(bind=True, name="process_document_task", max_retries=5)
-def process_document_task(self, document_id: str, request_id: str = "worker-gen"):
+def process_document_task(self, document_id: str, request_id: str = "worker-gen", summary_timing: str | None = None):
     """Core background task for document analysis."""
     token = request_id_var.set(request_id)
+    summary_timing = resolve_summary_timing(summary_timing)
     task_id = self.request.id
     channel = f"notifications_{task_id}"
 
@@ -41,30 +289,12 @@ def process_document_task(self, document_id: str, request_id: str = "worker-gen"
             logger.info(f"Processing document: {document_id} (Task: {task_id})")
 
             # --- DE-DUPLICATION CHECK ---
-            if doc.content_hash:
-                existing_doc = db.query(Document).filter(
-                    Document.content_hash == doc.content_hash,
-                    Document.status == "COMPLETED",
-                    Document.id != doc.id
-                ).first()
-                
-                if existing_doc:
-                    logger.info(f"RAG: Duplicate found (Hash: {doc.content_hash}). Cloning results from {existing_doc.id}")
-                    doc.raw_text = existing_doc.raw_text
-                    doc.analysis = existing_doc.analysis
-                    doc.status = "COMPLETED"
-                    
-                    # Clone embeddings using raw SQL for maximum performance
-                    from sqlalchemy import text as sa_text
-                    db.execute(sa_text("""
-                        INSERT INTO data_document_embeddings (id, document_id, text, embedding, meta)
-                        SELECT gen_random_uuid(), :new_id, text, embedding, meta 
-                        FROM data_document_embeddings 
-                        WHERE document_id = :old_id
-                    """), {"new_id": doc.id, "old_id": existing_doc.id})
-                    
-                    db.commit()
-                    return {"document_id": document_id, "status": "CLONED", "source": str(existing_doc.id)}
+            source_id = clone_from_duplicate(db, doc)
+            if source_id:
+                return {"document_id": document_id, "status": "CLONED", "source": source_id}
+
+            # Stages an earlier attempt of this task already completed
+            checkpoints = load_checkpoints(db, document_id)
 
             # --- 1. TEXT EXTRACTION ---
             doc.status = "EXTRACTING_TEXT"
@@ -79,10 +309,8 @@ def process_document_task(self, document_id: str, request_id: str = "worker-gen"
                 logger.error(f"FILE MISSING: {path_to_process}")
                 raise Exception(f"NON_RETRYABLE: File not found at {path_to_process}")
 
-            # --- 2. AI ANALYSIS (WITH STREAMING) ---
-            doc.status = "GENERATING_SUMMARY"
-            db.commit()
-            redis_client.publish(channel, json.dumps({"task_id": task_id, "status": "GENERATING_SUMMARY"}))
+            rag_service = get_rag_service()
+            parser = get_node_parser()
 
             def on_summary_chunk(chunk: str):
                 # Publish each chunk to Redis for real-time UI updates
@@ -92,48 +320,107 @@ def process_document_task(self, document_id: str, request_id: str = "worker-gen"
                     "chunk": chunk
                 }))
 
-            logger.info(f"Starting AI analysis for {doc.file_name}")
-            result = processor.process_sync(path_to_process, mime_type=doc.content, on_chunk=on_summary_chunk)
-            
-            # Update document results
-            doc.raw_text = result.get("raw_text", "")
-            doc.analysis = result.get("analysis", {})
+            if settings.concurrent_summary and summary_timing == "eager":
+                # --- 2+3. AI ANALYSIS AND SEMANTIC INDEXING, CONCURRENTLY ---
+                doc.status = "INDEXING"
+                db.commit()
+                redis_client.publish(channel, json.dumps({"task_id": task_id, "status": "INDEXING"}))
 
-            # --- 3. SEMANTIC INDEXING (RAG) ---
-            doc.status = "GENERATING_EMBEDDINGS"
-            db.commit()
-            redis_client.publish(channel, json.dumps({"task_id": task_id, "status": "GENERATING_EMBEDDINGS"}))
+                def publish(payload: dict):
+                    redis_client.publish(channel, json.dumps({"task_id": task_id, **payload}))
 
-            from app.dependencies import get_rag_service
-            from llama_index.core import Document as LlamaDocument
-            from llama_index.core.node_parser import SentenceSplitter
-            
-            rag_service = get_rag_service()
-            
-            # Split into chunks
-            parser = SentenceSplitter(chunk_size=512, chunk_overlap=50)
-            nodes = parser.get_nodes_from_documents([LlamaDocument(text=doc.raw_text)])
-            
-            logger.info(f"Split document into {len(nodes)} chunks for RAG indexing")
-            
-            # Index the nodes
-            doc.status = "INDEXING"
-            db.commit()
-            redis_client.publish(channel, json.dumps({"task_id": task_id, "status": "INDEXING"}))
-            
-            rag_service.index_nodes(db, str(doc.id), nodes)
+                result, extraction = summarize_while_indexing(
+                    db, doc, processor, rag_service, parser, path_to_process, publish, on_summary_chunk, checkpoints
+                )
+
+                doc.raw_text = result.get("raw_text", "")
+                doc.analysis = result.get("analysis", {})
+
+            elif settings.streaming_indexing:
+                # --- 2. STREAMING SEMANTIC INDEXING (RAG) ---
+                # Pages are chunked and embedded while extraction is still running,
+                # so this stays under EXTRACTING_TEXT: clients expect GENERATING_SUMMARY
+                # before INDEXING, never after it
+                stream = resumable_extraction(processor, doc, path_to_process, checkpoints)
+                chunk_count = rag_service.index_stream(
+                    db,
+                    str(doc.id),
+                    pages_for_indexing(stream, stream.source_type),
+                    parser,
+                    batch_size=settings.embedding_batch_size,
+                    **resume_indexing(db, checkpoints),
+                )
+                logger.info(f"Stream-indexed {chunk_count} chunks for {doc.file_name}")
+                extraction = stream.result
+
+                # --- 3. AI ANALYSIS (WITH STREAMING) ---
+                if summary_timing == "eager":
+                    doc.status = "GENERATING_SUMMARY"
+                    db.commit()
+                    redis_client.publish(channel, json.dumps({"task_id": task_id, "status": "GENERATING_SUMMARY"}))
+                    logger.info(f"Starting AI analysis for {doc.file_name}")
+                else:
+                    logger.info(f"Deferring summary of {doc.file_name} ({summary_timing})")
+
+                result = resumable_summary(checkpoints, extraction, lambda: processor.process_sync(
+                    path_to_process,
+                    mime_type=doc.content,
+                    on_chunk=on_summary_chunk,
+                    content_hash=doc.content_hash,
+                    extraction=extraction,
+                    summarize=summary_timing == "eager",
+                ))
+
+                doc.raw_text = result.get("raw_text", "")
+                doc.analysis = result.get("analysis", {})
+
+            else:
+                # --- 2. AI ANALYSIS (WITH STREAMING) ---
+                doc.status = "GENERATING_SUMMARY"
+                db.commit()
+                redis_client.publish(channel, json.dumps({"task_id": task_id, "status": "GENERATING_SUMMARY"}))
+
+                logger.info(f"Starting AI analysis for {doc.file_name}")
+                extraction = resumable_extraction(processor, doc, path_to_process, checkpoints).collect()
+                result = resumable_summary(checkpoints, extraction, lambda: processor.process_sync(
+                    path_to_process,
+                    mime_type=doc.content,
+                    on_chunk=on_summary_chunk,
+                    content_hash=doc.content_hash,
+                    extraction=extraction,
+                    summarize=summary_timing == "eager",
+                ))
+
+                # Update document results
+                doc.raw_text = result.get("raw_text", "")
+                doc.analysis = result.get("analysis", {})
+
+                # --- 3. SEMANTIC INDEXING (RAG) ---
+                doc.status = "GENERATING_EMBEDDINGS"
+                db.commit()
+                redis_client.publish(channel, json.dumps({"task_id": task_id, "status": "GENERATING_EMBEDDINGS"}))
+
+                # Split into chunks, reusing the extraction the summary was built from
+                nodes = parser.get_nodes_from_documents(
+                    pages_to_llama_documents(pages_for_indexing(extraction.pages, extraction.source_type))
+                )
+
+                logger.info(f"Split document into {len(nodes)} chunks for RAG indexing")
+
+                # Index the nodes
+                doc.status = "INDEXING"
+                db.commit()
+                redis_client.publish(channel, json.dumps({"task_id": task_id, "status": "INDEXING"}))
+
+                rag_service.index_nodes(db, str(doc.id), nodes)
+
+            # --- 3b. COLUMNAR COPY FOR TABULAR QUESTIONS ---
+            source_type = extraction.source_type
+            if source_type in ("csv", "excel"):
+                save_tabular_copy(str(doc.id), path_to_process, source_type)
 
             # --- 4. COMPLETION ---
-            doc.status = "COMPLETED"
-            
-            # Cost Optimization: Update User Token Count
-            tokens_used = doc.analysis.get("estimated_tokens", 0)
-            from app.infrastructure.db.models import User
-            db.query(User).filter(User.id == doc.owner_id).update({
-                User.total_tokens: User.total_tokens + tokens_used
-            })
-            
-            logger.info(f"Successfully processed and indexed document {document_id}. Tokens: {tokens_used}")
+            complete_document(db, doc, summary_timing, request_id)
 
             # Notify via Redis
             notification_payload = {
@@ -147,10 +434,8 @@ def process_document_task(self, document_id: str, request_id: str = "worker-gen"
 
     except Exception as e:
         error_msg = str(e)
-        is_transient = any(msg in error_msg for msg in ["Rate Limit", "429", "timeout", "connection", "AI Engine failed"])
-        is_permanent = "NON_RETRYABLE" in error_msg or "too short" in error_msg or "not found" in error_msg
 
-        if is_permanent or not is_transient or self.request.retries >= self.max_retries:
+        if not is_retryable(error_msg) or self.request.retries >= self.max_retries:
             # Permanent failure or max retries reached
             logger.critical(f"Task {task_id} permanently failed: {error_msg}")
             
@@ -160,6 +445,7 @@ def process_document_task(self, document_id: str, request_id: str = "worker-gen"
                 if doc:
                     doc.status = "FAILED"
                     doc.error_message = error_msg
+                    PipelineCheckpoints(doc.id).clear(db)
             
             error_payload = {"task_id": task_id, "status": "FAILED", "error": error_msg}
             redis_client.publish(channel, json.dumps(error_payload))
@@ -183,4 +469,56 @@ def process_document_task(self, document_id: str, request_id: str = "worker-gen"
         raise self.retry(exc=e, countdown=min(countdown, 3600))
     
     finally:
-        request_id_var.reset(token)
\ No newline at end of file
+        request_id_var.reset(token)
+
+
+@celery_app.task(bind=True, name="generate_summary_task", max_retries=3)
+def generate_summary_task(self, document_id: str, request_id: str = "worker-gen"):
+    """
+    Deferred summary for a document indexed in lazy/background mode. Runs on
+    the low-priority summaries queue; extraction and the summary itself are
+    served from their caches when available.
+    """
+    token = request_id_var.set(request_id)
+    processor, storage_service = get_services()
+
+    try:
+        with db_session_scope() as db:
+            doc = db.query(Document).filter(Document.id == document_id).first()
+            if not doc or doc.status != "COMPLETED":
+                return {"document_id": document_id, "status": "SKIPPED"}
+
+            analysis = dict(doc.analysis or {})
+            if analysis.get("summary_status", "ready") == "ready":
+                return {"document_id": document_id, "status": "SKIPPED"}
+
+            doc.analysis = {**analysis, "summary_status": "generating"}
+            db.commit()
+
+            path_to_process = async_to_sync(storage_service.get_file_path)(str(doc.id))
+            # A fallback summary must not be stored as ready: fail and retry instead
+            result = processor.process_sync(
+                path_to_process,
+                mime_type=doc.content,
+                content_hash=doc.content_hash,
+                raise_on_failure=True,
+            )
+
+            doc.analysis = {**analysis, **result.get("analysis", {}), "summary_status": "ready"}
+            logger.info(f"Deferred summary generated for document {document_id}")
+            return {"document_id": document_id, "status": "COMPLETED"}
+
+    except Exception as e:
+        logger.error(f"Deferred summary for {document_id} failed: {e}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
+
+        # Give up: the next GET /documents/{id} queues it again
+        with db_session_scope() as db:
+            doc = db.query(Document).filter(Document.id == document_id).first()
+            if doc:
+                doc.analysis = {**(doc.analysis or {}), "summary_status": "pending"}
+        return {"error": str(e)}
+
+    finally:
+        request_id_var.reset(token)
@@ -0,0 +1,229 @@
+import os
+import time
+import socket
+import logging
+import importlib
+import threading
+from celery.signals import worker_init, worker_process_init, worker_ready, worker_shutdown
+from app.infrastructure.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Modules the first document would otherwise import (seconds on a cold child)
+WORKER_IMPORTS = (
+    "llama_index.core",
+    "llama_index.core.node_parser",
+    "llama_index.llms.ollama",
+    "llama_index.embeddings.ollama",
+    "llama_index.llms.gemini",
+    "llama_index.embeddings.gemini",
+    "ollama",
+    "pypdf",
+    "pandas",
+    "openpyxl",
+)
+
+READY_KEY_PREFIX = "worker:ready"
+
+
+def preload() -> float:
+    """
+    Imports the parser and LLM libraries and builds the DI singletons (AI
+    clients, LlamaIndex settings, chunker, extraction pool) in this process.
+    Returns the seconds it took.
+    """
+    from app.dependencies import (
+        get_document_processor,
+        get_extraction_pool,
+        get_node_parser,
+        get_rag_service,
+        get_storage_service,
+    )
+
+    started = time.monotonic()
+    for module in WORKER_IMPORTS:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"Warm start: Could not pre-import {module}: {e}")
+
+    get_storage_service()
+    get_document_processor()
+    get_rag_service()
+    get_node_parser()
+
+    pool = get_extraction_pool()
+    if pool is not None:
+        pool.warm_up()
+
+    return time.monotonic() - started
+
+
+def warm_models(ollama_client=None) -> list[str]:
+    """
+    Loads the configured Ollama chat and embedding models with a minimal
+    request, keeping them resident for OLLAMA_KEEP_ALIVE. Hosted providers
+    have nothing to load. Returns the models that answered.
+    """
+    if settings.ai_provider.lower() != "ollama":
+        return []
+
+    if ollama_client is None:
+        from ollama import Client
+        ollama_client = Client(host=settings.ollama_base_url)
+
+    warmed = []
+    # An empty prompt only loads the model, no tokens are generated
+    requests = (
+        (settings.ollama_model, lambda: ollama_client.generate(
+            model=settings.ollama_model, prompt="", keep_alive=settings.ollama_keep_alive
+        )),
+        (settings.ollama_embedding_model, lambda: ollama_client.embeddings(
+            model=settings.ollama_embedding_model, prompt="warm-up", keep_alive=settings.ollama_keep_alive
+        )),
+    )
+    for model, request in requests:
+        started = time.monotonic()
+        try:
+            request()
+        except Exception as e:
+            logger.warning(f"Warm start: Could not load Ollama model {model}: {e}")
+            continue
+        warmed.append(model)
+        logger.info(f"Warm start: Ollama model {model} loaded in {time.monotonic() - started:.1f}s")
+    return warmed
+
+
+def _ready_key() -> str:
+    return f"{READY_KEY_PREFIX}:{socket.gethostname()}"
+
+
+_heartbeat_stop: threading.Event | None = None
+
+
+def _publish_ready(redis_client) -> None:
+    try:
+        redis_client.set(_ready_key(), int(time.time()), ex=settings.worker_ready_ttl_seconds)
+    except Exception as e:
+        logger.warning(f"Warm start: Could not publish readiness: {e}")
+
+
+def _ready_heartbeat(redis_client, stop: threading.Event) -> None:
+    # Refreshes the key well before it expires; a killed worker's key just lapses
+    interval = max(1, settings.worker_ready_ttl_seconds // 3)
+    while not stop.wait(interval):
+        _publish_ready(redis_client)
+
+
+def mark_ready(redis_client=None) -> None:
+    """
+    Readiness signal: WORKER_READY_FILE for container healthchecks, plus a
+    `worker:ready:<host>` key for anything watching Redis. The key expires
+    after WORKER_READY_TTL_SECONDS unless this process keeps refreshing it.
+    """
+    global _heartbeat_stop
+
+    with open(settings.worker_ready_file, "w") as f:
+        f.write(str(int(time.time())))
+
+    if redis_client is not None:
+        _publish_ready(redis_client)
+        if _heartbeat_stop is None:
+            _heartbeat_stop = threading.Event()
+            threading.Thread(
+                target=_ready_heartbeat,
+                args=(redis_client, _heartbeat_stop),
+                name="ready-heartbeat",
+                daemon=True,
+            ).start()
+    logger.info("Warm start: Worker is ready")
+
+
+def clear_ready(redis_client=None) -> None:
+    global _heartbeat_stop
+
+    if _heartbeat_stop is not None:
+        _heartbeat_stop.set()
+        _heartbeat_stop = None
+
+    try:
+        os.remove(settings.worker_ready_file)
+    except FileNotFoundError:
+        pass
+
+    if redis_client is not None:
+        try:
+            redis_client.delete(_ready_key())
+        except Exception as e:
+            logger.warning(f"Warm start: Could not clear readiness: {e}")
+
+
+def _preload_safely() -> None:
+    # A failed warm-up only costs the first document its cold start
+    try:
+        logger.info(f"Warm start: Process {os.getpid()} preloaded in {preload():.1f}s")
+    except Exception as e:
+        logger.warning(f"Warm start: Preload failed: {e}")
+
+
+def warm_start(redis_client=None) -> None:
+    """Preload, load the models, then signal readiness (for workers outside Celery)."""
+    _preload_safely()
+    warm_models()
+    mark_ready(redis_client)
+
+
+# --- CELERY HOOKS ---
+# worker_process_init runs in every prefork child and once for the solo pool
+# before it accepts tasks. Thread and green pools never send it: their tasks
+# run in the main process, which preloads in worker_init instead. worker_ready
+# runs once in the main process. Model loading happens there, on a thread, so
+# slow Ollama loads never trip the pool's child start-up timeout.
+
+# Pools that send worker_process_init themselves
+PROCESS_INIT_POOLS = ("celery.concurrency.prefork", "celery.concurrency.solo")
+
+
+def _runs_tasks_in_main_process(pool_cls) -> bool:
+    from celery.concurrency import get_implementation
+
+    return get_implementation(pool_cls).__module__ not in PROCESS_INIT_POOLS
+
+
+@worker_init.connect
+def _reset_ready(sender=None, **kwargs):
+    from app.workers.document_worker import redis_client
+
+    # A restarted container keeps /tmp, and a crashed run may have left its key
+    clear_ready(redis_client)
+
+    if settings.worker_warm_start and sender is not None and _runs_tasks_in_main_process(sender.pool_cls):
+        _preload_safely()
+
+
+@worker_process_init.connect
+def _preload_process(**kwargs):
+    if settings.worker_warm_start:
+        _preload_safely()
+
+
+@worker_ready.connect
+def _warm_models_and_signal(**kwargs):
+    from app.workers.document_worker import redis_client
+
+    if not settings.worker_warm_start:
+        mark_ready(redis_client)
+        return
+
+    def warm():
+        warm_models()
+        mark_ready(redis_client)
+
+    threading.Thread(target=warm, name="model-warm-up", daemon=True).start()
+
+
+@worker_shutdown.connect
+def _clear_ready(**kwargs):
+    from app.workers.document_worker import redis_client
+
+    clear_ready(redis_client)
@@ -0,0 +1,79 @@
+"""
+Throughput and output quality of each installed PDF text backend.
+
+Quality is word-level F1 (did the words come out?) and reading-order
+similarity (did they come out in order?). On the generated corpus both are
+measured against the known ground truth; on a user-supplied PDF they are
+measured against the --reference backend.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf_backends [path.pdf] [--pages 200] [--reference pdfminer]
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+
+from app.infrastructure.processing.pdf_extraction import available_pdf_backends, extract_pdf_pages_serial
+from tests.fixtures import make_text_pdf, pdf_page_lines
+
+# Reading order is compared on the first pages only (SequenceMatcher is quadratic)
+ORDER_SAMPLE_PAGES = 5
+
+
+def word_f1(expected: list[str], actual: list[str]) -> float:
+    overlap = sum((Counter(expected) & Counter(actual)).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / len(actual), overlap / len(expected)
+    return 2 * precision * recall / (precision + recall)
+
+
+def order_similarity(expected_pages: list[str], actual_pages: list[str]) -> float:
+    ratios = [
+        SequenceMatcher(None, e.split(), a.split(), autojunk=False).ratio()
+        for e, a in zip(expected_pages[:ORDER_SAMPLE_PAGES], actual_pages[:ORDER_SAMPLE_PAGES])
+    ]
+    return sum(ratios) / len(ratios) if ratios else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", help="PDF to benchmark (defaults to a generated one)")
+    parser.add_argument("--pages", type=int, default=200, help="Pages in the generated PDF")
+    parser.add_argument("--reference", default="pdfminer", help="Ground-truth backend for user PDFs")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = available_pdf_backends()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.path:
+            path = args.path
+            expected = extract_pdf_pages_serial(path, backend=args.reference)
+            truth = f"reference backend: {args.reference}"
+        else:
+            path = make_text_pdf(os.path.join(tmp, "bench.pdf"), pages=args.pages)
+            expected = ["\n".join(lines) for lines in pdf_page_lines(pages=args.pages)]
+            truth = "ground truth: generated text"
+
+        print(f"{len(expected)} pages, {truth}, backends: {', '.join(backends)}\n")
+        print(f"{'backend':<12}{'time':>10}{'pages/sec':>12}{'word F1':>10}{'order':>8}")
+
+        expected_words = " ".join(expected).split()
+        for backend in backends:
+            best, pages = float("inf"), []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                pages = extract_pdf_pages_serial(path, backend=backend)
+                best = min(best, time.perf_counter() - start)
+
+            f1 = word_f1(expected_words, " ".join(pages).split())
+            order = order_similarity(expected, pages)
+            print(f"{backend:<12}{best:>9.3f}s{len(pages) / best:>12.1f}{f1:>10.3f}{order:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
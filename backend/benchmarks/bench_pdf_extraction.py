@@ -0,0 +1,59 @@
+"""
+Serial vs page-parallel PDF extraction throughput.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf_extraction [path.pdf] [--pages 300] [--workers 4]
+
+Without a path a synthetic text-layer PDF is generated.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.infrastructure.processing.pdf_extraction import (
+    count_pdf_pages,
+    extract_pdf_pages_parallel,
+    extract_pdf_pages_serial,
+)
+from tests.fixtures import make_text_pdf
+
+
+def _time(fn, repeats: int):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", help="PDF to benchmark (defaults to a generated one)")
+    parser.add_argument("--pages", type=int, default=300, help="Pages in the generated PDF")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pages-per-task", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path or make_text_pdf(os.path.join(tmp, "bench.pdf"), pages=args.pages)
+        pages = count_pdf_pages(path)
+
+        serial_s, serial_pages = _time(lambda: extract_pdf_pages_serial(path), args.repeats)
+        parallel_s, parallel_pages = _time(
+            lambda: extract_pdf_pages_parallel(path, args.workers, args.pages_per_task),
+            args.repeats,
+        )
+
+    assert serial_pages == parallel_pages, "parallel output differs from serial output"
+
+    print(f"pages: {pages}  workers: {args.workers}  pages/task: {args.pages_per_task}")
+    print(f"serial    {serial_s:8.3f}s  {pages / serial_s:10.1f} pages/sec")
+    print(f"parallel  {parallel_s:8.3f}s  {pages / parallel_s:10.1f} pages/sec")
+    print(f"speedup   {serial_s / parallel_s:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
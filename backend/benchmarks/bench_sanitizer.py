@@ -0,0 +1,52 @@
+"""
+Original per-character sanitizer vs the translate/regex sanitizer.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sanitizer [--size 2000000] [--repeats 5]
+"""
+import argparse
+import time
+
+from app.infrastructure.processing.text_sanitizer import _bmp_non_printable_pattern, sanitize_text
+from tests.fixtures import make_document_text, make_unicode_corpus, reference_sanitize
+
+
+def _best(fn, text: str, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=2_000_000, help="Characters per corpus")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    _bmp_non_printable_pattern()
+    print(f"one-time pattern build: {time.perf_counter() - start:.3f}s\n")
+
+    print(f"{'corpus':<16}{'reference':>12}{'fast':>12}{'speedup':>10}{'MB/s':>10}")
+    corpora = {
+        "document": lambda: make_document_text(args.size),
+        "ascii": lambda: make_unicode_corpus(args.size, ascii_ratio=1.0),
+        "mostly-ascii": lambda: make_unicode_corpus(args.size, ascii_ratio=0.9),
+        "mixed": lambda: make_unicode_corpus(args.size, ascii_ratio=0.5),
+        "unicode-heavy": lambda: make_unicode_corpus(args.size, ascii_ratio=0.0),
+    }
+    for name, build in corpora.items():
+        corpus = build()
+        assert sanitize_text(corpus) == reference_sanitize(corpus), f"{name}: outputs differ"
+
+        ref_s = _best(reference_sanitize, corpus, args.repeats)
+        fast_s = _best(sanitize_text, corpus, args.repeats)
+        mb = len(corpus.encode("utf-8", "surrogatepass")) / 1e6
+        print(f"{name:<16}{ref_s:>11.4f}s{fast_s:>11.4f}s{ref_s / fast_s:>9.1f}x{mb / fast_s:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
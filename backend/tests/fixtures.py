@@ -0,0 +1,207 @@
+"""
+Synthetic document generators shared by the extraction tests and benchmarks.
+
+Kept dependency-free (no reportlab) so both run anywhere the backend itself
+runs.
+"""
+import random
+
+WORDS = (
+    "agreement party shall liability clause revenue quarter region invoice "
+    "payment term notice governing law schedule amendment warranty services "
+    "confidential information termination delivery obligations indemnity"
+).split()
+
+
+def make_sentence(rng: random.Random, min_words: int = 6, max_words: int = 14) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def _escape_pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_page_lines(pages: int = 50, lines_per_page: int = 40, seed: int = 7) -> list[list[str]]:
+    """The exact lines make_text_pdf writes on each page (ground truth for quality checks)."""
+    rng = random.Random(seed)
+    return [[f"Page {i + 1}"] + [make_sentence(rng) for _ in range(lines_per_page)] for i in range(pages)]
+
+
+def make_text_pdf(path: str, pages: int = 50, lines_per_page: int = 40, seed: int = 7) -> str:
+    """Writes a text-layer PDF with `pages` pages of pseudo-contract prose."""
+    page_lines = pdf_page_lines(pages, lines_per_page, seed)
+    objects: list[bytes] = []
+
+    # 1: catalog, 2: page tree, 3: font. Page/content pairs follow.
+    page_ids = [4 + 2 * i for i in range(pages)]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for pid, lines in zip(page_ids, page_lines):
+        ops = ["BT", "/F1 10 Tf", "12 TL", "40 800 Td"]
+        ops += [f"({_escape_pdf_text(line)}) '" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {pid + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+
+    with open(path, "wb") as f:
+        f.write(out)
+    return path
+
+
+# Code point pools for sanitizer corpora: prose, whitespace, C0/C1 controls,
+# format chars (ZWJ, BOM, bidi), separators, combining marks, CJK, emoji,
+# private use and lone surrogates.
+UNICODE_POOLS = [
+    [chr(c) for c in range(0x20, 0x7F)],
+    ["\n", "\r", "\t", " ", "\x0b", "\x0c"],
+    [chr(c) for c in range(0x00, 0x20)] + [chr(c) for c in range(0x7F, 0xA0)],
+    ["​", "‌", "‍", "‎", "‮", "⁠", "﻿", "­"],
+    [" ", " ", " ", "　", " "],
+    [chr(c) for c in range(0x0300, 0x0370)],
+    [chr(c) for c in range(0x00C0, 0x0250)] + [chr(c) for c in range(0x0400, 0x0460)],
+    [chr(c) for c in range(0x4E00, 0x4F00)] + [chr(c) for c in range(0x0600, 0x0650)],
+    [chr(c) for c in range(0x1F600, 0x1F650)],
+    [chr(c) for c in range(0xE000, 0xE010)] + ["\ud800", "\udfff", "\U000e0001", "\U0010fffd"],
+]
+
+
+def make_unicode_corpus(size: int, seed: int = 7, ascii_ratio: float = 0.7) -> str:
+    """Random text of `size` characters, mostly prose with Unicode-heavy noise."""
+    rng = random.Random(seed)
+    noise_pools = UNICODE_POOLS[1:]
+    out = []
+    while len(out) < size:
+        if rng.random() < ascii_ratio:
+            out.extend(make_sentence(rng) + " ")
+        else:
+            pool = rng.choice(noise_pools)
+            out.extend(rng.choice(pool) for _ in range(rng.randint(1, 12)))
+    return "".join(out[:size])
+
+
+def make_document_text(size: int, seed: int = 7) -> str:
+    """Extraction-like text: prose lines with typographic Unicode and the odd form feed."""
+    rng = random.Random(seed)
+    extras = ["café", "naïve", "“quoted”", "– dash", "€5", "§ 4.2", "ﬁnal"]
+    lines = []
+    length = 0
+    while length < size:
+        line = make_sentence(rng) + " " + rng.choice(extras)
+        if rng.random() < 0.01:
+            line += "\x0c"
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)[:size]
+
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+def _xml_escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _docx_paragraph(text: str) -> str:
+    return f'<w:p><w:r><w:t xml:space="preserve">{_xml_escape(text)}</w:t></w:r></w:p>'
+
+
+def _docx_table(rows: list[list[str]]) -> str:
+    body = "".join(
+        "<w:tr>" + "".join(f"<w:tc>{_docx_paragraph(cell)}</w:tc>" for cell in row) + "</w:tr>"
+        for row in rows
+    )
+    return f"<w:tbl>{body}</w:tbl>"
+
+
+def make_docx(path: str, paragraphs: int = 2000, table_every: int = 50, table_rows: int = 10, seed: int = 7) -> str:
+    """
+    Writes a .docx with prose paragraphs, a table every `table_every`
+    paragraphs, and a header/footer. Raw OOXML, so large files build quickly.
+    """
+    import zipfile
+
+    rng = random.Random(seed)
+    blocks = []
+    for i in range(paragraphs):
+        blocks.append(_docx_paragraph(" ".join(make_sentence(rng) for _ in range(3))))
+        if table_every and (i + 1) % table_every == 0:
+            rows = [["Item", "Region", "Amount"]] + [
+                [f"Item {i}-{r}", rng.choice(["North", "South", "East"]), str(rng.randint(10, 9999))]
+                for r in range(table_rows)
+            ]
+            blocks.append(_docx_table(rows))
+
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{_W_NS}" xmlns:r="{_R_NS}"><w:body>{"".join(blocks)}'
+        f'<w:sectPr><w:headerReference w:type="default" r:id="rIdHeader1"/>'
+        f'<w:footerReference w:type="default" r:id="rIdFooter1"/></w:sectPr>'
+        f"</w:body></w:document>"
+    )
+    header = f'<w:hdr xmlns:w="{_W_NS}">{_docx_paragraph("ACME Corp - Confidential")}</w:hdr>'
+    footer = f'<w:ftr xmlns:w="{_W_NS}">{_docx_paragraph("Master Services Agreement v2")}</w:ftr>'
+
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/header1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/>'
+        '<Override PartName="/word/footer1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footer+xml"/>'
+        "</Types>"
+    )
+    package_rels = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="{_PKG_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOC_REL}/officeDocument" Target="word/document.xml"/>'
+        "</Relationships>"
+    )
+    document_rels = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="{_PKG_REL_NS}">'
+        f'<Relationship Id="rIdHeader1" Type="{_DOC_REL}/header" Target="header1.xml"/>'
+        f'<Relationship Id="rIdFooter1" Type="{_DOC_REL}/footer" Target="footer1.xml"/>'
+        "</Relationships>"
+    )
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr("_rels/.rels", package_rels)
+        zf.writestr("word/document.xml", document)
+        zf.writestr("word/_rels/document.xml.rels", document_rels)
+        zf.writestr("word/header1.xml", header)
+        zf.writestr("word/footer1.xml", footer)
+    return path
+
+
+def reference_sanitize(text: str) -> str:
+    """The original per-character filter the fast sanitizer must match."""
+    if not text:
+        return ""
+    text = text.replace("\x00", "")
+    text = "".join(c for c in text if c.isprintable() or c in "\n\r\t")
+    return text.strip()
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.workers import async_worker
+from app.workers.async_worker import AsyncDocumentWorker
+
+STAGE_SECONDS = 0.1
+
+
+class StageRecorder:
+    """Pipeline stages that block like provider calls and track how many overlap."""
+
+    def __init__(self, fail_first: dict | None = None):
+        self.lock = threading.Lock()
+        self.in_flight = self.peak = 0
+        self.failures = dict(fail_first or {})
+        self.failed = []
+
+    def _provider_call(self, ctx: dict, stage: str) -> dict:
+        with self.lock:
+            error = self.failures.pop((ctx["document_id"], stage), None)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(STAGE_SECONDS)
+            if error:
+                raise error
+            return {**ctx, stage: True}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def namespace(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            fetch_stage=lambda ctx: ctx,
+            extract_stage=lambda ctx: ctx,
+            summarize_stage=lambda ctx: self._provider_call(ctx, "summary"),
+            index_stage=lambda ctx: self._provider_call(ctx, "indexing"),
+            finalize_stage=lambda results: {"document_id": results[0]["document_id"], "status": "COMPLETED"},
+            fail_document=lambda ctx, error: self.failed.append((ctx["document_id"], error)),
+        )
+
+
+def _worker(stages: StageRecorder, monkeypatch, limit: int = 2) -> AsyncDocumentWorker:
+    monkeypatch.setattr(async_worker.settings, "ai_provider", "ollama")
+    monkeypatch.setattr(async_worker.settings, "ollama_max_concurrency", limit)
+    worker = AsyncDocumentWorker(MagicMock(lrem=AsyncMock()), concurrency=8, stages=stages.namespace())
+    worker.retry_backoff_seconds = 0
+    return worker
+
+
+def _run(coro):
+    # A private loop: asyncio.run() would unset the current loop other tests rely on
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _job(n: int) -> bytes:
+    return json.dumps({"document_id": f"doc-{n}", "request_id": "rid", "task_id": f"task-{n}"}).encode()
+
+
+def test_documents_overlap_within_the_provider_limit(monkeypatch):
+    stages = StageRecorder()
+    worker = _worker(stages, monkeypatch, limit=4)
+
+    async def run_all():
+        await asyncio.gather(*(worker.handle(_job(n)) for n in range(6)))
+
+    started = time.monotonic()
+    _run(run_all())
+    elapsed = time.monotonic() - started
+
+    # 12 provider calls, 4 at a time: 3 rounds instead of 12
+    assert stages.peak == 4
+    assert elapsed < 6 * STAGE_SECONDS
+    assert worker.client.lrem.await_count == 6
+
+
+def test_transient_failure_is_retried_and_permanent_failure_fails_the_document(monkeypatch):
+    monkeypatch.setattr(async_worker.document_pipeline, "publish", MagicMock())
+    stages = StageRecorder(fail_first={
+        ("doc-1", "summary"): ConnectionError("connection reset"),
+        ("doc-2", "indexing"): ValueError("NON_RETRYABLE: corrupt file"),
+    })
+    worker = _worker(stages, monkeypatch)
+
+    async def run_all():
+        await asyncio.gather(worker.handle(_job(1)), worker.handle(_job(2)))
+
+    _run(run_all())
+
+    assert stages.failed == [("doc-2", "NON_RETRYABLE: corrupt file")]
+    assert worker.client.lrem.await_count == 2
+
+
+class FakeAsyncRedis:
+    """Lists and expiring-keys-as-present for the worker's recovery logic."""
+
+    def __init__(self):
+        self.lists, self.keys = {}, {}
+
+    async def set(self, key, value, ex=None):
+        self.keys[key] = value
+
+    async def exists(self, key):
+        return int(key in self.keys)
+
+    async def delete(self, key):
+        self.keys.pop(key, None)
+
+    async def lmove(self, src, dest, wherefrom, whereto):
+        items = self.lists.get(src)
+        if not items:
+            return None
+        item = items.pop()
+        self.lists.setdefault(dest, []).append(item)
+        return item
+
+    async def scan_iter(self, match):
+        for key in list(self.lists):
+            if key.startswith(match.rstrip("*")):
+                yield key.encode()
+
+
+def test_drain_does_not_wait_for_stages_past_the_grace_period(monkeypatch):
+    release = threading.Event()
+    stages = StageRecorder()
+    namespace = stages.namespace()
+    namespace.summarize_stage = lambda ctx: release.wait(10)
+    worker = _worker(stages, monkeypatch)
+    worker.stages = namespace
+    worker.shutdown_grace_seconds = 0.1
+
+    async def run_and_drain():
+        worker.tasks.add(asyncio.create_task(worker.handle(_job(1))))
+        await asyncio.sleep(0.05)
+        await worker.drain()
+        await asyncio.sleep(0.05)  # let the cancelled document unwind
+
+    started = time.monotonic()
+    try:
+        _run(run_and_drain())
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 2
+
+
+def test_jobs_of_workers_without_heartbeat_are_requeued():
+    client = FakeAsyncRedis()
+    queue = "documents:async"
+    client.lists = {
+        queue: [],
+        f"{queue}:processing:crashed": [_job(1)],
+        f"{queue}:processing:alive": [_job(2)],
+    }
+    client.keys[f"{queue}:heartbeat:alive"] = 1
+    worker = AsyncDocumentWorker(client, queue=queue, stages=StageRecorder().namespace(), worker_id="new")
+
+    _run(worker.beat())
+
+    assert client.lists[queue] == [_job(1)]
+    assert client.lists[f"{queue}:processing:alive"] == [_job(2)]
+    assert f"{queue}:heartbeat:new" in client.keys
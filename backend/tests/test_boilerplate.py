@@ -0,0 +1,26 @@
+from app.infrastructure.processing.boilerplate import strip_boilerplate
+from app.infrastructure.processing.extraction import ExtractedPage
+from tests.fixtures import WORDS
+
+DISCLAIMER = "This document is confidential and intended solely for the addressee."
+
+
+def _page(n: int, body: str) -> ExtractedPage:
+    return ExtractedPage(n, f"ACME Corp Annual Report\n{body}\n{DISCLAIMER}\nSection {n + 4}: {WORDS[n]}\n- {n} -")
+
+
+def test_repeated_headers_footers_and_disclaimers_are_stripped():
+    pages = [_page(n, f"Findings about {WORDS[n]} and {WORDS[-n]}.") for n in range(1, 13)]
+
+    stripped = list(strip_boilerplate(pages, lookahead=4))
+
+    assert [p.number for p in stripped] == list(range(1, 13))
+    for n, page in enumerate(stripped, start=1):
+        # Numbered headings survive; the page counter does not
+        assert page.text.split("\n") == [f"Findings about {WORDS[n]} and {WORDS[-n]}.", f"Section {n + 4}: {WORDS[n]}"]
+
+
+def test_short_documents_are_left_alone():
+    pages = [_page(n, "Body") for n in (1, 2)]
+
+    assert [p.text for p in strip_boilerplate(pages)] == [p.text for p in pages]
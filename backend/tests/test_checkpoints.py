@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+
+from app.infrastructure.db.checkpoints import PipelineCheckpoints
+from app.infrastructure.processing.extraction import ExtractedPage, ExtractionResult, ExtractionStream
+from app.workers import document_worker
+
+DOC_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _reloaded(session) -> PipelineCheckpoints:
+    """A fresh PipelineCheckpoints loaded from the rows merged into `session`."""
+    rows = [call.args[0] for call in session.merge.call_args_list]
+    restored = PipelineCheckpoints(DOC_ID)
+    restored.stages = {row.stage: row.data for row in rows}
+    return restored
+
+
+def test_extraction_checkpoint_round_trips():
+    session = MagicMock()
+    extraction = ExtractionResult(
+        [ExtractedPage(1, "First page.\n"), ExtractedPage(3, "Third page.\n")], "pdf", [{"page": 3, "dpi": 300}]
+    )
+
+    PipelineCheckpoints(DOC_ID).save_extraction(session, extraction)
+    restored = _reloaded(session).extraction()
+
+    assert restored.pages == extraction.pages
+    assert restored.source_type == "pdf" and restored.ocr_pages == [{"page": 3, "dpi": 300}]
+
+
+def test_retry_skips_extraction_and_summary_already_checkpointed(monkeypatch):
+    written = MagicMock()
+    monkeypatch.setattr(document_worker, "db_session_scope", MagicMock(return_value=MagicMock(
+        __enter__=MagicMock(return_value=written), __exit__=MagicMock(return_value=False)
+    )))
+    processor = MagicMock()
+    processor.stream_extraction.side_effect = lambda *a: ExtractionStream(iter([ExtractedPage(1, "Text.\n")]), "txt")
+    doc = MagicMock(id=DOC_ID, content="text/plain", content_hash="abc")
+    summarize = MagicMock(return_value={"analysis": {"summary": "Short."}})
+
+    # First attempt: both stages run and are checkpointed
+    first = PipelineCheckpoints(DOC_ID)
+    extraction = document_worker.resumable_extraction(processor, doc, "a.txt", first).collect()
+    document_worker.resumable_summary(first, extraction, summarize)
+
+    # Retry: both are restored, nothing is extracted or generated again
+    retry = _reloaded(written)
+    extraction = document_worker.resumable_extraction(processor, doc, "a.txt", retry).collect()
+    result = document_worker.resumable_summary(retry, extraction, summarize)
+
+    assert processor.stream_extraction.call_count == 1
+    assert summarize.call_count == 1
+    assert extraction.text == "Text.\n"
+    assert result["analysis"] == {"summary": "Short."}
+
+
+def test_committed_chunks_are_only_kept_with_the_extraction_they_came_from():
+    checkpoints = PipelineCheckpoints(DOC_ID)
+    checkpoints.stages = {"embedding": {"chunks_committed": 128}}
+
+    # The extraction was never checkpointed: it runs again and indexing starts over
+    assert document_worker.resume_indexing(MagicMock(), checkpoints)["resume_from"] == 0
+
+    checkpoints.stages["extraction"] = {"source_type": "pdf", "pages": [[1, "Text."]]}
+    assert document_worker.resume_indexing(MagicMock(), checkpoints)["resume_from"] == 128
@@ -0,0 +1,87 @@
+import time
+from unittest.mock import MagicMock
+
+from app.infrastructure.db.checkpoints import PipelineCheckpoints
+from app.infrastructure.processing.extraction import ExtractedPage, ExtractionStream
+from app.workers.document_worker import summarize_while_indexing
+
+STAGE_SECONDS = 0.3
+
+
+def _pages():
+    return [ExtractedPage(n, f"Page {n} text.\n") for n in range(1, 4)]
+
+
+def test_run_ahead_finishes_extraction_before_the_consumer():
+    completed = []
+    stream = ExtractionStream(iter(_pages()), "txt")
+
+    pages = stream.run_ahead(on_complete=completed.append)
+    first = next(pages)
+    time.sleep(0.05)  # Consumer is "busy embedding" page 1
+
+    assert first.number == 1
+    assert completed and completed[0].text == "".join(p.text for p in _pages())
+    assert [p.number for p in pages] == [2, 3]
+
+
+def test_run_ahead_buffers_a_bounded_number_of_pages():
+    produced = []
+
+    def pages():
+        for n in range(1, 11):
+            produced.append(n)
+            yield ExtractedPage(n, f"Page {n} text.\n")
+
+    stream = ExtractionStream(pages(), "txt")
+    consumer = stream.run_ahead(buffer_pages=2)
+    next(consumer)
+    time.sleep(0.05)  # Consumer is "busy embedding" page 1
+
+    # Two pages queued, one waiting to be put: extraction waits for the consumer
+    assert len(produced) <= 4
+    assert [p.number for p in consumer] == list(range(2, 11))
+    assert len(stream.result.pages) == 10
+
+
+def test_stream_without_kept_pages_only_iterates():
+    stream = ExtractionStream(iter(_pages()), "txt", keep_pages=False)
+
+    assert [p.number for p in stream] == [1, 2, 3]
+    assert stream.result is None
+
+
+def test_summary_and_indexing_overlap(monkeypatch):
+    from app.workers import document_worker
+
+    monkeypatch.setattr(document_worker.settings, "streaming_indexing", True)
+    processor = MagicMock()
+    processor.stream_extraction.side_effect = lambda *a: ExtractionStream(iter(_pages()), "txt")
+
+    def slow_summary(*args, extraction, **kwargs):
+        time.sleep(STAGE_SECONDS)
+        return {"raw_text": extraction.text, "analysis": {"summary": "done"}}
+
+    def slow_index(db, document_id, pages, parser, batch_size, **resume):
+        pages = list(pages)
+        time.sleep(STAGE_SECONDS)
+        return len(pages)
+
+    processor.process_sync.side_effect = slow_summary
+    rag_service = MagicMock()
+    rag_service.index_stream.side_effect = slow_index
+    events = []
+    doc = MagicMock(id="doc-1", content="text/plain", content_hash="abc", file_name="a.txt")
+
+    started = time.monotonic()
+    result, extraction = summarize_while_indexing(
+        MagicMock(), doc, processor, rag_service, MagicMock(), "a.txt", events.append, None,
+        PipelineCheckpoints("00000000-0000-0000-0000-000000000001", enabled=False),
+    )
+    elapsed = time.monotonic() - started
+
+    assert result["analysis"]["summary"] == "done"
+    assert extraction.source_type == "txt"
+    assert elapsed < 2 * STAGE_SECONDS * 0.9
+    stages = {(e["stage"], e["state"]) for e in events}
+    assert {("summary", "completed"), ("indexing", "completed")} <= stages
@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.domain.exceptions import ProcessingError
+from app.infrastructure.queue.celery_app import celery_app
+from app.workers.document_pipeline import build_pipeline, local_file_path
+
+
+def _queue_of(task_name: str) -> str:
+    return celery_app.amqp.router.route({}, task_name)["queue"].name
+
+
+def test_pipeline_is_a_chain_ending_in_a_chord():
+    pipeline, pipeline_id = build_pipeline("doc-1", "rid-1", summary_timing="lazy")
+    fetch, extract, chord = pipeline.tasks
+
+    assert fetch.task == "pipeline_fetch_task"
+    assert fetch.args[0] == {
+        "document_id": "doc-1",
+        "request_id": "rid-1",
+        "summary_timing": "lazy",
+        "task_id": pipeline_id,
+    }
+    assert extract.task == "pipeline_extract_task"
+    assert sorted(t.task for t in chord.tasks) == ["pipeline_index_task", "pipeline_summarize_task"]
+    assert chord.body.task == "pipeline_finalize_task"
+
+
+def test_stages_are_routed_to_their_own_queues():
+    assert _queue_of("pipeline_extract_task") == "extraction"
+    assert _queue_of("pipeline_summarize_task") == "llm"
+    assert _queue_of("pipeline_index_task") == "embedding"
+    assert _queue_of("pipeline_finalize_task") == "documents"
+    assert _queue_of("process_document_task") == "celery"
+
+
+def test_staged_modes_refuse_to_run_without_checkpoints():
+    from pydantic import ValidationError
+    from app.infrastructure.config import Settings
+
+    for mode in ("canvas", "asyncio"):
+        with pytest.raises(ValidationError, match="PIPELINE_CHECKPOINTS"):
+            Settings(pipeline_mode=mode, pipeline_checkpoints=False)
+    assert Settings(pipeline_mode="monolithic", pipeline_checkpoints=False).pipeline_checkpoints is False
+
+
+def test_missing_file_fails_before_extraction(tmp_path):
+    storage = MagicMock(get_file_path=AsyncMock(return_value=str(tmp_path / "gone.pdf")))
+
+    with pytest.raises(ProcessingError, match="NON_RETRYABLE: File not found"):
+        local_file_path(storage, "doc-1")
@@ -2,6 +2,7 @@ import pytest
 from httpx import AsyncClient
 from starlette import status
 from unittest.mock import patch
+from uuid import UUID
 
 @pytest.mark.asyncio
 async def test_upload_document_success(client: AsyncClient):
@@ -36,4 +37,69 @@ async def test_upload_unauthorized(client: AsyncClient):
     """Test that uploading without a token fails."""
     files = {"file": ("test.pdf", b"content", "application/pdf")}
     response = await client.post("/api/v1/documents/upload", files=files)
-    assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
\ No newline at end of file
+    assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+
+@pytest.mark.asyncio
+async def test_lazy_summary_is_queued_on_first_read(client: AsyncClient, db_session):
+    """A lazy upload is readable once indexed; the first GET queues its summary exactly once."""
+    from app.infrastructure.db.models import Document
+
+    user_data = {"email": "lazy@example.com", "password": "password123"}
+    await client.post("/api/v1/auth/register", json=user_data)
+    login_res = await client.post("/api/v1/auth/login", json=user_data)
+    headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+    files = {"file": ("lazy.pdf", b"%PDF-1.4 mock pdf content", "application/pdf")}
+
+    with patch("app.api.v1.routes.documents.queue_processing") as mock_queue:
+        mock_queue.return_value = {"task_id": "mock-task-123"}
+        upload_res = await client.post("/api/v1/documents/upload?summary=lazy", headers=headers, files=files)
+
+    assert mock_queue.call_args.kwargs["summary_timing"] == "lazy"
+    doc_id = upload_res.json()["document_id"]
+
+    # What the worker leaves behind in lazy mode
+    doc = await db_session.get(Document, UUID(doc_id))
+    doc.status = "COMPLETED"
+    doc.analysis = {"summary": None, "summary_status": "pending", "word_count": 5}
+    await db_session.commit()
+
+    with patch("app.api.v1.routes.documents.queue_summary") as mock_summary:
+        first = await client.get(f"/api/v1/documents/{doc_id}", headers=headers)
+        second = await client.get(f"/api/v1/documents/{doc_id}", headers=headers)
+
+    assert first.status_code == 200
+    mock_summary.assert_called_once_with(doc_id)
+    assert second.json()["analysis_results"]["summary_status"] == "queued"
+
+
+@pytest.mark.asyncio
+async def test_summary_stuck_in_queued_is_queued_again(client: AsyncClient, db_session):
+    """A summary whose task was lost does not stay "queued" forever."""
+    from app.infrastructure.db.models import Document
+
+    user_data = {"email": "stuck@example.com", "password": "password123"}
+    await client.post("/api/v1/auth/register", json=user_data)
+    login_res = await client.post("/api/v1/auth/login", json=user_data)
+    headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+    files = {"file": ("stuck.pdf", b"%PDF-1.4 mock pdf content", "application/pdf")}
+
+    with patch("app.api.v1.routes.documents.queue_processing") as mock_queue:
+        mock_queue.return_value = {"task_id": "mock-task-123"}
+        upload_res = await client.post("/api/v1/documents/upload?summary=lazy", headers=headers, files=files)
+    doc_id = upload_res.json()["document_id"]
+
+    doc = await db_session.get(Document, UUID(doc_id))
+    doc.status = "COMPLETED"
+    doc.analysis = {"summary": None, "summary_status": "queued", "summary_queued_at": 0}
+    await db_session.commit()
+
+    with patch("app.api.v1.routes.documents.queue_summary") as mock_summary:
+        mock_summary.side_effect = [ConnectionError("broker down"), None]
+        failed = await client.get(f"/api/v1/documents/{doc_id}", headers=headers)
+        retried = await client.get(f"/api/v1/documents/{doc_id}", headers=headers)
+        fresh = await client.get(f"/api/v1/documents/{doc_id}", headers=headers)
+
+    assert failed.json()["analysis_results"]["summary_status"] == "pending"
+    assert retried.json()["analysis_results"]["summary_status"] == "queued"
+    assert fresh.status_code == 200
+    assert mock_summary.call_count == 2
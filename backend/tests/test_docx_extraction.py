@@ -0,0 +1,41 @@
+import zipfile
+
+from docx import Document as DocxReader
+
+from app.infrastructure.processing.docx_extraction import iter_docx_blocks
+from tests.fixtures import make_docx
+
+
+def test_streams_tables_headers_and_footers(tmp_path):
+    path = make_docx(str(tmp_path / "contract.docx"), paragraphs=4, table_every=2, table_rows=2)
+
+    blocks = list(iter_docx_blocks(path))
+
+    assert blocks[0] == "ACME Corp - Confidential"
+    assert blocks[-1] == "Master Services Agreement v2"
+    assert blocks.count("Item | Region | Amount") == 2
+    # Every python-docx paragraph is still there, in order
+    paragraphs = [p.text for p in DocxReader(path).paragraphs]
+    assert [b for b in blocks if b in paragraphs] == paragraphs
+
+
+def test_nested_content_is_flattened_into_its_cell(tmp_path):
+    w = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+    def p(*runs):
+        return "<w:p>" + "".join(runs) + "</w:p>"
+
+    def t(text):
+        return f"<w:r><w:t>{text}</w:t></w:r>"
+
+    inner = f"<w:tbl><w:tr><w:tc>{p(t('x'))}</w:tc><w:tc>{p(t('y'))}</w:tc></w:tr></w:tbl>"
+    body = (
+        p(t("Before"), "<w:r><w:tab/></w:r>", t("tab"))
+        + f"<w:tbl><w:tr><w:tc>{p(t('Cell'))}{inner}</w:tc><w:tc>{p(t('B'))}</w:tc></w:tr></w:tbl>"
+        + p(t("After"))
+    )
+    path = tmp_path / "nested.docx"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("word/document.xml", f'<w:document xmlns:w="{w}"><w:body>{body}</w:body></w:document>')
+
+    assert list(iter_docx_blocks(str(path))) == ["Before\ttab", "Cell x | y | B", "After"]
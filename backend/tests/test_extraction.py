@@ -0,0 +1,19 @@
+from app.infrastructure.processing.extraction import ExtractedPage, ExtractionResult
+
+
+def test_extraction_result_shares_one_text_and_stats():
+    extraction = ExtractionResult(
+        pages=[ExtractedPage(1, "Invoice for $40. "), ExtractedPage(2, ""), ExtractedPage(3, "Mail a@b.co")],
+        source_type="pdf",
+    )
+
+    assert extraction.text == "Invoice for $40. Mail a@b.co"
+    assert extraction.stats == {
+        "word_count": 5,
+        "estimated_tokens": len(extraction.text) // 4,
+        "contains_email": True,
+        "contains_money": True,
+    }
+
+    docs = extraction.to_llama_documents()
+    assert [d.metadata["page"] for d in docs] == [1, 3]
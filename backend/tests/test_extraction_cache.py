@@ -0,0 +1,93 @@
+import os
+import time
+from unittest.mock import MagicMock
+
+from app.infrastructure.processing.extraction import ExtractedPage, ExtractionResult
+from app.infrastructure.processing.extraction_cache import (
+    LocalExtractionCache,
+    cache_key,
+    deserialize_extraction,
+    serialize_extraction,
+)
+from app.infrastructure.processing.processor_service import DocumentProcessor
+
+
+def _extraction():
+    return ExtractionResult(
+        pages=[ExtractedPage(1, "First page. "), ExtractedPage(2, "Second page é")],
+        source_type="pdf",
+        ocr_pages=[{"page": 2, "dpi": 300, "confidence": 88.0}],
+    )
+
+
+def test_artifact_roundtrip_keeps_page_offsets():
+    restored = deserialize_extraction(serialize_extraction(_extraction()))
+
+    assert [(p.number, p.text) for p in restored.pages] == [(1, "First page. "), (2, "Second page é")]
+    assert restored.source_type == "pdf"
+    assert restored.ocr_pages == _extraction().ocr_pages
+
+
+def test_cached_hash_skips_extraction(tmp_path):
+    cache = LocalExtractionCache(str(tmp_path))
+    processor = DocumentProcessor("ollama", ollama_client=MagicMock(), extraction_cache=cache)
+    processor._iter_extracted_pages = MagicMock(return_value=iter(_extraction().pages))
+
+    first = processor._get_extraction("unused.pdf", "application/pdf", content_hash="abc")
+    second = processor._get_extraction("unused.pdf", "application/pdf", content_hash="abc")
+
+    assert processor._iter_extracted_pages.call_count == 1
+    assert second.text == first.text
+    assert [p.number for p in second.pages] == [1, 2]
+
+
+def test_stream_exposes_result_after_consumption(tmp_path):
+    processor = DocumentProcessor("ollama", ollama_client=MagicMock(), extraction_cache=None)
+    processor._iter_extracted_pages = MagicMock(return_value=iter(_extraction().pages))
+
+    stream = processor.stream_extraction("unused.pdf", "application/pdf")
+    assert stream.result is None
+
+    numbers = [page.number for page in stream]
+
+    assert numbers == [1, 2]
+    assert stream.result.text == _extraction().text
+
+
+def test_partial_or_failed_ocr_is_not_cached(tmp_path):
+    cache = LocalExtractionCache(str(tmp_path))
+    processor = DocumentProcessor("ollama", ollama_client=MagicMock(), extraction_cache=cache)
+
+    def budget_ran_out(file_path, mime_type, source_type, ocr_report):
+        ocr_report.append({"page": 1, "dpi": 200, "confidence": 90.0})
+        processor._skipped_ocr_pages([1, 2], ocr_report)
+        yield ExtractedPage(1, "Scanned text")
+
+    processor._iter_extracted_pages = budget_ran_out
+    partial = processor._get_extraction("scan.pdf", "application/pdf", content_hash="partial")
+
+    processor._iter_extracted_pages = MagicMock(return_value=iter([ExtractedPage(1, "")]))
+    failed = processor._get_extraction("scan.pdf", "application/pdf", content_hash="failed")
+
+    assert not partial.complete and not failed.complete
+    assert "OCR failed" in failed.text
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_local_cache_evicts_expired_then_least_recently_used(tmp_path):
+    cache = LocalExtractionCache(str(tmp_path), max_mb=1, max_age_days=1)
+    for name in ("old", "a", "b"):
+        cache.put(name, _extraction())
+    day = 24 * 3600
+    now = time.time()
+    os.utime(tmp_path / cache_key("old"), (now - 2 * day, now - 2 * day))
+    os.utime(tmp_path / cache_key("a"), (now - 60, now - 60))
+    os.utime(tmp_path / cache_key("b"), (now - 30, now - 30))
+    assert cache.get("a") is not None  # A hit makes "a" the most recently used
+
+    assert cache.evict() == 1
+    assert cache.get("old") is None
+
+    cache.max_bytes = (tmp_path / cache_key("a")).stat().st_size
+    assert cache.evict() == 1
+    assert cache.get("b") is None and cache.get("a") is not None
@@ -0,0 +1,151 @@
+import multiprocessing
+import subprocess
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.domain.exceptions import ProcessingError
+from app.infrastructure.processing.extraction import ExtractedPage, ExtractionResult
+from app.infrastructure.processing.extraction_pool import ExtractionPool
+from app.infrastructure.processing.process_tree import PoolChildren, child_pids, report_pid, terminate_tree
+
+
+def _pool_returning(outcome):
+    pool = ExtractionPool(max_rss_mb=100)
+    executor = MagicMock()
+    if isinstance(outcome, Exception):
+        executor.submit.return_value.result.side_effect = outcome
+    else:
+        executor.submit.return_value.result.return_value = outcome
+    pool._pool = executor
+    return pool, executor
+
+
+def test_extracts_in_child_process(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("first line\nsecond line\n", encoding="utf-8")
+    pool = ExtractionPool(max_workers=1, cpu_seconds=60)
+    try:
+        result = pool.extract(str(path), "text/plain")
+    finally:
+        pool.shutdown()
+
+    assert result.source_type == "txt"
+    assert "second line" in result.text
+
+
+def test_dead_child_becomes_processing_error_and_pool_is_rebuilt():
+    pool, executor = _pool_returning(BrokenProcessPool("killed"))
+
+    with pytest.raises(ProcessingError, match="killed"):
+        pool.extract("big.pdf", "application/pdf")
+
+    executor.shutdown.assert_called_once()
+    assert pool._pool is None
+
+
+def test_recycles_after_memory_heavy_document():
+    result = ExtractionResult([ExtractedPage(1, "text\n")], "txt")
+    pool, executor = _pool_returning((result, 512.0))
+
+    assert pool.extract("a.txt") is result
+    executor.shutdown.assert_called_once()
+    assert pool._pool is None
+
+
+class FakeExecutor:
+    """Futures resolved by the test, like a pool with several documents in flight."""
+
+    def __init__(self):
+        self.futures = []
+        self.closed = False
+
+    def submit(self, *args):
+        if self.closed:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.closed = True
+        if cancel_futures:
+            for future in self.futures:
+                future.cancel()
+
+
+def test_recycling_lets_other_threads_finish_their_documents():
+    result = ExtractionResult([ExtractedPage(1, "text\n")], "txt")
+    pool = ExtractionPool(max_rss_mb=100)
+    executor = FakeExecutor()
+    pool._pool = executor
+
+    with ThreadPoolExecutor(max_workers=2) as callers:
+        heavy = callers.submit(pool.extract, "heavy.pdf")
+        light = callers.submit(pool.extract, "light.txt")
+        while len(executor.futures) < 2:
+            time.sleep(0.01)
+
+        executor.futures[0].set_result((result, 512.0))  # Triggers a recycle
+        assert heavy.result(timeout=5) is result
+        executor.futures[1].set_result((result, 10.0))
+        assert light.result(timeout=5) is result
+
+    assert executor.closed and pool._pool is None
+
+
+def test_document_over_the_wall_clock_limit_fails_and_its_pool_is_killed():
+    pool = ExtractionPool(timeout_seconds=0.2)
+    executor = FakeExecutor()
+    pool._pool = executor
+
+    with pytest.raises(ProcessingError, match="did not finish within"):
+        pool.extract("scanned.pdf", "application/pdf")
+
+    assert executor.closed and pool._pool is None
+    assert executor in pool._terminated
+
+
+def test_terminate_tree_kills_ocr_subprocesses_too():
+    parent = subprocess.Popen(["sh", "-c", "sleep 30 & wait"])
+    while not child_pids(parent.pid):
+        time.sleep(0.01)
+    grandchild = child_pids(parent.pid)[0]
+
+    terminate_tree(parent.pid)
+    parent.wait(timeout=5)
+
+    deadline = time.monotonic() + 5
+    while _alive(grandchild) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not _alive(grandchild)
+
+
+def test_pool_children_kills_the_pools_own_processes():
+    context = multiprocessing.get_context("spawn")
+    children = PoolChildren(context)
+    pool = ProcessPoolExecutor(max_workers=2, mp_context=context, initializer=report_pid, initargs=(children.queue,))
+    futures = [pool.submit(time.sleep, 30) for _ in range(2)]
+    while len(children.pids()) < 2:
+        time.sleep(0.01)
+    pids = children.pids()
+
+    children.terminate()
+
+    for future in futures:
+        with pytest.raises(BrokenProcessPool):
+            future.result(timeout=5)
+    pool.shutdown(wait=True)
+    assert not any(_alive(pid) for pid in pids)
+
+
+def _alive(pid: int) -> bool:
+    """Running, i.e. neither gone nor a zombie waiting to be reaped."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,140 @@
+import os
+import subprocess
+import time
+
+from app.infrastructure.processing.ocr_engine import OCREngine, group_page_windows
+
+
+def test_group_page_windows_splits_runs_and_caps_size():
+    assert group_page_windows([1, 2, 3, 4, 5], 2) == [(1, 2), (3, 4), (5, 5)]
+    assert group_page_windows([7, 2, 3, 9], 4) == [(2, 3), (7, 7), (9, 9)]
+    assert group_page_windows([], 4) == []
+
+
+def test_memory_ceiling_bounds_windows_in_flight():
+    # One 4-page grayscale window at 300 DPI is ~35MB
+    engine = OCREngine(max_workers=8, pages_per_window=4, dpi=300, max_memory_mb=80)
+    assert engine.max_windows_in_flight() == 2
+
+    tight = OCREngine(max_workers=8, pages_per_window=4, dpi=300, max_memory_mb=1)
+    assert tight.max_windows_in_flight() == 1
+
+
+def test_confidence_text_is_rebuilt_from_word_boxes():
+    from unittest.mock import patch
+    from app.infrastructure.processing.ocr_engine import ocr_image_with_confidence
+
+    data = {
+        "text": ["", "Total", "due", "", "42"],
+        "conf": ["-1", "90", "80", "-1", "70"],
+        "block_num": [1, 1, 1, 1, 1],
+        "par_num": [1, 1, 1, 1, 1],
+        "line_num": [0, 1, 1, 1, 2],
+    }
+    with patch("app.infrastructure.processing.ocr_engine.pytesseract.image_to_data", return_value=data):
+        text, confidence = ocr_image_with_confidence(object())
+
+    assert text == "Total due\n42"
+    assert confidence == 80.0
+
+
+def test_adaptive_window_escalates_only_low_confidence_pages():
+    from unittest.mock import MagicMock, patch
+    from app.infrastructure.processing import ocr_engine
+
+    def render(file_path, first, last, dpi):
+        return [MagicMock(name=f"p{p}@{dpi}", page=p, dpi=dpi) for p in range(first, last + 1)]
+
+    def read(image):
+        # Page 2 is blurry at low DPI
+        if image.page == 2 and image.dpi == 150:
+            return "bl0rry", 40.0
+        return f"page {image.page}", 95.0
+
+    with patch.object(ocr_engine, "_render_pages", side_effect=render), \
+            patch.object(ocr_engine, "ocr_image_with_confidence", side_effect=read):
+        results = ocr_engine.ocr_page_window_adaptive("doc.pdf", 1, 3, 150, 300, 70)
+
+    assert [(r.page_number, r.dpi, r.confidence) for r in results] == [
+        (1, 150, 95.0), (2, 300, 95.0), (3, 150, 95.0),
+    ]
+    assert results[1].text == "page 2"
+
+
+def test_preprocessing_grayscales_downscales_and_binarizes():
+    from PIL import Image
+    from app.infrastructure.processing.ocr_engine import preprocess_for_ocr
+
+    # 600 DPI scan: dark text band on a light background
+    scan = Image.new("RGB", (1200, 600), (235, 230, 220))
+    scan.paste((30, 30, 40), (100, 100, 1100, 200))
+    scan.info["dpi"] = (600, 600)
+
+    prepared = preprocess_for_ocr(scan, target_dpi=300)
+
+    assert prepared.mode == "L"
+    assert prepared.size == (600, 300)
+    assert set(prepared.getdata()) == {0, 255}
+
+
+def test_multipage_tiff_is_ocrd_frame_by_frame_with_timings(tmp_path):
+    from unittest.mock import patch
+    from PIL import Image
+
+    frames = [Image.new("L", (200, 100), 255) for _ in range(3)]
+    path = str(tmp_path / "scan.tiff")
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+
+    with patch(
+        "app.infrastructure.processing.ocr_engine.pytesseract.image_to_string",
+        side_effect=["page one", "page two", "page three"],
+    ):
+        results = OCREngine(max_workers=1, pages_per_window=2).ocr_image(path)
+
+    assert [(r.page_number, r.text) for r in results] == [(1, "page one"), (2, "page two"), (3, "page three")]
+    assert set(results[0].timings) == {"decode_ms", "preprocess_ms", "ocr_ms"}
+
+
+def test_high_dpi_jpeg_reaches_tesseract_at_the_target_dpi(tmp_path):
+    from unittest.mock import patch
+    from PIL import Image
+
+    # A4 scanned at 600 DPI
+    path = str(tmp_path / "scan.jpg")
+    Image.new("RGB", (4960, 7016), (235, 230, 220)).save(path, dpi=(600, 600))
+
+    sizes = []
+    with patch(
+        "app.infrastructure.processing.ocr_engine.pytesseract.image_to_string",
+        side_effect=lambda image: sizes.append(image.size) or "text",
+    ):
+        OCREngine(max_workers=1, image_dpi=300).ocr_image(path)
+
+    assert sizes == [(2480, 3508)]
+
+
+def _stuck_window(pid_file, first, last):
+    # Stands in for a Tesseract run that outlives the OCR budget
+    tesseract = subprocess.Popen(["sleep", "30"])
+    with open(pid_file, "w") as f:
+        f.write(str(tesseract.pid))
+    tesseract.wait()
+    return []
+
+
+def test_expired_budget_kills_running_ocr_processes(tmp_path):
+    pid_file = tmp_path / "tesseract.pid"
+    engine = OCREngine(max_workers=2)
+
+    started = time.monotonic()
+    results = engine._ocr_parallel(
+        str(pid_file), [(1, 1)], time.monotonic() + 1, 2, lambda path, first, last: (_stuck_window, path, first, last)
+    )
+
+    assert results == []
+    assert time.monotonic() - started < 10
+    tesseract = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while os.path.exists(f"/proc/{tesseract}") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(f"/proc/{tesseract}")
@@ -0,0 +1,47 @@
+import pytest
+
+from app.infrastructure.processing.pdf_extraction import (
+    available_pdf_backends,
+    extract_pdf_pages_parallel,
+    extract_pdf_pages_serial,
+    find_sparse_pages,
+    resolve_pdf_backend,
+    split_page_range,
+)
+from tests.fixtures import make_text_pdf, pdf_page_lines
+
+
+def test_split_page_range_covers_all_pages():
+    assert split_page_range(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert split_page_range(0, 4) == []
+
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    path = make_text_pdf(str(tmp_path / "doc.pdf"), pages=6, lines_per_page=5)
+
+    serial = extract_pdf_pages_serial(path)
+    parallel = extract_pdf_pages_parallel(path, max_workers=2, pages_per_task=2)
+
+    assert len(serial) == 6
+    assert serial[0].startswith("Page 1")
+    assert parallel == serial
+
+
+def test_find_sparse_pages_ignores_stray_characters():
+    pages = ["A full page of typed contract text", "", ". -", "Short"]
+    assert find_sparse_pages(pages, min_chars=10) == [2, 3, 4]
+
+
+@pytest.mark.parametrize("backend", available_pdf_backends())
+def test_every_installed_backend_recovers_the_text(tmp_path, backend):
+    path = make_text_pdf(str(tmp_path / "doc.pdf"), pages=3, lines_per_page=4)
+
+    pages = extract_pdf_pages_serial(path, backend=backend)
+
+    expected = pdf_page_lines(pages=3, lines_per_page=4)
+    assert [page.split() for page in pages] == [" ".join(lines).split() for lines in expected]
+
+
+def test_unknown_backend_falls_back_to_pypdf():
+    assert resolve_pdf_backend("acrobat") == "pypdf"
+    assert resolve_pdf_backend(None) == "pypdf"
@@ -0,0 +1,81 @@
+import json
+from unittest.mock import MagicMock
+
+from app.infrastructure.config import settings
+from app.infrastructure.processing.extraction import ExtractionResult
+from app.infrastructure.processing.precompression import Compression, centrality_scores, compress, split_sentences
+from app.infrastructure.processing.processor_service import DocumentProcessor
+from app.infrastructure.processing.summarization import CHARS_PER_TOKEN
+
+REPORT = (
+    "Quarterly revenue grew 12 percent on strong cloud revenue.\n"
+    "Cloud revenue drove most of the quarterly revenue growth.\n\n"
+    "The office plants were watered on Tuesday.\n"
+    "Operating margin improved as cloud revenue scaled.\n"
+    "Page 3"
+)
+
+
+def test_split_sentences_joins_wrapped_lines():
+    text = "The quarter was strong and\nrevenue grew. Costs fell.\n\nNew paragraph here."
+
+    assert split_sentences(text) == [
+        "The quarter was strong and revenue grew.",
+        "Costs fell.",
+        "New paragraph here.",
+    ]
+
+
+def test_central_sentences_outrank_outliers():
+    sentences = split_sentences(REPORT)
+    scores = centrality_scores(sentences)
+
+    off_topic = sentences.index("The office plants were watered on Tuesday.")
+    on_topic = [i for i, s in enumerate(sentences) if "revenue" in s]
+    assert all(scores[off_topic] < scores[i] for i in on_topic)
+
+
+def test_compress_keeps_order_within_budget():
+    result = compress(REPORT, budget_chars=130)
+
+    assert len(result.text) <= 130
+    assert "office plants" not in result.text
+    assert "Page 3" not in result.text
+    assert result.text.index("Quarterly") < result.text.index("Cloud revenue drove")
+    assert result.ratio < 1
+
+
+def test_text_within_budget_is_untouched():
+    assert compress(REPORT, budget_chars=10_000).text == REPORT
+
+
+def test_process_sync_reports_compression(monkeypatch):
+    monkeypatch.setattr(settings, "summary_precompression", True)
+    monkeypatch.setattr(settings, "summary_precompression_chars", 130)
+    client = MagicMock()
+    client.chat.return_value = iter([
+        {"message": {"content": "Revenue grew."}},
+        {"message": {"content": ""}, "done": True, "prompt_eval_count": 100, "prompt_eval_duration": 2_000_000_000},
+    ])
+    processor = DocumentProcessor("ollama", ollama_client=client)
+
+    result = processor.process_sync("unused.txt", extraction=ExtractionResult.from_text(REPORT, "txt"))
+    json.dumps(result)  # The public result carries no in-process objects
+
+    report = result["analysis"]["summary_compression"]
+    prompt = client.chat.call_args.kwargs["messages"][0]["content"]
+    assert "office plants" not in prompt
+    assert report["original_chars"] == len(REPORT)
+    assert report["ratio"] < 1
+    assert report["estimated_seconds_saved"] > 0
+
+
+def test_saving_only_counts_what_the_summary_limit_would_have_sent():
+    processor = DocumentProcessor("ollama", ollama_client=MagicMock())
+    # 50,000 characters compressed to 6,000: the uncompressed prompt is cut at 10,000 anyway
+    compression = Compression("x" * 6_000, 50_000, sentences_total=500, sentences_kept=60, seconds=0.0)
+
+    report = processor._compression_report(compression, 10_000, 100, 1_000_000_000)
+
+    assert report["prompt_chars_removed"] == 4_000
+    assert report["estimated_seconds_saved"] == round(4_000 / CHARS_PER_TOKEN * 0.01, 2)
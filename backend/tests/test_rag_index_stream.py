@@ -0,0 +1,84 @@
+from unittest.mock import MagicMock, patch
+
+from app.domain.services.rag_service import RAGService
+from app.infrastructure.processing.extraction import ExtractedPage
+
+DOC_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def test_index_stream_embeds_in_fixed_batches():
+    from llama_index.core.node_parser import SentenceSplitter
+
+    session = MagicMock()
+    embed_model = MagicMock()
+    embed_model.get_text_embedding_batch.side_effect = lambda texts: [[0.0] * 3 for _ in texts]
+
+    pages = (ExtractedPage(n, f"Sentence number {n} of the stream. " * 40) for n in range(1, 6))
+    parser = SentenceSplitter(chunk_size=64, chunk_overlap=0)
+
+    with patch("app.domain.services.rag_service.Settings") as llama_settings:
+        llama_settings.embed_model = embed_model
+        indexed = RAGService().index_stream(session, "00000000-0000-0000-0000-000000000001", pages, parser, batch_size=4)
+
+    batch_sizes = [len(call.args[0]) for call in embed_model.get_text_embedding_batch.call_args_list]
+    assert sum(batch_sizes) == indexed == session.add.call_count
+    assert all(size == 4 for size in batch_sizes[:-1]) and batch_sizes[-1] <= 4
+    assert {call.args[0].meta["page"] for call in session.add.call_args_list} == {1, 2, 3, 4, 5}
+    # Every batch is committed, plus the final commit
+    assert session.commit.call_count == len(batch_sizes) + 1
+
+
+def test_identical_chunks_are_embedded_once():
+    from llama_index.core.node_parser import SentenceSplitter
+
+    session = MagicMock()
+    embed_model = MagicMock()
+    embed_model.get_text_embedding_batch.side_effect = lambda texts: [[0.0] * 3 for _ in texts]
+    clause = "The parties agree that   this schedule forms part of the agreement."
+    pages = [ExtractedPage(1, clause), ExtractedPage(2, "A different clause."), ExtractedPage(3, clause.replace("   ", " "))]
+
+    with patch("app.domain.services.rag_service.Settings") as llama_settings:
+        llama_settings.embed_model = embed_model
+        indexed = RAGService().index_stream(
+            session, "00000000-0000-0000-0000-000000000001", pages, SentenceSplitter(chunk_size=64, chunk_overlap=0)
+        )
+
+    assert indexed == session.add.call_count == 2
+    assert [call.args[0].meta["page"] for call in session.add.call_args_list] == [1, 2]
+
+
+def test_interrupted_indexing_resumes_after_last_committed_batch():
+    from llama_index.core.node_parser import SentenceSplitter
+
+    embed_model = MagicMock()
+    embed_model.get_text_embedding_batch.side_effect = lambda texts: [[0.0] * 3 for _ in texts]
+    parser = SentenceSplitter(chunk_size=64, chunk_overlap=0)
+    committed = []
+
+    def pages():
+        return (ExtractedPage(n, f"Sentence number {n} of the stream. " * 40) for n in range(1, 6))
+
+    def crash_after_two_batches(count):
+        if len(committed) == 2:
+            raise ConnectionError("worker lost")
+        committed.append(count)
+
+    with patch("app.domain.services.rag_service.Settings") as llama_settings:
+        llama_settings.embed_model = embed_model
+        first = MagicMock()
+        try:
+            RAGService().index_stream(first, DOC_ID, pages(), parser, batch_size=4, on_batch=crash_after_two_batches)
+        except ConnectionError:
+            pass
+        embedded_before = [t for call in embed_model.get_text_embedding_batch.call_args_list for t in call.args[0]]
+
+        embed_model.get_text_embedding_batch.reset_mock()
+        second = MagicMock()
+        total = RAGService().index_stream(second, DOC_ID, pages(), parser, batch_size=4, resume_from=committed[-1])
+
+    resumed = [t for call in embed_model.get_text_embedding_batch.call_args_list for t in call.args[0]]
+    assert committed == [4, 8]
+    assert first.commit.call_count == 2 and first.rollback.called
+    second.query.assert_not_called()  # Committed embeddings are kept
+    assert total == committed[-1] + len(resumed) == committed[-1] + second.add.call_count
+    assert resumed[0] == embedded_before[8]  # The rolled-back batch is embedded again
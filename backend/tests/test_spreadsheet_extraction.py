@@ -0,0 +1,48 @@
+from openpyxl import Workbook
+
+from app.infrastructure.processing.spreadsheet_extraction import (
+    iter_csv_row_groups,
+    iter_excel_row_groups,
+    iter_row_groups,
+)
+
+
+def test_row_groups_repeat_header_and_respect_budget():
+    rows = [(f"item-{i}", i * 10) for i in range(1, 51)]
+
+    groups = list(iter_row_groups(["name", "amount"], rows, max_chars=120))
+
+    assert len(groups) > 1
+    assert all(g.splitlines()[1] == "name | amount" for g in groups)
+    body = [line for g in groups for line in g.splitlines()[2:]]
+    assert body == [f"item-{i} | {i * 10}" for i in range(1, 51)]
+
+
+def test_csv_is_read_past_the_old_row_limit(tmp_path):
+    path = tmp_path / "big.csv"
+    path.write_text("id,city\n" + "".join(f"{i},Lagos\n" for i in range(1, 2001)))
+
+    groups = list(iter_csv_row_groups(str(path), max_chars=2000, read_rows=300))
+
+    assert groups[0].startswith("[rows 1-")
+    assert groups[-1].splitlines()[-1] == "2000 | Lagos"
+    # No DataFrame.to_string column padding
+    assert "  " not in "".join(groups)
+
+
+def test_excel_streams_every_sheet(tmp_path):
+    workbook = Workbook()
+    workbook.active.title = "Sales"
+    workbook.active.append(["region", "total"])
+    for i in range(600):
+        workbook.active.append(["North", float(i)])
+    workbook.create_sheet("Notes").append(["note"])
+    workbook["Notes"].append(["multi\nline"])
+    path = tmp_path / "book.xlsx"
+    workbook.save(path)
+
+    groups = list(iter_excel_row_groups(str(path), max_chars=4000))
+
+    assert groups[0].startswith("[Sheet Sales rows 1-")
+    assert any("North | 599" in g for g in groups)
+    assert groups[-1] == "[Sheet Notes rows 1-1]\nnote\nmulti line"
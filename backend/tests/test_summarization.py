@@ -0,0 +1,90 @@
+import threading
+
+from app.infrastructure.processing.summarization import (
+    ChunkSummaryCache,
+    MapReduceSummarizer,
+    split_for_summary,
+)
+
+
+def _document(sections: int) -> str:
+    return "\n\n".join(f"Section {i}: " + "revenue grew steadily. " * 40 for i in range(sections))
+
+
+class FakeLLM:
+    """Summarizes by echoing the section markers it was shown; tracks concurrency."""
+
+    def __init__(self):
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.max_tokens = []
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str, max_tokens: int) -> str:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.max_tokens.append(max_tokens)
+        try:
+            body = prompt.split(":\n", 1)[1]
+            markers = [w for w in body.replace(":", " ").split() if w.isdigit()]
+            return "covers " + " ".join(dict.fromkeys(markers))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_split_prefers_paragraph_breaks_and_keeps_everything():
+    text = _document(6)
+    pieces = list(split_for_summary(text, 2500))
+
+    assert all(len(p) <= 2500 for p in pieces)
+    assert all(p.startswith("Section") for p in pieces)
+    assert " ".join(pieces).split() == text.split()
+
+
+def test_condense_covers_the_tail_of_long_documents():
+    llm = FakeLLM()
+    summarizer = MapReduceSummarizer(llm, model="m", max_workers=3, chunk_tokens=300, level_token_budget=400)
+
+    condensed = summarizer.condense(_document(40), target_chars=200)
+
+    assert "39" in condensed  # The last section reaches the final prompt
+    assert llm.peak <= 3
+    assert llm.calls > 40  # Map calls plus at least one reduce level
+    assert max(llm.max_tokens) <= 400
+
+
+def test_short_text_is_passed_through():
+    llm = FakeLLM()
+    summarizer = MapReduceSummarizer(llm, model="m")
+
+    assert summarizer.condense("short", target_chars=100) == "short"
+    assert llm.calls == 0
+
+
+def test_chunk_summaries_are_reused():
+    llm = FakeLLM()
+    cache = ChunkSummaryCache()
+    summarizer = MapReduceSummarizer(llm, model="m", chunk_tokens=300, cache=cache)
+    text = _document(10)
+
+    first = summarizer.condense(text, target_chars=5000)
+    calls = llm.calls
+    second = summarizer.condense(text, target_chars=5000)
+
+    assert second == first
+    assert llm.calls == calls
+
+
+def test_failed_sections_are_dropped_not_fatal():
+    def flaky(prompt, max_tokens):
+        if "Section 3:" in prompt:
+            raise RuntimeError("timeout")
+        return "ok"
+
+    summarizer = MapReduceSummarizer(flaky, model="m", chunk_tokens=300)
+
+    assert "ok" in summarizer.condense(_document(6), target_chars=5000)
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+from app.infrastructure.processing.extraction import ExtractionResult
+from app.infrastructure.processing.processor_service import DocumentProcessor
+from app.infrastructure.processing.summary_cache import INDEX_KEY, RedisSummaryCache
+
+
+class FakeRedis:
+    """The handful of Redis commands the summary cache uses (no expiry)."""
+
+    def __init__(self):
+        self.values, self.zsets, self.ttls = {}, {}, {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+        self.ttls[key] = ttl
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def zadd(self, name, mapping, xx=False):
+        zset = self.zsets.setdefault(name, {})
+        for member, score in mapping.items():
+            if not xx or member in zset:
+                zset[member] = score
+
+    def zremrangebyscore(self, name, low, high):
+        zset = self.zsets.get(name, {})
+        for member in [m for m, s in zset.items() if s <= high]:
+            del zset[member]
+
+    def zcard(self, name):
+        return len(self.zsets.get(name, {}))
+
+    def zpopmin(self, name, count):
+        zset = self.zsets.get(name, {})
+        popped = sorted(zset.items(), key=lambda item: item[1])[:count]
+        for member, _ in popped:
+            del zset[member]
+        return popped
+
+
+def test_evicts_least_recently_used_beyond_max_entries():
+    client = FakeRedis()
+    cache = RedisSummaryCache(client, ttl_seconds=60, max_entries=2)
+
+    cache.put("a", "summary a")
+    cache.put("b", "summary b")
+    client.zsets[INDEX_KEY]["a"] += 10  # "a" read more recently than "b"
+    cache.put("c", "summary c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "summary a"
+    assert cache.get("c") == "summary c"
+    assert client.ttls["c"] == 60
+
+
+def _ollama_client(text):
+    client = MagicMock()
+    client.chat.side_effect = lambda **kwargs: iter([{"message": {"content": text}}])
+    return client
+
+
+def test_process_sync_reuses_summary_of_identical_content():
+    cache = RedisSummaryCache(FakeRedis())
+    client = _ollama_client("Revenue grew.")
+    processor = DocumentProcessor("ollama", ollama_client=client, summary_cache=cache)
+    extraction = ExtractionResult.from_text("Quarterly revenue grew strongly in every region.", "txt")
+    streamed = []
+
+    first = processor.process_sync("a.txt", content_hash="abc", extraction=extraction)
+    second = processor.process_sync("b.txt", content_hash="abc", extraction=extraction, on_chunk=streamed.append)
+    processor.process_sync("c.txt", content_hash="other", extraction=extraction)
+
+    assert client.chat.call_count == 2
+    assert second["analysis"]["summary"] == first["analysis"]["summary"] == "Revenue grew."
+    assert streamed == ["Revenue grew."]
+
+
+def test_failed_generation_is_not_cached():
+    cache = RedisSummaryCache(FakeRedis())
+    client = MagicMock()
+    client.chat.side_effect = ConnectionError("ollama down")
+    processor = DocumentProcessor("ollama", ollama_client=client, summary_cache=cache)
+    extraction = ExtractionResult.from_text("Quarterly revenue grew strongly in every region.", "txt")
+
+    processor.process_sync("a.txt", content_hash="abc", extraction=extraction)
+    processor.process_sync("a.txt", content_hash="abc", extraction=extraction)
+
+    assert client.chat.call_count == 2
+
+
+def test_raise_on_failure_surfaces_the_error_instead_of_a_fallback():
+    import pytest
+    from app.domain.exceptions import ProcessingError
+
+    client = MagicMock()
+    client.chat.side_effect = ConnectionError("ollama down")
+    processor = DocumentProcessor("ollama", ollama_client=client)
+    extraction = ExtractionResult.from_text("Quarterly revenue grew strongly in every region.", "txt")
+
+    with pytest.raises(ProcessingError, match="AI Engine failed"):
+        processor.process_sync("a.txt", extraction=extraction, raise_on_failure=True)
+    assert processor.process_sync("a.txt", extraction=extraction)["analysis"]["summary"] == "Summary unavailable."
+
+
+def test_async_process_keeps_cache_calls_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    calls = []
+
+    class RecordingCache:
+        def get(self, key):
+            calls.append(("get", threading.get_ident()))
+            return None
+
+        def put(self, key, summary):
+            calls.append(("put", threading.get_ident()))
+
+    processor = DocumentProcessor("ollama", ollama_client=MagicMock(), summary_cache=RecordingCache())
+    processor._get_extraction = MagicMock(return_value=ExtractionResult.from_text("Some text.", "txt"))
+    processor._get_ollama_summary_sync = MagicMock(return_value="A summary.")
+
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(processor.process("a.txt", content_hash="abc"))
+    finally:
+        loop.close()
+
+    assert result["analysis"]["summary"] == "A summary."
+    assert [name for name, _ in calls] == ["get", "put"]
+    assert all(thread != loop_thread for _, thread in calls)
@@ -0,0 +1,141 @@
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pandas as pd
+import pytest
+
+from app.domain.services.rag_service import RAGService
+from app.domain.services.tabular_query_engine import TabularQueryEngine
+from app.infrastructure.processing.tabular_store import TabularStore, iter_table, table_columns
+
+SCHEMA = {"region": "text", "product": "text", "unit price": "numeric", "revenue": "numeric"}
+
+
+def _sales():
+    return pd.DataFrame({
+        "region": ["North", "South", "North", "East"],
+        "product": ["a", "b", "c", "d"],
+        "unit price": [1.0, 2.0, 3.0, 4.0],
+        "revenue": [100.0, 50.0, 25.0, 80.0],
+    })
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("What is the total revenue by region?", ("sum", "revenue", "region")),
+    ("Average unit price per product", ("mean", "unit price", "product")),
+    ("How many rows are there for each region?", ("count", None, "region")),
+    ("Which region has the highest revenue?", ("max", "revenue", "region")),
+    ("What is the total revenue?", ("sum", "revenue", None)),
+    ("Which region brings in the most revenue?", ("max", "revenue", "region")),
+    ("How many records are there?", ("count", None, None)),
+])
+def test_plan_maps_questions_to_aggregations(question, expected):
+    plan = TabularQueryEngine().plan(question, SCHEMA)
+
+    assert (plan.aggregate, plan.metric, plan.group_by) == expected
+
+
+def test_plan_declines_non_aggregate_questions():
+    engine = TabularQueryEngine()
+
+    assert engine.plan("Who is the main supplier?", SCHEMA) is None
+    assert engine.plan("What is the total?", SCHEMA) is None
+    # Everyday words without a grouping column or a question about rows
+    assert engine.plan("What do most customers say about revenue?", SCHEMA) is None
+    assert engine.plan("Which supplier has the top revenue?", SCHEMA) is None
+    assert engine.plan("How many pages does the report have?", SCHEMA) is None
+    assert engine.plan("What does each product cost?", SCHEMA) is None
+
+
+def test_answer_reads_only_planned_columns():
+    loaded = []
+
+    def load(columns):
+        loaded.append(columns)
+        return _sales()[columns]
+
+    answer = TabularQueryEngine().answer("total revenue by region", SCHEMA, load)
+
+    assert loaded == [["region", "revenue"]]
+    assert answer.result.splitlines() == ["region|revenue", "North|125.00", "East|80.00", "South|50.00"]
+
+
+def test_store_copies_the_table_of_a_cloned_duplicate(tmp_path):
+    pytest.importorskip("pyarrow")
+    files = {"source.parquet": b"PAR1"}
+    storage = MagicMock()
+
+    async def upload(file_id, file_name, file_bytes, content_type):
+        files[file_id] = file_bytes
+
+    async def get_file_path(file_id):
+        path = tmp_path / file_id
+        if file_id in files:
+            path.write_bytes(files[file_id])
+        return str(path)
+
+    storage.upload, storage.get_file_path = upload, get_file_path
+    store = TabularStore(storage)
+
+    assert store.copy("source", "clone")
+    assert files["clone.parquet"] == b"PAR1"
+    assert not store.copy("missing", "other")
+
+
+def test_table_coerces_formatted_numbers(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text('region,revenue\nNorth,"$1,200"\nSouth,35.5\n')
+
+    columns = table_columns(str(path), "csv")
+    df = pd.concat(iter_table(str(path), "csv", columns))
+
+    assert columns == {"region": "text", "revenue": "float"}
+    assert df["revenue"].sum() == 1235.5
+
+
+def test_column_types_hold_across_chunks(tmp_path):
+    path = tmp_path / "orders.csv"
+    # Only the last chunk reveals that "code" is not numeric
+    path.write_text("code,quantity\n1,2\n2,3\n3,4\nA-7,5\n")
+
+    columns = table_columns(str(path), "csv", chunk_rows=2)
+    chunks = list(iter_table(str(path), "csv", columns, chunk_rows=2))
+
+    assert columns == {"code": "text", "quantity": "int"}
+    assert len(chunks) == 2
+    assert pd.concat(chunks)["code"].tolist() == ["1", "2", "3", "A-7"]
+
+
+def test_rag_answers_aggregates_from_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "sales.csv"
+    _sales().to_csv(path, index=False)
+
+    storage = MagicMock()
+    parquet_path = tmp_path / "copy.parquet"
+
+    async def upload(file_id, file_name, file_bytes, content_type):
+        parquet_path.write_bytes(file_bytes)
+
+    async def get_file_path(file_id):
+        return str(parquet_path)
+
+    storage.upload, storage.get_file_path = upload, get_file_path
+    store = TabularStore(storage)
+    doc_id = uuid4()
+    assert store.save(str(doc_id), str(path), "csv")
+
+    session = MagicMock()
+    session.get.return_value = MagicMock(id=doc_id, file_name="sales.csv")
+    ollama = MagicMock()
+    ollama.chat.return_value = {"message": {"content": "North leads with 125."}}
+
+    rag = RAGService(ollama_client=ollama, tabular_store=store)
+    rag.provider = "ollama"
+    result = rag.query(session, str(doc_id), "total revenue by region")
+
+    assert result["answer"] == "North leads with 125."
+    assert result["sources"][0]["metadata"]["source"] == "tabular"
+    prompt = ollama.chat.call_args.kwargs["messages"][0]["content"]
+    assert "North|125.00" in prompt
+    session.execute.assert_not_called()
@@ -0,0 +1,53 @@
+import codecs
+
+import pytest
+
+from app.infrastructure.processing.text_extraction import detect_encoding, iter_text_blocks
+
+
+@pytest.mark.parametrize("encoding, bom", [
+    ("utf-8", b""),
+    ("utf-8", codecs.BOM_UTF8),
+    ("utf-16", b""),  # Python's utf-16 codec writes its own BOM
+])
+def test_blocks_decode_losslessly_and_end_on_line_boundaries(tmp_path, encoding, bom):
+    text = "".join(f"line {i}: naïve café – €{i}\n" for i in range(3000))
+    path = tmp_path / "log.txt"
+    path.write_bytes(bom + text.encode(encoding))
+
+    blocks = list(iter_text_blocks(str(path), block_chars=1000))
+
+    assert len(blocks) > 10
+    assert "".join(blocks) == text
+    assert all(block.endswith("\n") for block in blocks)
+
+
+def test_detect_encoding_falls_back_for_legacy_bytes():
+    assert detect_encoding("façade déjà vu ".encode("utf-8")[:-1] + b"\xc3") == "utf-8"
+    legacy = detect_encoding(("Résumé of the quarterly numbers. " * 50).encode("cp1252"))
+    assert legacy != "utf-8"
+    assert ("Résumé of the quarterly numbers. " * 50).encode("cp1252").decode(legacy).startswith("Résumé")
+
+
+def test_empty_file_yields_nothing(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+
+    assert list(iter_text_blocks(str(path), block_chars=100)) == []
+
+
+def test_txt_sections_keep_indentation_and_blank_lines_at_their_edges(tmp_path, monkeypatch):
+    from unittest.mock import MagicMock
+
+    from app.infrastructure.config import settings
+    from app.infrastructure.processing.processor_service import DocumentProcessor
+
+    monkeypatch.setattr(settings, "text_section_chars", 40)
+    text = "".join(f"def step_{i}():\n    return {i}\n\n" for i in range(20))
+    path = tmp_path / "code.txt"
+    path.write_text(text + "\x00")
+
+    pages = list(DocumentProcessor("ollama", ollama_client=MagicMock())._iter_txt_pages(str(path)))
+
+    assert len(pages) > 5
+    assert "".join(page.text for page in pages) == text
@@ -0,0 +1,38 @@
+import sys
+
+import pytest
+
+from app.infrastructure.processing.text_sanitizer import sanitize_text
+from tests.fixtures import UNICODE_POOLS, make_document_text, make_unicode_corpus, reference_sanitize
+
+
+def test_every_code_point_matches_reference():
+    everything = "".join(chr(cp) for cp in range(sys.maxunicode + 1))
+    assert sanitize_text(everything) == reference_sanitize(everything)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("ascii_ratio", [1.0, 0.9, 0.5, 0.0])
+def test_generated_corpora_match_reference(seed, ascii_ratio):
+    corpus = make_unicode_corpus(5_000, seed=seed, ascii_ratio=ascii_ratio)
+    assert sanitize_text(corpus) == reference_sanitize(corpus)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_document_text_matches_reference(seed):
+    text = make_document_text(20_000, seed=seed)
+    assert sanitize_text(text) == reference_sanitize(text)
+
+
+@pytest.mark.parametrize("pool", UNICODE_POOLS)
+def test_each_pool_matches_reference(pool):
+    text = "  " + "".join(pool) + " x " + "".join(reversed(pool)) + "\n"
+    assert sanitize_text(text) == reference_sanitize(text)
+
+
+@pytest.mark.parametrize("text", [
+    "", "   ", "\x00", "\x00abc\x00", "plain ascii", "\t\ttabbed\r\n",
+    "café\x07", "crlf é\r\nline\r\n", "\n\n é \n\n", "﻿BOM start", "line sep", "\U0001F600 emoji \x1b[0m",
+])
+def test_edge_cases_match_reference(text):
+    assert sanitize_text(text) == reference_sanitize(text)
@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock
+
+from app.workers import warmup
+
+
+def test_warm_models_loads_chat_and_embedding_models_with_keep_alive(monkeypatch):
+    monkeypatch.setattr(warmup.settings, "ai_provider", "ollama")
+    monkeypatch.setattr(warmup.settings, "ollama_keep_alive", "1h")
+    client = MagicMock()
+    client.embeddings.side_effect = ConnectionError("embedding model missing")
+
+    warmed = warmup.warm_models(client)
+
+    assert warmed == [warmup.settings.ollama_model]
+    assert client.generate.call_args.kwargs == {"model": warmup.settings.ollama_model, "prompt": "", "keep_alive": "1h"}
+    assert client.embeddings.call_args.kwargs["keep_alive"] == "1h"
+
+
+def test_hosted_provider_has_no_models_to_load(monkeypatch):
+    monkeypatch.setattr(warmup.settings, "ai_provider", "gemini")
+    client = MagicMock()
+
+    assert warmup.warm_models(client) == []
+    client.generate.assert_not_called()
+
+
+def test_readiness_file_and_key(monkeypatch, tmp_path):
+    ready_file = tmp_path / "worker.ready"
+    monkeypatch.setattr(warmup.settings, "worker_ready_file", str(ready_file))
+    redis_client = MagicMock()
+
+    warmup.mark_ready(redis_client)
+    assert ready_file.exists()
+    key = redis_client.set.call_args.args[0]
+    assert key.startswith(f"{warmup.READY_KEY_PREFIX}:")
+    assert redis_client.set.call_args.kwargs["ex"] == warmup.settings.worker_ready_ttl_seconds
+
+    warmup.clear_ready(redis_client)
+    assert not ready_file.exists()
+    redis_client.delete.assert_called_once_with(key)
+
+
+def test_thread_pool_preloads_in_the_main_process(monkeypatch):
+    monkeypatch.setattr(warmup.settings, "worker_warm_start", True)
+    monkeypatch.setattr(warmup, "clear_ready", MagicMock())
+    preload = MagicMock()
+    monkeypatch.setattr(warmup, "_preload_safely", preload)
+
+    # prefork children and the solo pool preload on worker_process_init instead
+    for pool, preloads in (("threads", 1), ("prefork", 0), ("solo", 0)):
+        preload.reset_mock()
+        warmup._reset_ready(sender=MagicMock(pool_cls=pool))
+        assert preload.call_count == preloads, pool
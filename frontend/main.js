@@ -477,6 +477,11 @@ function renderIntelligenceCards(docs) {
                 <span class="streaming-text">${summaryText}</span>
                 <div class="wobble-dots"><span></span><span></span><span></span></div>
             </div>`;
+        } else if (!summaryText && analysisData.summary_status === 'pending') {
+            summaryText = `<span class="missing-text">Ready to chat. Summary not generated yet.</span>
+                <button class="btn-text" onclick="requestSummary('${doc.id}')">Generate summary</button>`;
+        } else if (!summaryText && analysisData.summary_status) {
+            summaryText = '<span class="missing-text">Summary is being generated...</span>';
         } else if (!summaryText) {
             summaryText = '<span class="missing-text">Summary data unavailable.</span>';
         } else {
@@ -668,6 +673,7 @@ async function handleUpload(e) {
             if (data.task_id) {
                 const wsBase = API_BASE.split('/api/v1')[0].replace('http', 'ws');
                 const socket = new WebSocket(`${wsBase}/ws/${data.task_id}?token=${authToken}`);
+                const stages = {}; // Concurrent pipeline: summary / indexing progress
                 
                 socket.onmessage = (event) => {
                     const update = JSON.parse(event.data);
@@ -687,6 +693,13 @@ async function handleUpload(e) {
                     } else if (update.status === 'FAILED') {
                         showToast(`Analysis failed: ${file.name}`, 'error');
                         fetchDocuments();
+                    } else if (update.status === 'STAGE_UPDATE') {
+                        stages[update.stage] = update.state;
+                        if (badge) {
+                            badge.textContent = Object.entries(stages)
+                                .map(([stage, state]) => `${stage}: ${state}`)
+                                .join(' · ');
+                        }
                     } else if (badge && update.status !== 'SUMMARY_CHUNK') {
                         badge.className = `status-badge ${update.status.toLowerCase()}`;
                         
@@ -763,6 +776,21 @@ function showConfirm(title, text) {
     });
 }
 
+// Lazy summaries: reading the document queues its summary on the server
+window.requestSummary = async (id) => {
+    try {
+        const res = await authFetch(`${API_BASE}/documents/${id}`);
+        if (res.ok) {
+            showToast('Summary queued. It will appear shortly.', 'success');
+            fetchDocuments();
+        } else {
+            showToast('Could not request the summary.', 'error');
+        }
+    } catch (err) {
+        showToast('Connection error.', 'error');
+    }
+};
+
 window.deleteDocument = async (id) => {
     const confirmed = await showConfirm(
         'Delete Intelligence?',